@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark for every --model choice.
+
+Each measurement runs in a fresh interpreter and times importing hermes.main and
+building the model, file processor and prompt builder (no network calls are made).
+The "eager" column imports every backend plus the PDF/DOCX/rich stack up front,
+which is what main.py used to do, so the difference is the cold-start win.
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from hermes.model_registry import MODEL_REGISTRY, get_model_names
+
+# Minimal config sections for models that can't be built from an empty config
+MODEL_CONFIGS = {
+    'hedged': {'HEDGE': {'backends': 'claude, openai'}},
+}
+
+EAGER_IMPORTS = sorted({spec.model_class.rpartition('.')[0] for spec in MODEL_REGISTRY.values()}) + [
+    'PyPDF2', 'docx', 'rich.console', 'rich.markdown', 'hermes.workflows.executor',
+]
+
+LAZY_SNIPPET = """
+import configparser
+import hermes.main
+config = configparser.ConfigParser()
+config.read_dict({config!r})
+hermes.main.create_model_and_processors({model!r}, config)
+"""
+
+EAGER_SNIPPET = """
+import configparser, importlib
+for name in {modules!r}:
+    importlib.import_module(name)
+import hermes.main
+config = configparser.ConfigParser()
+config.read_dict({config!r})
+hermes.main.create_model_and_processors({model!r}, config)
+"""
+
+def time_snippet(snippet: str, runs: int) -> float:
+    env = dict(os.environ, PYTHONPATH=SRC_DIR, PYTHONDONTWRITEBYTECODE='')
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', snippet], env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter launches per measurement (median is reported)')
+    args = parser.parse_args()
+
+    print(f"{'model':<20} {'eager (ms)':>12} {'lazy (ms)':>12} {'saved (ms)':>12}")
+    for model in get_model_names():
+        config = MODEL_CONFIGS.get(model, {})
+        eager = time_snippet(EAGER_SNIPPET.format(modules=EAGER_IMPORTS, model=model, config=config), args.runs)
+        lazy = time_snippet(LAZY_SNIPPET.format(model=model, config=config), args.runs)
+        print(f"{model:<20} {eager * 1000:>12.1f} {lazy * 1000:>12.1f} {(eager - lazy) * 1000:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for accumulating streamed responses.
+
+Simulates one response of --chunks chunks flowing through the three consumers that keep
+the text: the session history, ChatUI and LLMTask.
+
+- "concat" is the old pattern: each consumer does `text += chunk`, and pretty mode also
+  builds "Assistant: \\n" + text for every chunk.
+- "buffer" uses StreamBuffer, with pretty mode rebuilding the text only once per render
+  interval (simulated here as every --render-every chunks).
+
+Usage:
+    python benchmarks/stream_buffer.py [--chunks N] [--runs N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from hermes.utils.stream_buffer import StreamBuffer
+
+def make_chunks(count):
+    # Provider chunks are typically a handful of tokens
+    return [f"token{i % 97} and " for i in range(count)]
+
+def concat(chunks, pretty):
+    history = ui = task = ""
+    for chunk in chunks:
+        history += chunk
+        ui += chunk
+        if pretty:
+            rendered = "Assistant: \n" + ui
+        task += chunk
+    return history, ui, task
+
+def buffered(chunks, pretty, render_every):
+    history, ui, task = StreamBuffer(), StreamBuffer(), StreamBuffer()
+    for index, chunk in enumerate(chunks):
+        history.append(chunk)
+        ui.append(chunk)
+        if pretty and index % render_every == 0:
+            rendered = "Assistant: \n" + ui.getvalue()
+        task.append(chunk)
+    return history.getvalue(), ui.getvalue(), task.getvalue()
+
+def measure(function, runs, *args):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--render-every", type=int, default=50, help="Chunks per pretty-mode redraw for the buffered path")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks)
+    assert concat(chunks, True) == buffered(chunks, True, args.render_every)
+
+    print(f"{args.chunks} chunks, {sum(map(len, chunks))} characters, median of {args.runs} runs")
+    print(f"{'mode':<8} {'concat (ms)':>12} {'buffer (ms)':>12} {'speedup':>8}")
+    for pretty in (False, True):
+        before = measure(concat, args.runs, chunks, pretty)
+        after = measure(buffered, args.runs, chunks, pretty, args.render_every)
+        mode = 'pretty' if pretty else 'raw'
+        print(f"{mode:<8} {before * 1000:>12.2f} {after * 1000:>12.2f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
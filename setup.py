@@ -35,6 +35,9 @@ setup(
             'pytest-cov',
             'pytest-mock',
         ],
+        'http2': [
+            'httpx[http2]',
+        ],
     },
     python_requires='>=3.7',
     author="Your Name",
@@ -1,6 +1,9 @@
 from typing import Dict, List, Optional
 import signal, sys
-from hermes.chat_models.base import ChatModel
+from hermes.chat_models.base import ChatModel, ChatSession
+from hermes.chat_models.history import TrimResult
+from hermes.chat_models.startup import ModelStartup
+from hermes.chat_models.stats import ResponseStats
 from hermes.context_orchestrator import ContextOrchestrator
 from hermes.prompt_builders.base import PromptBuilder
 from hermes.ui.chat_ui import ChatUI
@@ -8,19 +11,23 @@ from hermes.file_processors.base import FileProcessor
 from hermes.utils.file_utils import process_file_name
 
 class ChatApplication:
-    def __init__(self, model: ChatModel, ui: ChatUI, file_processor: FileProcessor, prompt_builder: PromptBuilder, special_command_prompts: Dict[str, str], context_orchestrator: ContextOrchestrator):
+    def __init__(self, model: ChatModel, ui: ChatUI, file_processor: FileProcessor, prompt_builder: PromptBuilder, special_command_prompts: Dict[str, str], context_orchestrator: ContextOrchestrator, model_startup: Optional[ModelStartup] = None, model_initialized: bool = False):
         self.model = model
+        # Set when the model is already initializing in the background (see ModelStartup)
+        self.model_startup = model_startup
+        # Set when the model was initialized by its owner, e.g. the daemon sharing it between sessions
+        self.model_initialized = model_initialized
         self.ui = ui
         self.file_processor = file_processor
         self.prompt_builder = prompt_builder
         self.special_command_prompts = special_command_prompts
         self.context_orchestrator = context_orchestrator
+        self.session: Optional[ChatSession] = None
 
     def run(self, initial_prompt: Optional[str] = None, special_command: Optional[Dict[str, str]] = None):
         if not special_command:
             special_command = {}
-        self.model.initialize()
-        self.context_orchestrator.build_prompt(self.prompt_builder)
+        self.prepare()
 
         # Check if input is coming from a pipe
         if not sys.stdin.isatty():
@@ -28,20 +35,39 @@ class ChatApplication:
                 user_input = initial_prompt
             else:
                 user_input = sys.stdin.read().strip()
-
-            if user_input:
-                self.prompt_builder.add_text(user_input)
-                if 'append' in special_command:
-                    self.prompt_builder.add_text(self.special_command_prompts['append'].format(file_name=process_file_name(special_command['append'])))
-                elif 'update' in special_command:
-                    self.prompt_builder.add_text(self.special_command_prompts['update'].format(file_name=process_file_name(special_command['update'])))
-                context = self.prompt_builder.build_prompt()
-                response = self.ui.display_response(self.model.send_message(context))
-                if special_command:
-                    self.handle_special_command(special_command, response)
+            self.run_piped(user_input, special_command)
             return
 
-        # Interactive mode
+        self.run_interactive(initial_prompt, special_command)
+
+    def prepare(self):
+        if self.model_startup is None and not self.model_initialized:
+            self.model.initialize()
+        self.start_session()
+        self.context_orchestrator.build_prompt(self.prompt_builder)
+        if self.model_startup is not None:
+            self.model_startup.wait()
+        stats_recorder = getattr(self.model, 'stats_recorder', None)
+        if stats_recorder is not None and stats_recorder.print_summary:
+            context_summary = self.context_orchestrator.summary()
+            if context_summary:
+                self.ui.display_status(context_summary)
+            if self.model_startup is not None:
+                self.ui.display_status(self.model_startup.summary())
+
+    def run_piped(self, user_input: str, special_command: Dict[str, str]):
+        if user_input:
+            self.prompt_builder.add_text(user_input)
+            if 'append' in special_command:
+                self.prompt_builder.add_text(self.special_command_prompts['append'].format(file_name=process_file_name(special_command['append'])))
+            elif 'update' in special_command:
+                self.prompt_builder.add_text(self.special_command_prompts['update'].format(file_name=process_file_name(special_command['update'])))
+            context = self.prompt_builder.build_prompt()
+            response = self.ui.display_response(self.session.send_message(context))
+            if special_command:
+                self.handle_special_command(special_command, response)
+
+    def run_interactive(self, initial_prompt: Optional[str], special_command: Dict[str, str]):
         try:
             if initial_prompt:
                 self.prompt_builder.add_text(initial_prompt)
@@ -65,7 +91,7 @@ class ChatApplication:
                         break
 
             context = self.prompt_builder.build_prompt()
-            response = self.ui.display_response(self.model.send_message(context))
+            response = self.ui.display_response(self.session.send_message(context))
 
             if special_command:
                 self.handle_special_command(special_command, response)
@@ -81,7 +107,7 @@ class ChatApplication:
                     self.clear_chat()
                     continue
 
-                self.ui.display_response(self.model.send_message(user_input))
+                self.ui.display_response(self.session.send_message(user_input))
 
         except KeyboardInterrupt:
             print("\nChat interrupted. Exiting gracefully...")
@@ -94,7 +120,29 @@ class ChatApplication:
             self.file_processor.write_file(special_command['update'], content, mode='w')
             self.ui.display_status(f"File {special_command['update']} updated")
 
+    def start_session(self):
+        self.session = self.model.new_session()
+        self.session.on_trim = self.report_history_trim
+        self.session.on_usage = self.report_prompt_cache_usage
+        self.session.on_stats = self.report_response_stats
+
+    def report_history_trim(self, session: ChatSession, result: TrimResult):
+        self.ui.display_status(
+            f"Dropped {result.dropped_messages} older messages to stay within the history budget. "
+            f"This turn sends {session.bytes_saved:,} fewer bytes (~{session.tokens_saved:,} tokens)."
+        )
+
+    def report_prompt_cache_usage(self, session: ChatSession, usage: Dict[str, int]):
+        if 'cache_read_tokens' in usage or 'cache_write_tokens' in usage:
+            self.ui.display_status(
+                f"Prompt cache: {usage.get('cache_read_tokens', 0):,} tokens read, "
+                f"{usage.get('cache_write_tokens', 0):,} tokens written"
+            )
+
+    def report_response_stats(self, session: ChatSession, stats: ResponseStats):
+        self.ui.display_status(stats.summary())
+
     def clear_chat(self):
-        self.model.initialize()
+        self.start_session()
         self.ui.display_status("Chat history cleared.")
 
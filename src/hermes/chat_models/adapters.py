@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Dict, Generator, Iterable, List, Optional, TypeVar
+
+from .base import AsyncChatModel, ChatModel
+
+T = TypeVar('T')
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop that sync callers use to drive async models.
+
+    A single loop is shared because async SDK clients hold connections bound to the loop
+    they were first used on.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="hermes-async-models", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+async def iterate_in_executor(iterable: Iterable[T], executor: Optional[Executor] = None) -> AsyncIterator[T]:
+    """Consume a blocking iterable on an executor thread, one item at a time, without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    iterator = iter(iterable)
+    sentinel = object()
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
+class SyncChatModelAdapter(ChatModel):
+    """Exposes an AsyncChatModel through the blocking ChatModel interface used by ChatApplication and LLMTask."""
+    def __init__(self, async_model: AsyncChatModel):
+        super().__init__(async_model.config)
+        self.async_model = async_model
+
+    def initialize(self):
+        self.async_model.initialize()
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return self.async_model.create_message(role, content)
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return self.async_model.initial_messages()
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        loop = get_background_loop()
+        response = self.async_model.stream_response(messages)
+        try:
+            while True:
+                try:
+                    chunk = asyncio.run_coroutine_threadsafe(response.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        finally:
+            asyncio.run_coroutine_threadsafe(response.aclose(), loop).result()
+
+class ThreadedAsyncChatModel(AsyncChatModel):
+    """Runs a blocking ChatModel on executor threads for SDKs without a native async client."""
+    def __init__(self, model: ChatModel, executor: Optional[Executor] = None):
+        super().__init__(model.config)
+        self.model = model
+        self.executor = executor
+
+    def initialize(self):
+        self.model.initialize()
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return self.model.create_message(role, content)
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return self.model.initial_messages()
+
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        async for chunk in iterate_in_executor(self.model.stream_response(messages), self.executor):
+            yield chunk
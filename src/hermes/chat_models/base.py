@@ -1,15 +1,192 @@
 from abc import ABC, abstractmethod
 import configparser
-from typing import Generator
+from typing import Any, AsyncIterator, Callable, Dict, Generator, List, Optional
+
+from hermes.utils.stream_buffer import StreamBuffer
+from .history import HistoryPolicy, TrimResult
+from .stats import ResponseStats, ResponseTimer, StatsRecorder
+
+def add_usage(usage: Optional[Dict[str, int]], **counts: Optional[int]):
+    """
+    Accumulate provider-reported token counts into a stream_response usage dict.
+
+    Keys are input_tokens, output_tokens, cache_read_tokens and cache_write_tokens; zero
+    and missing counts are skipped so callers can tell "not reported" from a real value.
+    """
+    if usage is None:
+        return
+    for key, value in counts.items():
+        if value:
+            usage[key] = usage.get(key, 0) + int(value)
 
 class ChatModel(ABC):
+    """
+    Stateless provider client. Conversation history lives in ChatSession objects, so one
+    initialized model can be shared by any number of sessions and threads.
+    """
+    # Provider limit in tokens, used to bound session history; None when it depends on the deployment
+    context_window: Optional[int] = None
+
     def __init__(self, config: configparser.ConfigParser):
         self.config = config
+        self.default_session: Optional['ChatSession'] = None
+        self.history_policy: Optional[HistoryPolicy] = None
+        self.stats_recorder: Optional[StatsRecorder] = None
 
     @abstractmethod
     def initialize(self):
+        """Set up the provider client. Holds no conversation state, so calling it again is cheap."""
         pass
 
     @abstractmethod
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        """
+        Stream the assistant's reply to the given history without modifying it.
+
+        :param usage: If given, filled with the token counts the provider reports (see add_usage)
+        """
+        pass
+
+    def warm_up(self):
+        """
+        Open the provider connection (DNS, TLS, auth) ahead of the first request, after
+        initialize(). Best effort: callers ignore failures.
+        """
+        pass
+
+    def request_params(self) -> Dict[str, Any]:
+        """Model id and sampling parameters sent with every request, used to key cached responses."""
+        return {}
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return {"role": role, "content": content}
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return []
+
+    def get_provider_name(self) -> str:
+        return f"{type(self).__module__}.{type(self).__qualname__}"
+
+    def new_session(self) -> 'ChatSession':
+        return ChatSession(self, self.history_policy, self.stats_recorder)
+
     def send_message(self, message: str) -> Generator[str, None, None]:
+        """Send a message on the model's default session, for callers that only need one conversation."""
+        if self.default_session is None:
+            self.default_session = self.new_session()
+        return self.default_session.send_message(message)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        if self.default_session is None:
+            self.default_session = self.new_session()
+        return self.default_session.messages
+
+class ChatSession:
+    """One conversation on a shared ChatModel. Holds only the history, so creating one is O(1)."""
+    def __init__(self, model: ChatModel, history_policy: Optional[HistoryPolicy] = None, stats_recorder: Optional[StatsRecorder] = None):
+        self.model = model
+        self.history_policy = history_policy
+        self.stats_recorder = stats_recorder
+        self.messages = model.initial_messages()
+        self.pinned_count = len(self.messages)
+        # Size of the turns dropped so far, i.e. what each request no longer resends
+        self.bytes_saved = 0
+        self.tokens_saved = 0
+        self.last_usage: Dict[str, int] = {}
+        self.last_stats: Optional[ResponseStats] = None
+        self.on_trim: Optional[Callable[['ChatSession', TrimResult], None]] = None
+        self.on_usage: Optional[Callable[['ChatSession', Dict[str, int]], None]] = None
+        # Called with each request's stats when the recorder prints summaries; defaults to stderr
+        self.on_stats: Optional[Callable[['ChatSession', ResponseStats], None]] = None
+
+    def send_message(self, message: Any) -> Generator[str, None, None]:
+        timer = ResponseTimer() if self.stats_recorder is not None else None
+        self.messages.append(self.model.create_message("user", message))
+        self.apply_history_policy()
+        request = list(self.messages)
+        response = StreamBuffer()
+        usage: Dict[str, int] = {}
+        if timer is None:
+            yield from response.tee(self.model.stream_response(request, usage))
+        else:
+            timer.request_built()
+            for chunk in self.model.stream_response(request, usage):
+                timer.chunk_received()
+                response.append(chunk)
+                yield chunk
+        self.messages.append(self.model.create_message("assistant", response.getvalue()))
+        self.last_usage = usage
+        if usage and self.on_usage is not None:
+            self.on_usage(self, usage)
+        if timer is not None:
+            self.record_stats(timer.finish(self.model.get_provider_name(), self.model.request_params(), request, response.getvalue(), usage))
+
+    def record_stats(self, stats: ResponseStats):
+        self.last_stats = stats
+        self.stats_recorder.record(stats)
+        if self.stats_recorder.print_summary:
+            if self.on_stats is not None:
+                self.on_stats(self, stats)
+            else:
+                self.stats_recorder.report(stats)
+
+    def apply_history_policy(self):
+        if self.history_policy is None:
+            return
+        self.messages, result = self.history_policy.trim(self.messages, self.pinned_count)
+        if result.dropped_messages:
+            self.bytes_saved += result.bytes_saved
+            self.tokens_saved += result.tokens_saved
+            if self.on_trim is not None:
+                self.on_trim(self, result)
+
+class AsyncChatModel(ABC):
+    """
+    Non-blocking counterpart of ChatModel: stream_response is an async generator, so many
+    sessions can stream concurrently from one event loop.
+    """
+    def __init__(self, config: configparser.ConfigParser):
+        self.config = config
+        self.default_session: Optional['AsyncChatSession'] = None
+
+    @abstractmethod
+    def initialize(self):
         pass
+
+    @abstractmethod
+    def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        pass
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return {"role": role, "content": content}
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return []
+
+    def new_session(self) -> 'AsyncChatSession':
+        return AsyncChatSession(self)
+
+    def send_message(self, message: str) -> AsyncIterator[str]:
+        if self.default_session is None:
+            self.default_session = self.new_session()
+        return self.default_session.send_message(message)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        if self.default_session is None:
+            self.default_session = self.new_session()
+        return self.default_session.messages
+
+class AsyncChatSession:
+    def __init__(self, model: AsyncChatModel):
+        self.model = model
+        self.messages = model.initial_messages()
+
+    async def send_message(self, message: Any) -> AsyncIterator[str]:
+        self.messages.append(self.model.create_message("user", message))
+        response = StreamBuffer()
+        async for chunk in self.model.stream_response(list(self.messages)):
+            response.append(chunk)
+            yield chunk
+        self.messages.append(self.model.create_message("assistant", response.getvalue()))
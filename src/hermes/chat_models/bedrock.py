@@ -1,15 +1,22 @@
 import configparser
-from typing import Generator
-from .base import ChatModel
+from typing import Any, Dict, Generator, List, Optional
+from . import client_pool
+from .adapters import ThreadedAsyncChatModel
+from .base import ChatModel, add_usage
+from .prompt_cache import is_prompt_cache_enabled, mark_bedrock_cache
 import boto3
 
 class BedrockModel(ChatModel):
     def __init__(self, config: configparser.ConfigParser, model_tag: str):
         super().__init__(config)
         self.model_tag = model_tag
-    
+        self.context_window = 128000 if model_tag == 'mistral' else 200000
+
     def initialize(self):
-        self.client = boto3.client('bedrock-runtime')
+        self.client = client_pool.get_client(
+            ('bedrock-runtime', client_pool.settings_key(self.config)),
+            lambda: boto3.client('bedrock-runtime', **client_pool.boto3_client_kwargs(self.config))
+        )
         if self.model_tag == 'claude':
             self.model_id = 'anthropic.claude-3-sonnet-20240229-v1:0'
         elif self.model_tag == 'claude-3.5':
@@ -18,32 +25,45 @@ class BedrockModel(ChatModel):
             self.model_id = 'anthropic.claude-3-opus-20240229-v1:0'
         else:
             self.model_id = 'mistral.mistral-large-2407-v1:0'
-        self.messages = []
+        self.prompt_cache = is_prompt_cache_enabled(self.config)
 
-    def send_message(self, message) -> Generator[str, None, None]:
-        if isinstance(message, str):
-            message = [{'text': message}]
-        # Sorting to put the texts in the end, fails with strange error otherwise
-        message.sort(key=lambda x: 'text' in x)
-        self.messages.append(self.create_message('user', message))
+    def request_params(self) -> Dict[str, Any]:
+        return {'modelId': self.model_id}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        if self.prompt_cache:
+            messages = mark_bedrock_cache(messages)
         response = self.client.converse_stream(
-            modelId=self.model_id,
-            messages=self.messages
+            messages=messages,
+            **self.request_params()
         )
 
-        full_response = ""
+        # Token usage arrives in a metadata event after messageStop, so read the stream to its end
         for event in response['stream']:
             if 'contentBlockDelta' in event:
-                content = event['contentBlockDelta']['delta'].get('text', '')
-                full_response += content
-                yield content
-            elif 'messageStop' in event:
-                break
-
-        self.messages.append(self.create_message('assistant', [{'text': full_response}]))
+                yield event['contentBlockDelta']['delta'].get('text', '')
+            elif 'metadata' in event:
+                metadata_usage = event['metadata'].get('usage', {})
+                add_usage(
+                    usage,
+                    input_tokens=metadata_usage.get('inputTokens'),
+                    output_tokens=metadata_usage.get('outputTokens'),
+                    cache_read_tokens=metadata_usage.get('cacheReadInputTokens'),
+                    cache_write_tokens=metadata_usage.get('cacheWriteInputTokens'),
+                )
 
     def create_message(self, role, content):
+        if isinstance(content, str):
+            content = [{'text': content}]
+        # Sorting to put the texts in the end, fails with strange error otherwise
+        content.sort(key=lambda x: 'text' in x)
         return {
             'role': role,
             'content': content
         }
+
+class AsyncBedrockModel(ThreadedAsyncChatModel):
+    """boto3 has no async client, so converse_stream runs on executor threads."""
+    def __init__(self, config: configparser.ConfigParser, model_tag: str):
+        super().__init__(BedrockModel(config, model_tag))
+        self.model_tag = model_tag
@@ -0,0 +1,136 @@
+"""
+Record and replay model streams, for profiling Hermes offline under realistic traffic.
+
+--record FILE appends every request and the exact timed chunk stream it produced to a
+JSONL cassette. --replay FILE serves those streams instead of calling the provider, as
+fast as possible or, with --replay-speed, at the recorded pace (1 is original speed, 2
+twice as fast):
+
+    [CASSETTE]
+    record = ~/hermes.cassette.jsonl
+    replay =
+    speed = 0
+
+Replayed requests are matched by their exact message history. Requests that don't match
+(e.g. after editing a prompt) get the next unused recording in order.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Generator, List, Optional
+
+from .base import ChatModel, add_usage
+from .wrappers import ChatModelWrapper
+
+def get_cassette_settings(config) -> Dict[str, Any]:
+    section = config['CASSETTE'] if 'CASSETTE' in config else {}
+    return {
+        'record': os.path.expanduser(section['record']) if section.get('record') else None,
+        'replay': os.path.expanduser(section['replay']) if section.get('replay') else None,
+        'speed': float(section.get('speed', 0)),
+    }
+
+def get_request_key(messages: List[Dict[str, Any]]) -> str:
+    payload = json.dumps(messages, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class RecordingChatModel(ChatModelWrapper):
+    """Appends each completed stream, with chunk offsets in seconds from the request, to the cassette."""
+    def __init__(self, model: ChatModel, path: str):
+        super().__init__(model)
+        self.path = path
+        self.lock = threading.Lock()
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        response_usage: Dict[str, int] = {}
+        chunks = []
+        start = time.perf_counter()
+        for chunk in self.model.stream_response(messages, response_usage):
+            chunks.append((time.perf_counter() - start, chunk))
+            yield chunk
+        add_usage(usage, **response_usage)
+        self.record({
+            'provider': self.get_provider_name(),
+            'params': self.request_params(),
+            'key': get_request_key(messages),
+            'messages': messages,
+            'chunks': chunks,
+            'usage': response_usage,
+            'recorded_at': time.time(),
+        })
+
+    def record(self, interaction: Dict[str, Any]):
+        line = json.dumps(interaction, default=repr)
+        with self.lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+def load_cassette(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class ReplayChatModel(ChatModelWrapper):
+    """
+    Serves recorded streams in place of the wrapped provider, which is never initialized
+    or called. It still formats messages, so requests match what was recorded.
+    """
+    def __init__(self, model: ChatModel, interactions: List[Dict[str, Any]], speed: float = 0):
+        super().__init__(model)
+        if not interactions:
+            raise ValueError("The cassette has no recorded responses")
+        self.interactions = interactions
+        self.speed = speed
+        self.unused: Dict[str, Deque[int]] = defaultdict(deque)
+        for index, interaction in enumerate(interactions):
+            self.unused[interaction['key']].append(index)
+        self.used = [False] * len(interactions)
+        self.next_index = 0
+        self.lock = threading.Lock()
+        self.matched = 0
+        self.unmatched = 0
+
+    def initialize(self):
+        pass
+
+    def warm_up(self):
+        pass
+
+    def request_params(self) -> Dict[str, Any]:
+        return self.interactions[0]['params']
+
+    def get_provider_name(self) -> str:
+        return self.interactions[0]['provider']
+
+    def find_interaction(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self.lock:
+            candidates = self.unused.get(get_request_key(messages))
+            while candidates and self.used[candidates[0]]:
+                candidates.popleft()
+            if candidates:
+                index = candidates.popleft()
+                self.matched += 1
+            else:
+                while self.next_index < len(self.used) and self.used[self.next_index]:
+                    self.next_index += 1
+                if self.next_index == len(self.used):
+                    raise LookupError("No recorded response left in the cassette for this request")
+                index = self.next_index
+                self.unmatched += 1
+            self.used[index] = True
+            return self.interactions[index]
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        interaction = self.find_interaction(messages)
+        start = time.perf_counter()
+        for offset, chunk in interaction['chunks']:
+            if self.speed > 0:
+                delay = start + offset / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield chunk
+        add_usage(usage, **interaction.get('usage', {}))
+
+    def get_stats_line(self) -> str:
+        return f"Replay: {self.matched} requests matched, {self.unmatched} served in recorded order"
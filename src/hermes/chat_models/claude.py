@@ -1,20 +1,59 @@
-from typing import Generator
-from .base import ChatModel
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional
+from . import client_pool
+from .base import AsyncChatModel, ChatModel, add_usage
+from .prompt_cache import is_prompt_cache_enabled, mark_anthropic_cache
+from .retry import sdk_retry_kwargs
 import anthropic
 
+MODEL_ID = "claude-3-5-sonnet-20240620"
+MAX_TOKENS = 1024
+
 class ClaudeModel(ChatModel):
+    context_window = 200000
+
     def initialize(self):
         api_key = self.config["ANTHROPIC"]["api_key"]
-        self.client = anthropic.Anthropic(api_key=api_key)
-        self.messages = []
-
-    def send_message(self, message: str) -> Generator[str, None, None]:
-        self.messages.append({"role": "user", "content": message})
-        with self.client.messages.stream(
-            model="claude-3-5-sonnet-20240620",
-            messages=self.messages,
-            max_tokens=1024
-        ) as stream:
+        base_url = self.config["ANTHROPIC"].get("base_url")
+        client_kwargs = {"base_url": base_url} if base_url else {}
+        retry_kwargs = sdk_retry_kwargs(self.config)
+        self.client = client_pool.get_client(
+            ('anthropic', api_key, base_url, client_pool.settings_key(self.config, retry_kwargs)),
+            lambda: anthropic.Anthropic(api_key=api_key, **client_kwargs, **client_pool.http_client_kwargs(self.config), **retry_kwargs)
+        )
+        self.prompt_cache = is_prompt_cache_enabled(self.config)
+
+    def warm_up(self):
+        self.client.models.list(limit=1)
+
+    def request_params(self) -> Dict[str, Any]:
+        return {"model": MODEL_ID, "max_tokens": MAX_TOKENS}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        if self.prompt_cache:
+            messages = mark_anthropic_cache(messages)
+        with self.client.messages.stream(messages=messages, **self.request_params()) as stream:
             for text in stream.text_stream:
                 yield text
-        self.messages.append({"role": "assistant", "content": message})
+            if usage is not None:
+                final_usage = stream.get_final_message().usage
+                add_usage(
+                    usage,
+                    input_tokens=final_usage.input_tokens,
+                    output_tokens=final_usage.output_tokens,
+                    cache_read_tokens=getattr(final_usage, 'cache_read_input_tokens', None),
+                    cache_write_tokens=getattr(final_usage, 'cache_creation_input_tokens', None),
+                )
+
+class AsyncClaudeModel(AsyncChatModel):
+    def initialize(self):
+        api_key = self.config["ANTHROPIC"]["api_key"]
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        async with self.client.messages.stream(
+            model=MODEL_ID,
+            messages=messages,
+            max_tokens=MAX_TOKENS
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
@@ -0,0 +1,80 @@
+"""
+Process-wide pool of provider SDK clients.
+
+SDK clients own the HTTP connection pool, so building a new one on every initialize()
+(and therefore on every /clear) throws away keep-alive connections and repeats DNS, TLS
+and, for boto3, credential and endpoint resolution. Models fetch their client from here
+instead, keyed by provider, credentials and the transport and retry settings baked into
+the client, so re-initializing only resets conversation state and configs that differ in
+those settings (e.g. daemon sessions) never share a client.
+
+Connection limits are read from the optional [HTTP] config section:
+
+    [HTTP]
+    max_connections = 20
+    max_keepalive_connections = 10
+    keepalive_expiry = 60
+    http2 = true
+
+Without that section the SDKs' own transport defaults are kept. http2 needs the h2
+package (pip install hermes-cli[http2]).
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_clients: Dict[Hashable, Any] = {}
+_lock = threading.Lock()
+
+def get_client(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the pooled client for key, creating it with factory on first use."""
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+def clear():
+    with _lock:
+        _clients.clear()
+
+def settings_key(config, sdk_kwargs: Optional[Dict[str, Any]] = None) -> Tuple:
+    """The part of a pool key covering the [HTTP] settings and the SDK kwargs (e.g. retries) a factory uses."""
+    return tuple(sorted(get_http_settings(config).items())) + tuple(sorted((sdk_kwargs or {}).items()))
+
+def get_http_settings(config) -> Dict[str, Any]:
+    if 'HTTP' not in config:
+        return {}
+    section = config['HTTP']
+    return {
+        'max_connections': int(section.get('max_connections', 20)),
+        'max_keepalive_connections': int(section.get('max_keepalive_connections', 10)),
+        'keepalive_expiry': float(section.get('keepalive_expiry', 60)),
+        'http2': str(section.get('http2', 'false')).lower() in ('1', 'true', 'yes', 'on'),
+    }
+
+def http_client_kwargs(config) -> Dict[str, Any]:
+    """Extra SDK constructor kwargs carrying an httpx client with the configured limits, if any."""
+    settings = get_http_settings(config)
+    if not settings:
+        return {}
+
+    import httpx
+    if settings['http2']:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ValueError("[HTTP] http2 = true needs the h2 package; install it with: pip install hermes-cli[http2]") from None
+    limits = httpx.Limits(
+        max_connections=settings['max_connections'],
+        max_keepalive_connections=settings['max_keepalive_connections'],
+        keepalive_expiry=settings['keepalive_expiry'],
+    )
+    return {'http_client': httpx.Client(limits=limits, http2=settings['http2'])}
+
+def boto3_client_kwargs(config) -> Dict[str, Any]:
+    settings = get_http_settings(config)
+    if not settings:
+        return {}
+
+    from botocore.config import Config
+    return {'config': Config(max_pool_connections=settings['max_connections'], tcp_keepalive=True)}
@@ -1,15 +1,24 @@
 from typing import Generator
-from .openai import OpenAIModel
+from .openai import AsyncOpenAIModel, OpenAIModel
+
+def to_openai_config(config) -> dict:
+    config = dict(config)
+    config["OPENAI"] = {
+        "api_key": config["DEEPSEEK"]["api_key"],
+        "base_url": config["DEEPSEEK"].get("base_url", "https://api.deepseek.com"),
+        "model": config["DEEPSEEK"].get("model", "deepseek-coder")
+    }
+    return config
 
 class DeepSeekModel(OpenAIModel):
     def initialize(self):
-        self.config = dict(self.config)
-        self.config["OPENAI"] = {
-            "api_key": self.config["DEEPSEEK"]["api_key"],
-            "base_url": self.config["DEEPSEEK"].get("base_url", "https://api.deepseek.com"),
-            "model": self.config["DEEPSEEK"].get("model", "deepseek-coder")
-        }
+        self.config = to_openai_config(self.config)
         super().initialize()
 
     def send_message(self, message: str) -> Generator[str, None, None]:
         return super().send_message(message)
+
+class AsyncDeepSeekModel(AsyncOpenAIModel):
+    def initialize(self):
+        self.config = to_openai_config(self.config)
+        super().initialize()
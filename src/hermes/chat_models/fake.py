@@ -0,0 +1,101 @@
+"""
+Offline model for benchmarking Hermes itself, selected with --model fake.
+
+Streams deterministic or scripted replies with configurable pacing and injected faults,
+so Hermes's own overhead can be measured without API calls:
+
+    [FAKE]
+    reply_words = 200
+    chunk_size = 16
+    chunks_per_second = 0
+    first_chunk_delay = 0
+    error_rate = 0
+    seed = 0
+
+The reply is reply_words generated words, unless `reply` sets a fixed text or `reply_file`
+holds replies (separated by lines containing only ---) that are used in turn.
+chunk_size is in characters and chunks_per_second = 0 streams as fast as possible.
+error_rate is the probability that a request fails before its first chunk, and
+fail_after_chunks drops every stream after that many chunks.
+"""
+import configparser
+import random
+import threading
+import time
+from typing import Any, Dict, Generator, List, Optional
+
+from .adapters import ThreadedAsyncChatModel
+from .base import ChatModel, add_usage
+from .history import estimate_tokens, measure
+
+class FakeModelError(ConnectionError):
+    """Injected failure; a ConnectionError so the retry layer treats it like a dropped connection."""
+
+def generate_reply(words: int) -> str:
+    return ' '.join(f"word{i % 97}" for i in range(words))
+
+def load_replies(section) -> List[str]:
+    if section.get('reply_file'):
+        with open(section['reply_file'], 'r', encoding='utf-8') as f:
+            text = f.read()
+        return [reply.strip('\n') for reply in text.split('\n---\n')]
+    if section.get('reply'):
+        return [section['reply']]
+    return [generate_reply(int(section.get('reply_words', 200)))]
+
+class FakeModel(ChatModel):
+    def __init__(self, config: configparser.ConfigParser):
+        super().__init__(config)
+        section = config['FAKE'] if config is not None and 'FAKE' in config else {}
+        self.replies = load_replies(section)
+        self.chunk_size = max(int(section.get('chunk_size', 16)), 1)
+        self.chunks_per_second = float(section.get('chunks_per_second', 0))
+        self.first_chunk_delay = float(section.get('first_chunk_delay', 0))
+        self.error_rate = float(section.get('error_rate', 0))
+        fail_after_chunks = section.get('fail_after_chunks')
+        self.fail_after_chunks: Optional[int] = int(fail_after_chunks) if fail_after_chunks else None
+        self.random = random.Random(int(section.get('seed', 0)))
+        self.lock = threading.Lock()
+        self.requests = 0
+        # Time spent deliberately waiting, i.e. what a real provider would account for
+        self.simulated_seconds = 0.0
+
+    def initialize(self):
+        pass
+
+    def request_params(self) -> Dict[str, Any]:
+        return {'model': 'fake'}
+
+    def next_request(self):
+        with self.lock:
+            reply = self.replies[self.requests % len(self.replies)]
+            self.requests += 1
+            fail = self.random.random() < self.error_rate
+        return reply, fail
+
+    def wait(self, seconds: float):
+        if seconds > 0:
+            # Count the time actually slept, so timer overshoot isn't reported as Hermes overhead
+            start = time.perf_counter()
+            time.sleep(seconds)
+            with self.lock:
+                self.simulated_seconds += time.perf_counter() - start
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        reply, fail = self.next_request()
+        self.wait(self.first_chunk_delay)
+        if fail:
+            raise FakeModelError("Injected fake model error")
+
+        interval = 1 / self.chunks_per_second if self.chunks_per_second > 0 else 0
+        for index, start in enumerate(range(0, len(reply), self.chunk_size)):
+            if self.fail_after_chunks is not None and index >= self.fail_after_chunks:
+                raise FakeModelError(f"Injected fake stream drop after {index} chunks")
+            if index:
+                self.wait(interval)
+            yield reply[start:start + self.chunk_size]
+        add_usage(usage, input_tokens=estimate_tokens(measure(messages)), output_tokens=estimate_tokens(len(reply.encode('utf-8'))))
+
+class AsyncFakeModel(ThreadedAsyncChatModel):
+    def __init__(self, config: configparser.ConfigParser):
+        super().__init__(FakeModel(config))
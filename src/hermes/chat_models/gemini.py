@@ -1,20 +1,100 @@
-from typing import Generator
-from .base import ChatModel
+import datetime
+import hashlib
+import json
+import threading
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional
+from .base import AsyncChatModel, ChatModel, add_usage
+from .history import estimate_tokens, measure
+from .prompt_cache import is_prompt_cache_enabled
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
+def create_gemini_message(role: str, content: Any) -> Dict[str, Any]:
+    return {"role": "model" if role == "assistant" else role, "parts": [content]}
+
+MODEL_ID = 'gemini-1.5-pro-exp-0801'
+# Gemini rejects cached content smaller than this
+MIN_CACHED_TOKENS = 32768
+CACHE_TTL = datetime.timedelta(hours=1)
+
 class GeminiModel(ChatModel):
+    context_window = 2000000
+
     def initialize(self):
         api_key = self.config["GEMINI"]["api_key"]
         genai.configure(api_key=api_key)
-        self.chat = genai.GenerativeModel('gemini-1.5-pro-exp-0801').start_chat(history=[])
-
-    def send_message(self, message: str) -> Generator[str, None, None]:
-        response = self.chat.send_message(message, stream=True, safety_settings={
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        })
+        self.client = genai.GenerativeModel(MODEL_ID)
+        self.prompt_cache = is_prompt_cache_enabled(self.config)
+        self.cached_clients: Dict[str, Optional[genai.GenerativeModel]] = {}
+        self.cached_clients_lock = threading.Lock()
+
+    def warm_up(self):
+        genai.get_model(f"models/{MODEL_ID}")
+
+    def request_params(self) -> Dict[str, Any]:
+        return {"model": MODEL_ID}
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return create_gemini_message(role, content)
+
+    def get_cached_client(self, prefix: List[Dict[str, Any]]) -> Optional[genai.GenerativeModel]:
+        """
+        Return a model bound to cached content holding the given prefix, creating it once per prefix.
+
+        Returns None when the prefix is too small to cache or the API refuses to cache it, in
+        which case the request is sent uncached.
+        """
+        if estimate_tokens(measure(prefix)) < MIN_CACHED_TOKENS:
+            return None
+        key = hashlib.sha256(json.dumps(prefix, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+        with self.cached_clients_lock:
+            if key not in self.cached_clients:
+                try:
+                    from google.generativeai import caching
+                    cached_content = caching.CachedContent.create(model=MODEL_ID, contents=prefix, ttl=CACHE_TTL)
+                    self.cached_clients[key] = genai.GenerativeModel.from_cached_content(cached_content)
+                except Exception:
+                    self.cached_clients[key] = None
+            return self.cached_clients[key]
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        client = self.client
+        # The first exchange (context and its reply) is cached once there is a later turn to send after it
+        if self.prompt_cache and len(messages) > 2:
+            cached_client = self.get_cached_client(messages[:2])
+            if cached_client is not None:
+                client, messages = cached_client, messages[2:]
+
+        response = client.generate_content(messages, stream=True, safety_settings=SAFETY_SETTINGS)
         for chunk in response:
             yield chunk.text
+
+        usage_metadata = getattr(response, 'usage_metadata', None)
+        if usage_metadata is not None:
+            add_usage(
+                usage,
+                input_tokens=usage_metadata.prompt_token_count,
+                output_tokens=usage_metadata.candidates_token_count,
+                cache_read_tokens=usage_metadata.cached_content_token_count,
+            )
+
+class AsyncGeminiModel(AsyncChatModel):
+    def initialize(self):
+        api_key = self.config["GEMINI"]["api_key"]
+        genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(MODEL_ID)
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return create_gemini_message(role, content)
+
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        response = await self.client.generate_content_async(messages, stream=True, safety_settings=SAFETY_SETTINGS)
+        async for chunk in response:
+            yield chunk.text
@@ -1,31 +1,79 @@
-from typing import Generator
-from .base import ChatModel
-from groq import Groq
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional
+from . import client_pool
+from .base import AsyncChatModel, ChatModel, add_usage
+from .history import get_context_window
+from .retry import sdk_retry_kwargs
+from groq import AsyncGroq, Groq
+
+SYSTEM_MESSAGE = "You are a world-class AI system, capable of complex reasoning and reflection. Reason through the query inside <thinking> tags, and then provide your final response inside <output> tags. If you detect that you made a mistake in your reasoning at any point, correct yourself inside <reflection> tags."
+DEFAULT_MODEL = "llama3-8b-8192"
+# Windows of models whose size we know; set context_window in [GROQ] for any other
+CONTEXT_WINDOWS = {
+    "llama3-8b-8192": 8192,
+    "llama3-70b-8192": 8192,
+    "mixtral-8x7b-32768": 32768,
+}
 
 class GroqModel(ChatModel):
+    @property
+    def context_window(self) -> Optional[int]:
+        return get_context_window(self.config, "GROQ", DEFAULT_MODEL, CONTEXT_WINDOWS)
+
     def initialize(self):
         api_key = self.config["GROQ"]["api_key"]
-        self.model = self.config["GROQ"].get("model", "llama3-8b-8192")
-        self.client = Groq(api_key=api_key)
-        self.messages = [
-            {"role": "system", "content": "You are a world-class AI system, capable of complex reasoning and reflection. Reason through the query inside <thinking> tags, and then provide your final response inside <output> tags. If you detect that you made a mistake in your reasoning at any point, correct yourself inside <reflection> tags."}
-        ]
-
-    def send_message(self, message: str) -> Generator[str, None, None]:
-        self.messages.append({"role": "user", "content": message})
+        self.model = self.config["GROQ"].get("model", DEFAULT_MODEL)
+        retry_kwargs = sdk_retry_kwargs(self.config)
+        self.client = client_pool.get_client(
+            ('groq', api_key, client_pool.settings_key(self.config, retry_kwargs)),
+            lambda: Groq(api_key=api_key, **client_pool.http_client_kwargs(self.config), **retry_kwargs)
+        )
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return [{"role": "system", "content": SYSTEM_MESSAGE}]
+
+    def warm_up(self):
+        self.client.models.list()
+
+    def request_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
         try:
             response = self.client.chat.completions.create(
-                messages=self.messages,
+                messages=messages,
+                stream=True,
+                **self.request_params()
+            )
+        except Exception as e:
+            raise Exception(f"Error communicating with Groq API: {str(e)}") from e
+
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content is not None:
+                yield chunk.choices[0].delta.content
+            # Groq reports usage on the last chunk, in its x_groq extension
+            chunk_usage = getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+            if usage is not None and chunk_usage:
+                add_usage(usage, input_tokens=chunk_usage.prompt_tokens, output_tokens=chunk_usage.completion_tokens)
+
+class AsyncGroqModel(AsyncChatModel):
+    def initialize(self):
+        api_key = self.config["GROQ"]["api_key"]
+        self.model = self.config["GROQ"].get("model", DEFAULT_MODEL)
+        self.client = AsyncGroq(api_key=api_key)
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return [{"role": "system", "content": SYSTEM_MESSAGE}]
+
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        try:
+            response = await self.client.chat.completions.create(
+                messages=messages,
                 model=self.model,
                 stream=True
             )
         except Exception as e:
             raise Exception(f"Error communicating with Groq API: {str(e)}")
 
-        full_response = ""
-        for chunk in response:
+        async for chunk in response:
             if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                full_response += content
-                yield content
-        self.messages.append({"role": "assistant", "content": full_response})
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,167 @@
+"""
+Hedged requests across several providers, to cut the tail latency of a stalled provider.
+
+Selected with --model hedged and configured with an ordered list of registered models:
+
+    [HEDGE]
+    backends = claude, bedrock-claude-3.5, openai
+    first_chunk_seconds = 5
+
+The request goes to the first backend. If no chunk arrives within first_chunk_seconds (or
+the backend fails before its first chunk), the same history is sent to the next one. The
+first backend to produce a chunk streams the reply and the others are cancelled.
+"""
+import queue
+import threading
+import time
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from .base import ChatModel, add_usage
+
+DEFAULT_FIRST_CHUNK_SECONDS = 5.0
+
+CHUNK, DONE, ERROR = 'chunk', 'done', 'error'
+
+class HedgedAttempt:
+    """One backend's stream, pumped on a daemon thread into the shared event queue."""
+    def __init__(self, name: str, backend: ChatModel, messages: List[Dict[str, Any]], events: queue.Queue):
+        self.name = name
+        self.backend = backend
+        self.usage: Dict[str, int] = {}
+        self.cancelled = threading.Event()
+        # Histories are kept in the neutral {"role", "content"} form and converted per provider
+        request = backend.initial_messages() + [
+            backend.create_message(message['role'], list(message['content']) if isinstance(message['content'], list) else message['content'])
+            for message in messages
+        ]
+        self.thread = threading.Thread(target=self.run, args=(request, events), daemon=True)
+        self.thread.start()
+
+    def run(self, request: List[Dict[str, Any]], events: queue.Queue):
+        stream = self.backend.stream_response(request, self.usage)
+        try:
+            for chunk in stream:
+                # A stalled loser only notices once its next chunk arrives; it then closes
+                # the stream so the connection goes back to the pool
+                if self.cancelled.is_set():
+                    return
+                events.put((self, CHUNK, chunk))
+            events.put((self, DONE, None))
+        except Exception as e:
+            events.put((self, ERROR, e))
+        finally:
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+
+    def cancel(self):
+        self.cancelled.set()
+
+def next_event(events: queue.Queue, attempt: HedgedAttempt) -> Tuple[str, Any]:
+    """Wait for the attempt's next event, discarding anything cancelled attempts still send."""
+    while True:
+        source, kind, value = events.get()
+        if source is attempt:
+            return kind, value
+
+class HedgedChatModel(ChatModel):
+    def __init__(self, config, backends: List[Tuple[str, ChatModel]], first_chunk_timeout: float = DEFAULT_FIRST_CHUNK_SECONDS):
+        super().__init__(config)
+        if not backends:
+            raise ValueError("Hedged model needs at least one backend")
+        self.backends = backends
+        self.first_chunk_timeout = first_chunk_timeout
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.hedged_requests = 0
+        self.wins: Dict[str, int] = {}
+
+    @property
+    def context_window(self) -> Optional[int]:
+        windows = [backend.context_window for _, backend in self.backends if backend.context_window]
+        return min(windows) if windows else None
+
+    def initialize(self):
+        for _, backend in self.backends:
+            backend.initialize()
+
+    def warm_up(self):
+        # Every backend may end up serving a request, so warm them all
+        for _, backend in self.backends:
+            try:
+                backend.warm_up()
+            except Exception:
+                pass
+
+    def request_params(self) -> Dict[str, Any]:
+        return {'backends': [(name, backend.request_params()) for name, backend in self.backends]}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        events: queue.Queue = queue.Queue()
+        attempts: List[HedgedAttempt] = []
+        try:
+            winner, kind, value = self.race(messages, events, attempts)
+            for attempt in attempts:
+                if attempt is not winner:
+                    attempt.cancel()
+            self.record_win(winner.name, hedged=len(attempts) > 1)
+
+            while kind == CHUNK:
+                yield value
+                kind, value = next_event(events, winner)
+            if kind == ERROR:
+                raise value
+            add_usage(usage, **winner.usage)
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def race(self, messages: List[Dict[str, Any]], events: queue.Queue, attempts: List[HedgedAttempt]) -> Tuple[HedgedAttempt, str, Any]:
+        """Start backends in order until one produces its first chunk (or finishes), and return that event."""
+        pending = 0
+        next_hedge_at = 0.0
+        last_error: Optional[Exception] = None
+        while True:
+            now = time.monotonic()
+            can_hedge = len(attempts) < len(self.backends)
+            if can_hedge and (pending == 0 or now >= next_hedge_at):
+                name, backend = self.backends[len(attempts)]
+                attempts.append(HedgedAttempt(name, backend, messages, events))
+                pending += 1
+                next_hedge_at = now + self.first_chunk_timeout
+                continue
+            if pending == 0:
+                raise last_error
+            try:
+                attempt, kind, value = events.get(timeout=max(next_hedge_at - now, 0) if can_hedge else None)
+            except queue.Empty:
+                continue
+            if kind != ERROR:
+                return attempt, kind, value
+            # Failed before its first chunk: hedge to the next backend right away
+            pending -= 1
+            last_error = value
+            next_hedge_at = 0.0
+
+    def record_win(self, name: str, hedged: bool):
+        with self.lock:
+            self.requests += 1
+            self.hedged_requests += hedged
+            self.wins[name] = self.wins.get(name, 0) + 1
+
+    def get_stats_line(self) -> str:
+        wins = ', '.join(f"{name} {count}" for name, count in self.wins.items())
+        return f"Hedged requests: {self.hedged_requests} of {self.requests} hedged; answered by {wins or 'none'}"
+
+def create_hedged_model(config) -> HedgedChatModel:
+    """Build the hedged model from the [HEDGE] config section; registered as --model hedged."""
+    from hermes.model_registry import create_provider_model
+
+    section = config['HEDGE'] if 'HEDGE' in config else {}
+    names = [name.strip() for name in section.get('backends', '').split(',') if name.strip()]
+    if not names:
+        raise ValueError("--model hedged needs a [HEDGE] section listing backends, e.g. backends = claude, openai")
+    if 'hedged' in names:
+        raise ValueError("The hedged model cannot be one of its own backends")
+    timeout = float(section.get('first_chunk_seconds', DEFAULT_FIRST_CHUNK_SECONDS))
+    return HedgedChatModel(config, [(name, create_provider_model(name, config)) for name in names], timeout)
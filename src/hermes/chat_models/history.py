@@ -0,0 +1,100 @@
+"""
+Keeps a session's history inside a token budget.
+
+The initial messages (system prompt, and by default the first exchange, which carries the
+file context) are pinned. Older user/assistant turns after them are dropped in pairs so
+roles keep alternating, until the history fits. The budget is the smaller of the
+configured limit and the provider's context window minus room for the reply:
+
+    [HISTORY]
+    max_tokens = 50000
+    keep_initial = true
+
+Only providers that know their model's window contribute one; where it depends on the
+configured model, a context_window key in the provider's section sets it.
+
+Token counts are estimated at four bytes per token, which is close enough for a budget
+and needs no tokenizer.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+BYTES_PER_TOKEN = 4
+# Room left in the context window for the model's reply
+REPLY_TOKENS = 4096
+
+def measure(content: Any) -> int:
+    """Size in bytes of the text and binary payloads in a message, whatever the provider's format."""
+    if isinstance(content, str):
+        return len(content.encode('utf-8'))
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    if isinstance(content, dict):
+        return sum(measure(value) for value in content.values())
+    if isinstance(content, (list, tuple)):
+        return sum(measure(item) for item in content)
+    return 0
+
+def estimate_tokens(size: int) -> int:
+    return (size + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+class TrimResult(NamedTuple):
+    dropped_messages: int
+    bytes_saved: int
+    tokens_saved: int
+
+class HistoryPolicy:
+    def __init__(self, max_tokens: int, keep_initial: bool = True):
+        self.max_tokens = max_tokens
+        self.keep_initial = keep_initial
+
+    def trim(self, messages: List[Dict[str, Any]], pinned_count: int) -> Tuple[List[Dict[str, Any]], TrimResult]:
+        """
+        Return the history with the oldest unpinned turns removed until it fits the budget.
+
+        :param messages: Full history, ending with the user message about to be sent
+        :param pinned_count: Number of leading messages (e.g. the system prompt) that are never dropped
+        """
+        if self.keep_initial:
+            # The first user message and its reply carry the initial context
+            pinned_count += 2
+        sizes = [measure(message) for message in messages]
+        total = sum(sizes)
+
+        start = pinned_count
+        # Always keep the latest user message; drop whole user/assistant pairs before it
+        while estimate_tokens(total) > self.max_tokens and start + 2 < len(messages):
+            total -= sizes[start] + sizes[start + 1]
+            start += 2
+
+        if start == pinned_count:
+            return messages, TrimResult(0, 0, 0)
+        dropped_bytes = sum(sizes[pinned_count:start])
+        kept = messages[:pinned_count] + messages[start:]
+        return kept, TrimResult(start - pinned_count, dropped_bytes, estimate_tokens(dropped_bytes))
+
+def get_context_window(config, section_name: str, default_model: str, known_windows: Dict[str, int]) -> Optional[int]:
+    """
+    The provider section's context_window, else the window of its configured model if known.
+    None means the window is unknown, so history is only trimmed to [HISTORY] max_tokens.
+    """
+    section = config[section_name] if section_name in config else {}
+    if section.get('context_window'):
+        return int(section['context_window'])
+    return known_windows.get(section.get('model', default_model))
+
+def create_history_policy(config, model) -> Optional[HistoryPolicy]:
+    """Build the policy for a model from the [HISTORY] section and the model's context window."""
+    section = config['HISTORY'] if 'HISTORY' in config else {}
+    if str(section.get('enabled', 'true')).lower() in ('0', 'false', 'no', 'off'):
+        return None
+
+    limits = []
+    if section.get('max_tokens'):
+        limits.append(int(section['max_tokens']))
+    if model.context_window:
+        limits.append(model.context_window - REPLY_TOKENS)
+    if not limits:
+        return None
+
+    keep_initial = str(section.get('keep_initial', 'true')).lower() not in ('0', 'false', 'no', 'off')
+    return HistoryPolicy(min(limits), keep_initial)
@@ -1,25 +1,44 @@
-from typing import Generator
-from .base import ChatModel
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional
+from .base import AsyncChatModel, ChatModel, add_usage
 import ollama
 
 class OllamaModel(ChatModel):
     def initialize(self):
         self.model = self.config["OLLAMA"]["model"]
-        self.messages = []
+        # How long Ollama keeps the model loaded after a request, e.g. "30m"; unset keeps the server default
+        keep_alive = self.config["OLLAMA"].get("keep_alive")
+        self.keep_alive_kwargs = {"keep_alive": keep_alive} if keep_alive else {}
 
-    def send_message(self, message: str) -> Generator[str, None, None]:
-        self.messages.append({"role": "user", "content": message})
-        
+    def warm_up(self):
+        # A generate call without a prompt just loads the model into memory
+        ollama.generate(model=self.model, **self.keep_alive_kwargs)
 
+    def request_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
         response = ollama.chat(
             model=self.model,
-            messages=self.messages.copy(),
+            messages=messages,
             stream=True,
+            **self.keep_alive_kwargs,
         )
-        full_response = ""
         for chunk in response:
-            content = chunk['message']['content']
-            full_response += content
-            yield content
+            yield chunk['message']['content']
+            if usage is not None and chunk.get('done'):
+                # The final chunk carries the prompt and reply token counts
+                add_usage(usage, input_tokens=chunk.get('prompt_eval_count'), output_tokens=chunk.get('eval_count'))
+
+class AsyncOllamaModel(AsyncChatModel):
+    def initialize(self):
+        self.model = self.config["OLLAMA"]["model"]
+        self.client = ollama.AsyncClient()
 
-        self.messages.append({"role": "assistant", "content": full_response})
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        response = await self.client.chat(
+            model=self.model,
+            messages=messages,
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk['message']['content']
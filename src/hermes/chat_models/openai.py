@@ -1,33 +1,81 @@
-from typing import Generator
-from .base import ChatModel
+from typing import Any, AsyncIterator, Dict, Generator, List, Optional
+from . import client_pool
+from .base import AsyncChatModel, ChatModel, add_usage
+from .retry import sdk_retry_kwargs
 import openai
 
 class OpenAIModel(ChatModel):
+    system_message: Optional[str] = None
+    context_window = 128000
+
     def initialize(self):
         api_key = self.config["OPENAI"]["api_key"]
         base_url = self.config["OPENAI"].get("base_url", "https://api.openai.com/v1")
         model = self.config["OPENAI"].get("model", "gpt-4-0125-preview")
-        self.client = openai.Client(api_key=api_key, base_url=base_url)
+        retry_kwargs = sdk_retry_kwargs(self.config)
+        self.client = client_pool.get_client(
+            ('openai', api_key, base_url, client_pool.settings_key(self.config, retry_kwargs)),
+            lambda: openai.Client(api_key=api_key, base_url=base_url, **client_pool.http_client_kwargs(self.config), **retry_kwargs)
+        )
         self.model = model
-        self.messages = []
-        
-    def add_system_message(self, message: str):
-        self.messages.append({"role": "system", "content": message})
 
-    def send_message(self, message: str) -> Generator[str, None, None]:
-        self.messages.append({"role": "user", "content": message})
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        if self.system_message is None:
+            return []
+        return [{"role": "system", "content": self.system_message}]
+
+    def warm_up(self):
+        self.client.models.list()
+
+    def request_params(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        # Asks for a final chunk with no choices that carries the request's token usage
+        usage_kwargs = {"stream_options": {"include_usage": True}} if usage is not None else {}
         try:
             stream = self.client.chat.completions.create(
+                messages=messages,
+                stream=True,
+                **usage_kwargs,
+                **self.request_params()
+            )
+        except openai.AuthenticationError:
+            raise Exception("Authentication failed. Please check your API key.")
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content is not None:
+                yield chunk.choices[0].delta.content
+            if usage is not None and getattr(chunk, 'usage', None):
+                add_usage(
+                    usage,
+                    input_tokens=chunk.usage.prompt_tokens,
+                    output_tokens=chunk.usage.completion_tokens,
+                    cache_read_tokens=getattr(getattr(chunk.usage, 'prompt_tokens_details', None), 'cached_tokens', None),
+                )
+
+class AsyncOpenAIModel(AsyncChatModel):
+    system_message: Optional[str] = None
+
+    def initialize(self):
+        api_key = self.config["OPENAI"]["api_key"]
+        base_url = self.config["OPENAI"].get("base_url", "https://api.openai.com/v1")
+        self.model = self.config["OPENAI"].get("model", "gpt-4-0125-preview")
+        self.client = openai.AsyncClient(api_key=api_key, base_url=base_url)
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        if self.system_message is None:
+            return []
+        return [{"role": "system", "content": self.system_message}]
+
+    async def stream_response(self, messages: List[Dict[str, Any]]) -> AsyncIterator[str]:
+        try:
+            stream = await self.client.chat.completions.create(
                 model=self.model,
-                messages=self.messages,
+                messages=messages,
                 stream=True
             )
         except openai.AuthenticationError:
             raise Exception("Authentication failed. Please check your API key.")
-        full_response = ""
-        for chunk in stream:
+        async for chunk in stream:
             if chunk.choices[0].delta.content is not None:
-                content = chunk.choices[0].delta.content
-                full_response += content
-                yield content
-        self.messages.append({"role": "assistant", "content": full_response})
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,43 @@
+"""
+Provider-side prompt prefix caching (--prompt-cache or [PROMPT_CACHE] enabled = true).
+
+The first user message of a session carries everything ContextOrchestrator built (files,
+URLs, ...) and is resent unchanged on every turn. These helpers mark it with the provider's
+cache marker so it is processed at full price once and read from the provider cache after.
+The session history itself is never modified; markers are added to the request copy.
+"""
+from typing import Any, Dict, List, Optional
+
+def is_prompt_cache_enabled(config) -> bool:
+    return 'PROMPT_CACHE' in config and str(config['PROMPT_CACHE'].get('enabled', 'true')).lower() in ('1', 'true', 'yes', 'on')
+
+def find_context_message(messages: List[Dict[str, Any]]) -> Optional[int]:
+    for index, message in enumerate(messages):
+        if message.get('role') == 'user':
+            return index
+    return None
+
+def mark_anthropic_cache(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add an ephemeral cache_control breakpoint to the last block of the context message."""
+    index = find_context_message(messages)
+    if index is None:
+        return messages
+    content = messages[index]['content']
+    if isinstance(content, str):
+        blocks = [{'type': 'text', 'text': content}]
+    else:
+        blocks = [dict(block) for block in content]
+    blocks[-1]['cache_control'] = {'type': 'ephemeral'}
+
+    marked = list(messages)
+    marked[index] = dict(messages[index], content=blocks)
+    return marked
+
+def mark_bedrock_cache(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Append a Converse cachePoint block after the context message's content."""
+    index = find_context_message(messages)
+    if index is None:
+        return messages
+    marked = list(messages)
+    marked[index] = dict(messages[index], content=list(messages[index]['content']) + [{'cachePoint': {'type': 'default'}}])
+    return marked
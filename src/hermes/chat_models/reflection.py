@@ -1,16 +1,38 @@
-from typing import Generator
-from .openai import OpenAIModel
+from typing import Generator, Optional
+from .history import get_context_window
+from .openai import AsyncOpenAIModel, OpenAIModel
+
+SYSTEM_MESSAGE = "You are a world-class AI system, capable of complex reasoning and reflection. Reason through the query inside <thinking> tags, and then provide your final response inside <output> tags. If you detect that you made a mistake in your reasoning at any point, correct yourself inside <reflection> tags."
+DEFAULT_MODEL = "mattshumer/reflection-70b"
+# Set context_window in [REFLECTION] for models other than these
+CONTEXT_WINDOWS = {DEFAULT_MODEL: 8192}
+
+def to_openai_config(config) -> dict:
+    config = dict(config)
+    config["OPENAI"] = {
+        "api_key": config["REFLECTION"]["api_key"],
+        "base_url": "https://openrouter.ai/api/v1",
+        "model": config["REFLECTION"].get("model", DEFAULT_MODEL),
+    }
+    return config
 
 class ReflectionModel(OpenAIModel):
+    system_message = SYSTEM_MESSAGE
+
+    @property
+    def context_window(self) -> Optional[int]:
+        return get_context_window(self.config, "REFLECTION", DEFAULT_MODEL, CONTEXT_WINDOWS)
+
     def initialize(self):
-        self.config = dict(self.config)
-        self.config["OPENAI"] = {
-            "api_key": self.config["REFLECTION"]["api_key"],
-            "base_url": "https://openrouter.ai/api/v1",
-            "model": self.config["REFLECTION"].get("model", "mattshumer/reflection-70b"),
-        }
+        self.config = to_openai_config(self.config)
         super().initialize()
-        super().add_system_message("You are a world-class AI system, capable of complex reasoning and reflection. Reason through the query inside <thinking> tags, and then provide your final response inside <output> tags. If you detect that you made a mistake in your reasoning at any point, correct yourself inside <reflection> tags.")
 
     def send_message(self, message: str) -> Generator[str, None, None]:
         return super().send_message(message)
+
+class AsyncReflectionModel(AsyncOpenAIModel):
+    system_message = SYSTEM_MESSAGE
+
+    def initialize(self):
+        self.config = to_openai_config(self.config)
+        super().initialize()
@@ -0,0 +1,61 @@
+"""
+Opt-in on-disk cache of complete model responses.
+
+Responses are keyed by provider, request parameters (model id, sampling settings) and the
+full message history, so re-running a workflow only pays for the tasks whose prompts
+changed. Enabled with --response-cache or a [RESPONSE_CACHE] config section:
+
+    [RESPONSE_CACHE]
+    enabled = true
+    max_size_mb = 256
+    ttl_hours = 168
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, Generator, List, Optional
+
+from hermes.utils.cache_utils import get_cache_dir
+from hermes.utils.disk_cache import DiskCache
+from .base import ChatModel
+from .wrappers import ChatModelWrapper
+
+def is_response_cache_enabled(config) -> bool:
+    return 'RESPONSE_CACHE' in config and str(config['RESPONSE_CACHE'].get('enabled', 'true')).lower() in ('1', 'true', 'yes', 'on')
+
+def open_response_cache(config) -> DiskCache:
+    section = config['RESPONSE_CACHE']
+    path = section.get('path') or os.path.join(get_cache_dir(), 'responses.sqlite')
+    max_bytes = int(float(section.get('max_size_mb', 256)) * 1024 * 1024)
+    ttl_hours = float(section.get('ttl_hours', 168))
+    return DiskCache(path, max_bytes, ttl_hours * 3600 if ttl_hours > 0 else None)
+
+def get_cache_key(provider: str, params: Dict[str, Any], messages: List[Dict[str, Any]]) -> str:
+    payload = json.dumps({'provider': provider, 'params': params, 'messages': messages}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class CachedChatModel(ChatModelWrapper):
+    """Replays cached responses chunk by chunk; only fully streamed responses are stored."""
+    def __init__(self, model: ChatModel, cache: DiskCache):
+        super().__init__(model)
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        key = get_cache_key(self.get_provider_name(), self.request_params(), messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            yield from json.loads(cached)
+            return
+
+        self.misses += 1
+        chunks = []
+        for chunk in self.model.stream_response(messages, usage):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(key, json.dumps(chunks).encode('utf-8'))
+
+    def get_stats_line(self) -> str:
+        return f"Response cache: {self.hits} hits, {self.misses} misses"
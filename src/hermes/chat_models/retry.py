@@ -0,0 +1,245 @@
+"""
+Retries, backoff and circuit breaking around provider requests.
+
+Every model is wrapped in RetryingChatModel unless disabled. Rate limits (429), overloads
+and 5xx responses, timeouts and dropped connections are retried with jittered
+exponential backoff, waiting at least as long as the provider's Retry-After asks. A
+stream that dies after some chunks is resumed by asking the model to continue from the
+text already received, which is not streamed again.
+
+Repeated failures open a per-provider circuit breaker, so later requests (e.g. the
+remaining workflow tasks) fail fast instead of waiting out the backoff every time.
+
+    [RETRY]
+    enabled = true
+    max_attempts = 4
+    base_delay = 1
+    max_delay = 30
+    max_retry_after = 120
+    failure_threshold = 5
+    reset_seconds = 30
+"""
+import email.utils
+import http.client
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Generator, Iterator, List, NamedTuple, Optional
+
+from hermes.utils.stream_buffer import StreamBuffer
+from .base import ChatModel
+from .wrappers import ChatModelWrapper
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+# Transport errors of the provider SDKs (httpx, botocore, urllib3), matched by name to avoid importing them
+RETRYABLE_ERROR_NAMES = {
+    'APIConnectionError', 'APITimeoutError', 'TransportError', 'TimeoutException', 'RemoteProtocolError',
+    'ProtocolError', 'EndpointConnectionError', 'ConnectTimeoutError', 'ReadTimeoutError', 'ResponseStreamingError',
+}
+# Bedrock error codes, compared case-insensitively as stream errors use lower camel case
+RETRYABLE_AWS_CODES = {
+    'throttlingexception', 'toomanyrequestsexception', 'serviceunavailableexception',
+    'internalserverexception', 'modelnotreadyexception', 'modelstreamerrorexception',
+}
+CONTINUATION_PROMPT = "Your previous response was cut off. Continue exactly where it stopped, without repeating anything or adding any preamble."
+
+def is_retry_enabled(config) -> bool:
+    return 'RETRY' not in config or str(config['RETRY'].get('enabled', 'true')).lower() in ('1', 'true', 'yes', 'on')
+
+def sdk_retry_kwargs(config) -> Dict[str, Any]:
+    """SDK constructor kwargs turning off the SDK's own retries, so they don't multiply with ours."""
+    return {'max_retries': 0} if is_retry_enabled(config) else {}
+
+class RetryPolicy(NamedTuple):
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    max_retry_after: float = 120.0
+    failure_threshold: int = 5
+    reset_seconds: float = 30.0
+
+    def get_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None if the provider asks us to wait too long."""
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None
+        # Full jitter keeps concurrent sessions from retrying in lockstep
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(delay, retry_after or 0)
+
+def create_retry_policy(config) -> RetryPolicy:
+    section = config['RETRY'] if 'RETRY' in config else {}
+    defaults = RetryPolicy()
+    return RetryPolicy(
+        max_attempts=int(section.get('max_attempts', defaults.max_attempts)),
+        base_delay=float(section.get('base_delay', defaults.base_delay)),
+        max_delay=float(section.get('max_delay', defaults.max_delay)),
+        max_retry_after=float(section.get('max_retry_after', defaults.max_retry_after)),
+        failure_threshold=int(section.get('failure_threshold', defaults.failure_threshold)),
+        reset_seconds=float(section.get('reset_seconds', defaults.reset_seconds)),
+    )
+
+def iter_causes(error: Optional[BaseException]) -> Iterator[BaseException]:
+    """The error and the errors it was raised from, since some providers re-raise SDK errors as plain Exceptions."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        return response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    status = getattr(response, 'status_code', None)
+    return status if isinstance(status, int) else None
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from Retry-After (seconds or HTTP date) or retry-after-ms."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(error: BaseException) -> bool:
+    for cause in iter_causes(error):
+        if isinstance(cause, (ConnectionError, TimeoutError, http.client.IncompleteRead)):
+            return True
+        if any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(cause).__mro__):
+            return True
+        response = getattr(cause, 'response', None)
+        if isinstance(response, dict) and str(response.get('Error', {}).get('Code', '')).lower() in RETRYABLE_AWS_CODES:
+            return True
+        status = get_status_code(cause)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+    return False
+
+def find_retry_after(error: BaseException) -> Optional[float]:
+    for cause in iter_causes(error):
+        retry_after = get_retry_after(cause)
+        if retry_after is not None:
+            return retry_after
+    return None
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive retryable failures and rejects calls for
+    reset_seconds. Then a single trial call is let through: success, or an error that
+    isn't retryable (the provider did answer), closes the circuit; failure opens it again.
+    """
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"{self.name} failed {self.failures} times in a row; not sending requests for another {remaining:.0f}s")
+            # Half-open: restart the timer so concurrent callers keep failing fast during the trial
+            self.opened_at = time.monotonic()
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str, policy: RetryPolicy) -> CircuitBreaker:
+    """Return the process-wide breaker for a provider, shared by every model and session using it."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, policy.failure_threshold, policy.reset_seconds)
+        return breaker
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+class RetryingChatModel(ChatModelWrapper):
+    def __init__(self, model: ChatModel, policy: RetryPolicy):
+        super().__init__(model)
+        self.policy = policy
+        # The wrapped model is shared by daemon sessions, hedged races and loadtest workers
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.resumed_streams = 0
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        breaker = get_circuit_breaker(self.get_provider_name(), self.policy)
+        received = StreamBuffer()
+        request = messages
+        attempt = 0
+        while True:
+            breaker.before_call()
+            attempt += 1
+            try:
+                for chunk in self.model.stream_response(request, usage):
+                    received.append(chunk)
+                    yield chunk
+            except Exception as e:
+                if not is_retryable(e):
+                    # The provider answered, so it's up as far as the circuit is concerned; this also ends a half-open trial
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                delay = self.policy.get_delay(attempt, find_retry_after(e))
+                if attempt >= self.policy.max_attempts or delay is None:
+                    raise
+                with self.lock:
+                    self.retries += 1
+                print(f"Request to {breaker.name} failed ({e}); retrying in {delay:.1f}s", file=sys.stderr)
+                time.sleep(delay)
+                partial = received.getvalue()
+                if partial:
+                    with self.lock:
+                        self.resumed_streams += 1
+                    request = self.continuation_request(messages, partial)
+                continue
+            breaker.record_success()
+            return
+
+    def continuation_request(self, messages: List[Dict[str, Any]], partial: str) -> List[Dict[str, Any]]:
+        """The original history plus the text received so far, asking the model to pick up where it stopped."""
+        return messages + [
+            self.create_message("assistant", partial),
+            self.create_message("user", CONTINUATION_PROMPT),
+        ]
+
+    def get_stats_line(self) -> Optional[str]:
+        if not self.retries:
+            return None
+        return f"Retries: {self.retries} ({self.resumed_streams} resumed mid-stream)"
@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Optional
+
+from .base import ChatModel
+
+class ModelStartup:
+    """
+    Initializes a model and pre-warms its connection on a background thread, so client
+    construction, DNS, TLS and auth overlap with context loading and prompt building
+    instead of delaying the first token.
+    """
+    def __init__(self, model: ChatModel):
+        self.model = model
+        self.initialized = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.initialize_seconds: Optional[float] = None
+        self.warm_up_seconds: Optional[float] = None
+        self.waited_seconds = 0.0
+        self.thread = threading.Thread(target=self.run, name="hermes-model-startup", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.model.initialize()
+        except BaseException as e:
+            self.error = e
+            return
+        finally:
+            self.initialize_seconds = time.perf_counter() - start
+            self.initialized.set()
+
+        start = time.perf_counter()
+        try:
+            self.model.warm_up()
+        except Exception:
+            # Best effort: the first request simply opens its own connection
+            pass
+        self.warm_up_seconds = time.perf_counter() - start
+
+    def wait(self):
+        """Block until the model is initialized, re-raising any error from initialize()."""
+        start = time.perf_counter()
+        self.initialized.wait()
+        self.waited_seconds = time.perf_counter() - start
+        if self.error is not None:
+            raise self.error
+
+    def summary(self) -> str:
+        overlapped = max((self.initialize_seconds or 0) - self.waited_seconds, 0)
+        warm_up = f"warm-up {self.warm_up_seconds * 1000:.0f}ms" if self.warm_up_seconds is not None else "warm-up still running"
+        return (
+            f"Startup: model initialized in {(self.initialize_seconds or 0) * 1000:.0f}ms ({warm_up}) in the background; "
+            f"{overlapped * 1000:.0f}ms overlapped with context loading, {self.waited_seconds * 1000:.0f}ms spent waiting for it"
+        )
@@ -0,0 +1,124 @@
+"""
+Per-request latency and throughput metrics.
+
+Every ChatSession request is timed when the model has a StatsRecorder (--stats, or a
+[STATS] config section):
+
+    [STATS]
+    print = true
+    jsonl = ~/.cache/hermes/stats.jsonl
+
+Each completed request is appended to the JSONL file, tagged with the provider, model
+and Hermes version, so runs can be compared across providers and releases.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from hermes.utils.cache_utils import get_cache_dir
+from .history import estimate_tokens, measure
+
+class ResponseStats(NamedTuple):
+    provider: str
+    model: Optional[str]
+    timestamp: float
+    request_build_seconds: float
+    time_to_first_chunk_seconds: Optional[float]
+    total_seconds: float
+    chunks: int
+    mean_chunk_gap_seconds: Optional[float]
+    max_chunk_gap_seconds: Optional[float]
+    bytes_in: int
+    bytes_out: int
+    output_tokens: int
+    tokens_per_second: Optional[float]
+    usage: Dict[str, int]
+
+    def summary(self) -> str:
+        parts = [f"{self.model or self.provider}"]
+        if self.time_to_first_chunk_seconds is not None:
+            parts.append(f"first chunk {self.time_to_first_chunk_seconds * 1000:.0f}ms")
+        parts.append(f"total {self.total_seconds:.2f}s")
+        if self.tokens_per_second is not None:
+            parts.append(f"{self.tokens_per_second:.1f} tok/s")
+        if self.max_chunk_gap_seconds is not None:
+            parts.append(f"max gap {self.max_chunk_gap_seconds * 1000:.0f}ms")
+        parts.append(f"{self.bytes_in:,}B in / {self.bytes_out:,}B out")
+        if self.usage:
+            parts.append(', '.join(f"{key}={value:,}" for key, value in sorted(self.usage.items())))
+        parts.append(f"build {self.request_build_seconds * 1000:.1f}ms")
+        return "Stats: " + " | ".join(parts)
+
+class ResponseTimer:
+    """Collects timestamps for one request as the session builds it and streams the reply."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.request_sent = self.started
+        self.chunk_times: List[float] = []
+
+    def request_built(self):
+        self.request_sent = time.perf_counter()
+
+    def chunk_received(self):
+        self.chunk_times.append(time.perf_counter())
+
+    def finish(self, provider: str, params: Dict[str, Any], request: List[Dict[str, Any]], response: str, usage: Dict[str, int]) -> ResponseStats:
+        finished = time.perf_counter()
+        gaps = [later - earlier for earlier, later in zip(self.chunk_times, self.chunk_times[1:])]
+        first_chunk = self.chunk_times[0] - self.request_sent if self.chunk_times else None
+        bytes_out = len(response.encode('utf-8'))
+        output_tokens = usage.get('output_tokens') or estimate_tokens(bytes_out)
+        streaming_seconds = finished - self.chunk_times[0] if self.chunk_times else 0
+        return ResponseStats(
+            provider=provider,
+            model=params.get('model') or params.get('modelId'),
+            timestamp=time.time(),
+            request_build_seconds=self.request_sent - self.started,
+            time_to_first_chunk_seconds=first_chunk,
+            total_seconds=finished - self.request_sent,
+            chunks=len(self.chunk_times),
+            mean_chunk_gap_seconds=sum(gaps) / len(gaps) if gaps else None,
+            max_chunk_gap_seconds=max(gaps) if gaps else None,
+            bytes_in=measure(request),
+            bytes_out=bytes_out,
+            output_tokens=output_tokens,
+            tokens_per_second=output_tokens / streaming_seconds if streaming_seconds > 0 else None,
+            usage=dict(usage),
+        )
+
+def get_hermes_version() -> Optional[str]:
+    try:
+        from importlib.metadata import version
+        return version('hermes-cli')
+    except Exception:
+        return None
+
+class StatsRecorder:
+    def __init__(self, jsonl_path: Optional[str], print_summary: bool):
+        self.jsonl_path = jsonl_path
+        self.print_summary = print_summary
+        self.version = get_hermes_version()
+        self.lock = threading.Lock()
+
+    def record(self, stats: ResponseStats):
+        if not self.jsonl_path:
+            return
+        line = json.dumps(dict(stats._asdict(), version=self.version))
+        with self.lock, open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def report(self, stats: ResponseStats):
+        print(stats.summary(), file=sys.stderr)
+
+def create_stats_recorder(config) -> Optional[StatsRecorder]:
+    if 'STATS' not in config:
+        return None
+    section = config['STATS']
+    print_summary = str(section.get('print', 'false')).lower() in ('1', 'true', 'yes', 'on')
+    jsonl_path = section.get('jsonl')
+    if jsonl_path is None:
+        jsonl_path = os.path.join(get_cache_dir(), 'stats.jsonl')
+    return StatsRecorder(os.path.expanduser(jsonl_path) if jsonl_path else None, print_summary)
@@ -0,0 +1,50 @@
+from typing import Any, Dict, Generator, List, Optional, Type, TypeVar
+
+from .base import ChatModel
+
+M = TypeVar('M', bound=ChatModel)
+
+class ChatModelWrapper(ChatModel):
+    """
+    Base for models that add behaviour around another ChatModel's requests (caching, stats, ...).
+
+    Wrappers sit between ChatSession and the provider, so they see every request's full
+    history and the sessions, ChatApplication and LLMTask need no changes.
+    """
+    def __init__(self, model: ChatModel):
+        super().__init__(model.config)
+        self.model = model
+
+    @property
+    def context_window(self):
+        return self.model.context_window
+
+    def initialize(self):
+        self.model.initialize()
+
+    def warm_up(self):
+        self.model.warm_up()
+
+    def stream_response(self, messages: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> Generator[str, None, None]:
+        return self.model.stream_response(messages, usage)
+
+    def request_params(self) -> Dict[str, Any]:
+        return self.model.request_params()
+
+    def create_message(self, role: str, content: Any) -> Dict[str, Any]:
+        return self.model.create_message(role, content)
+
+    def initial_messages(self) -> List[Dict[str, Any]]:
+        return self.model.initial_messages()
+
+    def get_provider_name(self) -> str:
+        # Report the innermost provider, so wrapping doesn't change cache keys or stats labels
+        return self.model.get_provider_name()
+
+def find_wrapper(model: ChatModel, wrapper_class: Type[M]) -> Optional[M]:
+    """Return the first model of the given class in a chain of wrapped models, including the innermost one."""
+    while not isinstance(model, wrapper_class):
+        if not isinstance(model, ChatModelWrapper):
+            return None
+        model = model.model
+    return model
@@ -1,20 +1,93 @@
+import sys
+import threading
+import time
 from argparse import ArgumentParser
-from typing import List, Any
-from hermes.context_providers.base import ContextProvider
+from typing import List, Any, NamedTuple, Optional, Tuple
+from hermes.context_providers.base import ContextProvider, get_load_timeout, get_provider_name, load_provider_context
 from hermes.prompt_builders.base import PromptBuilder
 
+DEFAULT_LOAD_TIMEOUT = 120.0
+
+class ProviderTiming(NamedTuple):
+    name: str
+    status: str
+    load_seconds: float
+    prompt_seconds: float = 0.0
+
+class ProviderLoad:
+    """Runs one provider's load_context on a daemon thread, so a stuck provider can be abandoned."""
+    def __init__(self, provider: ContextProvider, args: Any):
+        self.provider = provider
+        self.error: Optional[BaseException] = None
+        self.seconds: Optional[float] = None
+        self.thread = threading.Thread(target=self.run, args=(args,), name=f"hermes-context-{get_provider_name(provider)}", daemon=True)
+        self.thread.start()
+
+    def run(self, args: Any):
+        start = time.perf_counter()
+        try:
+            load_provider_context(self.provider, args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.seconds = time.perf_counter() - start
+
 class ContextOrchestrator:
+    """
+    Loads all providers concurrently, one thread each, then has them add to the prompt one
+    at a time in their registration order, so the prompt doesn't depend on which finished first.
+
+    A provider still loading after its timeout (its load_timeout class attribute, else
+    --context-timeout) is skipped with a warning instead of holding up startup.
+    """
     def __init__(self, context_providers: List[ContextProvider]):
         self.context_providers = context_providers
+        # (index into timings, provider) for every provider that finished loading
+        self.loaded: List[Tuple[int, ContextProvider]] = list(enumerate(context_providers))
+        self.timings = [ProviderTiming(get_provider_name(provider), 'ok', 0.0) for provider in context_providers]
+        self.load_seconds = 0.0
 
     def add_arguments(self, parser: ArgumentParser):
         for provider in self.context_providers:
             provider.add_argument(parser)
 
     def load_contexts(self, args: Any):
-        for provider in self.context_providers:
-            provider.load_context(args)
+        timeout = getattr(args, 'context_timeout', None)
+        if timeout is None:
+            timeout = DEFAULT_LOAD_TIMEOUT
+        start = time.perf_counter()
+        loads = [ProviderLoad(provider, args) for provider in self.context_providers]
+
+        self.loaded = []
+        self.timings = []
+        for index, load in enumerate(loads):
+            provider_timeout = get_load_timeout(load.provider) or timeout
+            load.thread.join(max(start + provider_timeout - time.perf_counter(), 0) if provider_timeout > 0 else None)
+            name = get_provider_name(load.provider)
+            if load.thread.is_alive():
+                print(f"Warning: {name} is still loading after {provider_timeout:g}s; continuing without it", file=sys.stderr)
+                self.timings.append(ProviderTiming(name, 'timed out', time.perf_counter() - start))
+                continue
+            if load.error is not None:
+                raise load.error
+            self.loaded.append((index, load.provider))
+            self.timings.append(ProviderTiming(name, 'ok', load.seconds))
+        self.load_seconds = time.perf_counter() - start
 
     def build_prompt(self, prompt_builder: PromptBuilder):
-        for provider in self.context_providers:
+        for index, provider in self.loaded:
+            start = time.perf_counter()
             provider.add_to_prompt(prompt_builder)
+            self.timings[index] = self.timings[index]._replace(prompt_seconds=time.perf_counter() - start)
+
+    def summary(self) -> Optional[str]:
+        """Per-provider load and prompt-building times, leaving out providers that took no measurable time."""
+        parts = []
+        for timing in self.timings:
+            if timing.status != 'ok':
+                parts.append(f"{timing.name} {timing.status} after {timing.load_seconds * 1000:.0f}ms")
+            elif timing.load_seconds + timing.prompt_seconds >= 0.001:
+                parts.append(f"{timing.name} {timing.load_seconds * 1000:.0f}ms load + {timing.prompt_seconds * 1000:.0f}ms prompt")
+        if not parts:
+            return None
+        return f"Contexts: loaded in parallel in {self.load_seconds * 1000:.0f}ms ({', '.join(parts)})"
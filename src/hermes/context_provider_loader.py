@@ -1,25 +1,207 @@
 import os
+import json
 import importlib
 import inspect
-from typing import List
-from hermes.context_providers.base import ContextProvider
-from hermes.extension_loader import load_extensions
+from argparse import ArgumentParser
+from typing import Any, Dict, List, Optional, Tuple
+from hermes.context_providers.base import ContextProvider, load_provider_context
+from hermes.extension_loader import get_extension_sources, load_extension_module
+from hermes.prompt_builders.base import PromptBuilder
+from hermes.utils.cache_utils import get_cache_dir
+
+MANIFEST_VERSION = 2
+MANIFEST_FILE = 'context_providers.json'
+BUILTIN_PROVIDER_DIR = os.path.join(os.path.dirname(__file__), 'context_providers')
+SERIALIZABLE_TYPES = {'str': str, 'int': int, 'float': float}
+
+class ArgumentRecorder:
+    """Stands in for ArgumentParser during discovery, capturing the arguments a provider registers."""
+    def __init__(self):
+        self.calls: List[Tuple[List[Any], Dict[str, Any]]] = []
+
+    def add_argument(self, *args, **kwargs):
+        self.calls.append((list(args), kwargs))
+
+class LazyContextProvider(ContextProvider):
+    """
+    Registers a provider's CLI arguments from the discovery manifest and only imports and
+    instantiates the real provider when one of those arguments was actually given.
+    """
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+        self.dests: List[str] = []
+        self.provider: Optional[ContextProvider] = None
+
+    def add_argument(self, parser: ArgumentParser):
+        for args, kwargs in self.entry['arguments']:
+            action = parser.add_argument(*args, **decode_argument_kwargs(kwargs))
+            self.dests.append(action.dest)
+
+    def load_context(self, args: Any):
+        if not any(is_argument_set(getattr(args, dest, None)) for dest in self.dests):
+            return
+        self.provider = instantiate_provider(self.entry)
+        load_provider_context(self.provider, args)
+
+    @property
+    def provider_name(self) -> str:
+        return self.entry['class']
+
+    @property
+    def provider_load_timeout(self) -> Optional[float]:
+        return self.entry.get('load_timeout')
+
+    def add_to_prompt(self, prompt_builder: PromptBuilder):
+        if self.provider is not None:
+            self.provider.add_to_prompt(prompt_builder)
+
+def is_argument_set(value: Any) -> bool:
+    return value is not None and value is not False and value != []
+
+def encode_argument_kwargs(kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return a JSON-safe copy of add_argument kwargs, or None if they can't be replayed from the manifest."""
+    encoded = {}
+    for key, value in kwargs.items():
+        if key == 'type':
+            type_name = getattr(value, '__name__', None)
+            if SERIALIZABLE_TYPES.get(type_name) is not value:
+                return None
+            encoded[key] = {'__type__': type_name}
+            continue
+        try:
+            if json.loads(json.dumps(value)) != value:
+                return None
+        except (TypeError, ValueError):
+            return None
+        encoded[key] = value
+    return encoded
+
+def decode_argument_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    decoded = dict(kwargs)
+    if 'type' in decoded:
+        decoded['type'] = SERIALIZABLE_TYPES[decoded['type']['__type__']]
+    return decoded
+
+def import_provider_module(entry: Dict[str, Any]):
+    if entry['path']:
+        return load_extension_module(entry['module'], entry['path'])
+    return importlib.import_module(entry['module'])
+
+def instantiate_provider(entry: Dict[str, Any]) -> ContextProvider:
+    return getattr(import_provider_module(entry), entry['class'])()
+
+def record_arguments(provider: ContextProvider) -> Optional[List[List[Any]]]:
+    recorder = ArgumentRecorder()
+    try:
+        provider.add_argument(recorder)
+    except AttributeError:
+        # The provider uses more of the ArgumentParser API than we can record; load it eagerly
+        return None
+
+    arguments = []
+    for args, kwargs in recorder.calls:
+        encoded = encode_argument_kwargs(kwargs)
+        if encoded is None or not all(isinstance(arg, str) for arg in args):
+            return None
+        arguments.append([args, encoded])
+    return arguments
+
+def scan_source(directory: str, module_prefix: str, is_extension: bool) -> List[Dict[str, Any]]:
+    entries = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.py') or filename.startswith('__'):
+            continue
+        entry_base = {
+            'module': f'{module_prefix}.{filename[:-3]}',
+            'path': os.path.join(directory, filename) if is_extension else None,
+        }
+        module = import_provider_module(entry_base)
+
+        for name, obj in inspect.getmembers(module):
+            if (inspect.isclass(obj) and issubclass(obj, ContextProvider) and obj is not ContextProvider
+                    and obj.__module__ == module.__name__ and not inspect.isabstract(obj)):
+                load_timeout = getattr(obj, 'load_timeout', None)
+                entries.append(dict(entry_base, **{
+                    'class': name,
+                    'arguments': record_arguments(obj()),
+                    'load_timeout': load_timeout if isinstance(load_timeout, (int, float)) else None,
+                }))
+    return entries
+
+def get_source_signature(directory: str) -> List[Any]:
+    """Directory mtime plus the stat of every module in it, so both added and edited files are noticed."""
+    signature: List[Any] = [os.stat(directory).st_mtime_ns]
+    with os.scandir(directory) as it:
+        for item in sorted(it, key=lambda item: item.name):
+            if item.name.endswith('.py'):
+                stat = item.stat()
+                signature.append([item.name, stat.st_mtime_ns, stat.st_size])
+    return signature
+
+def get_provider_sources() -> List[Tuple[str, str, bool]]:
+    sources = [(BUILTIN_PROVIDER_DIR, 'hermes.context_providers', False)]
+    sources.extend((directory, prefix, True) for directory, prefix in get_extension_sources())
+    return sources
+
+def get_manifest_path() -> Optional[str]:
+    try:
+        return os.path.join(get_cache_dir(), MANIFEST_FILE)
+    except OSError:
+        return None
+
+def read_manifest(manifest_path: Optional[str]) -> Dict[str, Any]:
+    if manifest_path is None:
+        return {}
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('sources', {})
+
+def write_manifest(manifest_path: Optional[str], sources: Dict[str, Any]):
+    if manifest_path is None:
+        return
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'sources': sources}, f)
+        os.replace(tmp_path, manifest_path)
+    except OSError:
+        # The manifest is only an optimization; an unwritable cache shouldn't break startup
+        pass
+
+def load_provider_manifest() -> List[Dict[str, Any]]:
+    """
+    Return the provider entries for all sources, rescanning only those whose signature changed.
+    """
+    manifest_path = get_manifest_path()
+    cached_sources = read_manifest(manifest_path)
+    sources = {}
+    changed = False
+
+    for directory, module_prefix, is_extension in get_provider_sources():
+        signature = get_source_signature(directory)
+        cached = cached_sources.get(directory)
+        if cached is not None and cached['signature'] == signature:
+            sources[directory] = cached
+        else:
+            sources[directory] = {'signature': signature, 'entries': scan_source(directory, module_prefix, is_extension)}
+            changed = True
+
+    if changed or set(sources) != set(cached_sources):
+        write_manifest(manifest_path, sources)
+
+    return [entry for source in sources.values() for entry in source['entries']]
 
 def load_context_providers() -> List[ContextProvider]:
     providers = []
-    provider_dir = os.path.join(os.path.dirname(__file__), 'context_providers')
-    
-    # Load built-in providers
-    for filename in os.listdir(provider_dir):
-        if filename.endswith('.py') and not filename.startswith('__'):
-            module_name = f'hermes.context_providers.{filename[:-3]}'
-            module = importlib.import_module(module_name)
-            
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, ContextProvider) and obj != ContextProvider:
-                    providers.append(obj())
-    
-    # Load extension providers
-    providers.extend(load_extensions())
-    
+    for entry in load_provider_manifest():
+        # Without recordable arguments there is no flag to activate on, so the provider loads on every run
+        if not entry['arguments']:
+            providers.append(instantiate_provider(entry))
+        else:
+            providers.append(LazyContextProvider(entry))
     return providers
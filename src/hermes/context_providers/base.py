@@ -1,12 +1,16 @@
+import asyncio
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser
-from typing import TypeVar, Any
+from typing import TypeVar, Any, Optional
 
 from hermes.prompt_builders.base import PromptBuilder
 
 T = TypeVar('T')  # Define a type variable
 
 class ContextProvider(ABC):
+    # Seconds load_context may take before the orchestrator gives up on this provider class (None: --context-timeout)
+    load_timeout: Optional[float] = None
+
     @abstractmethod
     def add_argument(self, parser: ArgumentParser):
         """
@@ -25,6 +29,15 @@ class ContextProvider(ABC):
         """
         pass
 
+    async def load_context_async(self, args: Any):
+        """
+        Optional async variant of load_context. Providers that override it are run on their
+        own event loop instead of load_context, so they can overlap their own I/O.
+
+        :param args: The parsed arguments from ArgumentParser
+        """
+        self.load_context(args)
+
     @abstractmethod
     def add_to_prompt(self, prompt_builder: PromptBuilder):
         """
@@ -33,3 +46,17 @@ class ContextProvider(ABC):
         :param prompt_builder: The PromptBuilder instance to add context to
         """
         pass
+
+def get_provider_name(provider: ContextProvider) -> str:
+    return getattr(provider, 'provider_name', None) or type(provider).__name__
+
+def get_load_timeout(provider: ContextProvider) -> Optional[float]:
+    """The provider's class-level load_timeout; a lazy provider reports the one of the provider it stands in for."""
+    return getattr(provider, 'provider_load_timeout', None) or getattr(type(provider), 'load_timeout', None)
+
+def load_provider_context(provider: ContextProvider, args: Any):
+    """Run the provider's load_context_async if it overrides it, else its load_context."""
+    if getattr(type(provider), 'load_context_async', ContextProvider.load_context_async) is not ContextProvider.load_context_async:
+        asyncio.run(provider.load_context_async(args))
+    else:
+        provider.load_context(args)
@@ -1,19 +1,60 @@
+import os
+import sys
 from argparse import ArgumentParser
-from typing import List, Any
+from typing import Any, Dict, List, Optional
+from hermes.chat_models.history import BYTES_PER_TOKEN
 from hermes.context_providers.base import ContextProvider
+from hermes.file_processors.documents import get_document_extractor, parse_page_ranges
+from hermes.model_registry import DEFAULT_FILE_PROCESSOR, MODEL_REGISTRY
 from hermes.prompt_builders.base import PromptBuilder
 from hermes.utils.file_utils import process_file_name
+from hermes.utils.file_walker import DEFAULT_MAX_FILE_SIZE, FileWalker, LoadedFile
+
+def extracts_documents(model_name: Optional[str]) -> bool:
+    """Whether the model's file processor extracts document text (rather than sending the raw file, as Bedrock's does)."""
+    spec = MODEL_REGISTRY.get(model_name)
+    return spec is None or spec.file_processor == DEFAULT_FILE_PROCESSOR
 
 class FileContextProvider(ContextProvider):
+    """
+    Attaches files, directories (walked with .gitignore support) and glob patterns such as
+    'src/**/*.py'. Files are read on a thread pool while other contexts load, within an
+    optional total budget; what was skipped is reported on stderr. PDF and DOCX text is
+    extracted on worker processes in the background, for the file processor to collect.
+    """
     def __init__(self):
         self.files: List[str] = []
+        self.loaded_files: List[LoadedFile] = []
+        self.names: Dict[str, str] = {}
+        self.walker: Optional[FileWalker] = None
 
     def add_argument(self, parser: ArgumentParser):
-        parser.add_argument('files', nargs='*', help='Files to be included in the context')
+        parser.add_argument('files', nargs='*', help='Files, directories or glob patterns to be included in the context')
+        parser.add_argument('--no-gitignore', action='store_true', help="Include files that .gitignore excludes when walking directories")
+        parser.add_argument('--max-file-size', type=int, help=f"Skip files larger than this many bytes when walking directories (default: {DEFAULT_MAX_FILE_SIZE})")
+        parser.add_argument('--files-max-bytes', type=int, help="Stop adding files once they total this many bytes")
+        parser.add_argument('--files-max-tokens', type=int, help="Stop adding files once they total about this many tokens")
+        parser.add_argument('--pdf-pages', type=str, help="Only include these pages of PDF files, e.g. '1-5,8,20-'")
 
     def load_context(self, args: Any):
-        self.files = args.files
+        max_total_bytes = [limit for limit in (getattr(args, 'files_max_bytes', None), (getattr(args, 'files_max_tokens', None) or 0) * BYTES_PER_TOKEN) if limit]
+        self.walker = FileWalker(
+            use_gitignore=not getattr(args, 'no_gitignore', False),
+            max_file_size=getattr(args, 'max_file_size', None) or DEFAULT_MAX_FILE_SIZE,
+            max_total_bytes=min(max_total_bytes) if max_total_bytes else None,
+        )
+        self.loaded_files = self.walker.load(args.files or [])
+        self.files = [loaded.path for loaded in self.loaded_files]
+        # Walked files keep their directories in the name, so src/a/__init__.py and src/b/__init__.py differ
+        explicit = set(args.files or [])
+        self.names = {path: process_file_name(path if path in explicit else path.replace(os.sep, '_')) for path in self.files}
+        if self.walker.skipped:
+            print(self.walker.summary(self.loaded_files), file=sys.stderr)
+
+        page_ranges = parse_page_ranges(args.pdf_pages) if getattr(args, 'pdf_pages', None) else None
+        if extracts_documents(getattr(args, 'model', None)):
+            get_document_extractor().prefetch(self.files, page_ranges)
 
     def add_to_prompt(self, prompt_builder: PromptBuilder):
         for file_path in self.files:
-            prompt_builder.add_file(file_path, process_file_name(file_path))
+            prompt_builder.add_file(file_path, self.names.get(file_path) or process_file_name(file_path))
@@ -1,36 +1,182 @@
+import queue
+import threading
 import requests
 from argparse import ArgumentParser
-from typing import List, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
-from markdownify import markdownify as md
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
+from hermes.chat_models.history import BYTES_PER_TOKEN
 from hermes.context_providers.base import ContextProvider
 from hermes.prompt_builders.base import PromptBuilder
+from hermes.utils.crawler import CrawledPage, SiteCrawler
+from hermes.utils.html_extract import URL_MODES, extract_content
+from hermes.utils.http_cache import HTTPCache, HTTPCacheEntry, open_url_cache
+
+DEFAULT_WORKERS = 8
+CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+DEFAULT_CRAWL_DEPTH = 2
+DEFAULT_CRAWL_MAX_PAGES = 50
+DEFAULT_CRAWL_MAX_BYTES = 2 * 1024 * 1024
+
+def is_transient_error(error: BaseException) -> bool:
+    """Connection problems, timeouts and overloaded servers are worth retrying; a 404 is not."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+def get_max_bytes(max_bytes: Optional[int], max_tokens: Optional[int]) -> Optional[int]:
+    caps = [cap for cap in (max_bytes, max_tokens * BYTES_PER_TOKEN if max_tokens else None) if cap]
+    return min(caps) if caps else None
 
 class URLContextProvider(ContextProvider):
+    """
+    Fetches --url pages concurrently over one keep-alive session. Each URL retries on its
+    own worker, so a flaky server delays only its own page; contents keep the order given.
+    Pages are cached on disk (see hermes.utils.http_cache) unless --no-url-cache is given,
+    and reduced to their main content (see hermes.utils.html_extract) unless --url-mode full.
+
+    --url-crawl pages are crawled in the background from load_context on; add_to_prompt
+    adds each one to the prompt builder as soon as it is fetched, in completion order.
+    """
     def __init__(self):
         self.urls: List[str] = []
         self.contents: List[str] = []
+        self.workers = DEFAULT_WORKERS
+        self.timeout = (CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.session: Optional[requests.Session] = None
+        self.cache: Optional[HTTPCache] = None
+        self.mode = 'main'
+        self.max_bytes: Optional[int] = None
+        self.crawled_pages: List[CrawledPage] = []
+        self.crawl_results: Optional[queue.Queue] = None
 
     def add_argument(self, parser: ArgumentParser):
         parser.add_argument("--url", action="append", help="URL to fetch content from")
+        parser.add_argument("--url-workers", type=int, help=f"Number of URLs to fetch at once (default: {DEFAULT_WORKERS})")
+        parser.add_argument("--url-timeout", type=float, help=f"Seconds to wait for a URL to respond (default: {DEFAULT_READ_TIMEOUT})")
+        parser.add_argument("--url-max-age", type=float, help="Reuse cached pages up to this many seconds old without revalidating, whatever their headers say")
+        parser.add_argument("--url-offline", action="store_true", help="Only use cached pages, never the network")
+        parser.add_argument("--no-url-cache", action="store_true", help="Don't read or write the URL cache")
+        parser.add_argument("--url-mode", choices=URL_MODES, help="Include whole pages as markdown (full), only their main content (main, the default) or its plain text (text)")
+        parser.add_argument("--url-max-bytes", type=int, help="Cut each page's content to this many bytes")
+        parser.add_argument("--url-max-tokens", type=int, help="Cut each page's content to about this many tokens")
+        parser.add_argument("--url-crawl", action="append", help="Fetch a URL and the same-site pages it links to (can be used multiple times)")
+        parser.add_argument("--url-crawl-depth", type=int, help=f"Links to follow away from a --url-crawl page (default: {DEFAULT_CRAWL_DEPTH})")
+        parser.add_argument("--url-crawl-max-pages", type=int, help=f"Pages to crawl at most (default: {DEFAULT_CRAWL_MAX_PAGES})")
+        parser.add_argument("--url-crawl-max-bytes", type=int, help=f"Total size of the crawled pages' content (default: {DEFAULT_CRAWL_MAX_BYTES})")
 
     def load_context(self, args):
-        if args.url:
-            self.urls = args.url
-            for url in self.urls:
-                content = self.fetch_url_content(url)
-                self.contents.append(content)
+        crawl_urls = getattr(args, 'url_crawl', None)
+        if args.url or crawl_urls:
+            self.urls = args.url or []
+            self.workers = max(1, getattr(args, 'url_workers', None) or DEFAULT_WORKERS)
+            self.timeout = (CONNECT_TIMEOUT, getattr(args, 'url_timeout', None) or DEFAULT_READ_TIMEOUT)
+            self.mode = getattr(args, 'url_mode', None) or 'main'
+            self.max_bytes = get_max_bytes(getattr(args, 'url_max_bytes', None), getattr(args, 'url_max_tokens', None))
+            if not getattr(args, 'no_url_cache', False):
+                self.cache = open_url_cache(getattr(args, 'url_max_age', None), getattr(args, 'url_offline', False))
+            # The crawl and the --url fetches run side by side, each with its own workers
+            self.get_session(self.workers * 2 if crawl_urls and self.urls else self.workers)
+            if crawl_urls:
+                depth = getattr(args, 'url_crawl_depth', None)
+                crawler = SiteCrawler(
+                    self.fetch_url, self.fetch_robots,
+                    max_depth=DEFAULT_CRAWL_DEPTH if depth is None else depth,
+                    max_pages=getattr(args, 'url_crawl_max_pages', None) or DEFAULT_CRAWL_MAX_PAGES,
+                    max_bytes=getattr(args, 'url_crawl_max_bytes', None) or DEFAULT_CRAWL_MAX_BYTES,
+                    workers=self.workers,
+                )
+                self.start_crawl(crawler, crawl_urls)
+            if self.urls:
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(self.urls)), thread_name_prefix="hermes-url") as executor:
+                    self.contents = list(executor.map(self.fetch_url_content, self.urls))
 
     def add_to_prompt(self, prompt_builder: PromptBuilder):
         for url, content in zip(self.urls, self.contents):
             prompt_builder.add_text(content, name=f"URL: {url}")
+        if self.crawl_results is not None:
+            # Hand over crawled pages as they arrive; the crawl overlaps everything before this
+            while True:
+                page = self.crawl_results.get()
+                if page is None:
+                    break
+                if isinstance(page, BaseException):
+                    self.crawl_results = None
+                    raise page
+                self.crawled_pages.append(page)
+                prompt_builder.add_text(page.content, name=f"URL: {page.url}")
+            self.crawl_results = None
+        else:
+            for page in self.crawled_pages:
+                prompt_builder.add_text(page.content, name=f"URL: {page.url}")
+
+    def start_crawl(self, crawler: SiteCrawler, urls: List[str]):
+        results: queue.Queue = queue.Queue()
+
+        def run():
+            try:
+                for page in crawler.crawl(urls):
+                    results.put(page)
+            except BaseException as e:
+                results.put(e)
+            results.put(None)
+
+        self.crawl_results = results
+        threading.Thread(target=run, name="hermes-url-crawl", daemon=True).start()
+
+    def get_session(self, pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+        if self.session is None:
+            session = requests.Session()
+            # One pooled connection per worker, so concurrent fetches to a host all reuse theirs
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self.session = session
+        return self.session
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def fetch_url_content(self, url: str) -> str:
-        response = requests.get(url)
+        return self.fetch_url(url)[1]
+
+    def fetch_url(self, url: str) -> Tuple[str, str]:
+        """Return the page's raw body and its converted content, from the cache when possible."""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (self.cache.offline or entry.is_fresh(self.cache.max_age)):
+            return entry.body, self.cached_content(entry)
+        if self.cache is not None and self.cache.offline:
+            raise LookupError(f"{url} is not in the URL cache and --url-offline was given")
+
+        response = self.request_url(url, entry.validator_headers() if entry is not None else {})
+        if entry is not None and response.status_code == 304:
+            return entry.body, self.cached_content(self.cache.refresh(entry, response))
+        content = self.html_to_markdown(response.text)
+        if self.cache is not None:
+            self.cache.store(url, response, content, self.conversion)
+        return response.text, content
+
+    def fetch_robots(self, origin: str) -> Optional[str]:
+        response = self.get_session().get(f"{origin}/robots.txt", timeout=self.timeout)
+        return response.text if response.status_code == 200 else None
+
+    @property
+    def conversion(self) -> str:
+        return f"{self.mode}:{self.max_bytes}"
+
+    def cached_content(self, entry: HTTPCacheEntry) -> str:
+        if entry.conversion == self.conversion:
+            return entry.content
+        content = self.html_to_markdown(entry.body)
+        self.cache.put(entry._replace(content=content, conversion=self.conversion))
+        return content
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10), retry=retry_if_exception(is_transient_error))
+    def request_url(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        response = self.get_session().get(url, headers=headers, timeout=self.timeout)
         response.raise_for_status()
-        return self.html_to_markdown(response.text)
+        return response
 
     def html_to_markdown(self, html: str) -> str:
-        return md(html)
+        return extract_content(html, self.mode, self.max_bytes)
@@ -0,0 +1,259 @@
+"""
+Warm Hermes daemon and the thin client that talks to it.
+
+`hermes --daemon` keeps a process alive with the SDKs, config, provider manifest and
+prompts already loaded. Later `hermes` invocations detect the socket, forward their argv,
+cwd and piped stdin, and render the streamed response locally through ChatUI. Each session's
+flags (--response-cache, --history-tokens, --record, ...) are applied to its own copy of the
+config. Models are created and initialized once per model name and effective config and shared; every
+connection gets its own ChatApplication and ChatSession, so sessions never share
+conversation state.
+
+The protocol is newline-delimited JSON over a Unix socket:
+
+    client -> daemon  {"type": "run", "argv": [...], "cwd": ..., "interactive": bool, "stdin": str | null}
+                      {"type": "input", "text": ...}
+    daemon -> client  {"type": "response"} {"type": "chunk", "text": ...} ... {"type": "end"}
+                      {"type": "status", "message": ...}
+                      {"type": "input"}
+                      {"type": "error", "message": ...}
+                      {"type": "exit", "code": int}
+"""
+import argparse
+import configparser
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import Any, Dict, Generator, IO, List, Optional, Tuple
+
+from hermes.utils.cache_utils import get_cache_dir
+from hermes.utils.stream_buffer import StreamBuffer
+
+SOCKET_ENV_VAR = 'HERMES_DAEMON_SOCKET'
+CLIENT_LOCAL_FLAGS = ('-h', '--help', '--workflow')
+PATH_ARGUMENTS = ('files', 'image', 'prompt_file', 'append', 'update')
+
+class DaemonSessionError(Exception):
+    pass
+
+class SessionArgumentParser(argparse.ArgumentParser):
+    """Raises instead of exiting the daemon when a client sends invalid arguments."""
+    def error(self, message):
+        raise DaemonSessionError(f"{self.prog}: error: {message}")
+
+def get_socket_path() -> str:
+    return os.environ.get(SOCKET_ENV_VAR) or os.path.join(get_cache_dir(), 'daemon.sock')
+
+def send_message(stream: IO[str], message: Dict[str, Any]):
+    stream.write(json.dumps(message) + '\n')
+    stream.flush()
+
+def read_message(stream: IO[str]) -> Optional[Dict[str, Any]]:
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+def is_daemon_running(socket_path: str) -> bool:
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+def should_use_daemon(argv: List[str]) -> bool:
+    if any(arg in CLIENT_LOCAL_FLAGS or arg.startswith('--workflow=') for arg in argv):
+        return False
+    return is_daemon_running(get_socket_path())
+
+class RemoteChatUI:
+    """ChatUI counterpart used inside the daemon; rendering and input happen in the client."""
+    def __init__(self, rfile: IO[str], wfile: IO[str]):
+        self.rfile = rfile
+        self.wfile = wfile
+
+    def display_response(self, response_generator: Generator[str, None, None]):
+        buffer = StreamBuffer()
+        send_message(self.wfile, {'type': 'response'})
+        for text in buffer.tee(response_generator):
+            send_message(self.wfile, {'type': 'chunk', 'text': text})
+        send_message(self.wfile, {'type': 'end'})
+        return buffer.getvalue()
+
+    def get_user_input(self) -> str:
+        send_message(self.wfile, {'type': 'input'})
+        message = read_message(self.rfile)
+        if message is None or message.get('type') != 'input':
+            return 'exit'
+        return message['text']
+
+    def display_status(self, message: str):
+        send_message(self.wfile, {'type': 'status', 'message': message})
+
+def get_config_sections(config: configparser.ConfigParser) -> Dict[str, Dict[str, str]]:
+    return {section: dict(config.items(section, raw=True)) for section in config.sections()}
+
+def get_session_config(config: configparser.ConfigParser, args: argparse.Namespace) -> configparser.ConfigParser:
+    """A copy of the daemon's config with the session's flags folded in, leaving the shared config untouched."""
+    from hermes.main import apply_argument_overrides
+
+    session_config = configparser.ConfigParser()
+    session_config.read_dict(get_config_sections(config))
+    apply_argument_overrides(args, session_config)
+    return session_config
+
+class HermesDaemon:
+    def __init__(self, config: configparser.ConfigParser, special_command_prompts: Dict[str, str]):
+        self.config = config
+        self.special_command_prompts = special_command_prompts
+        # Keyed by model name and the effective config, so sessions with different flags get different wrappers
+        self.models: Dict[Tuple[str, str], Any] = {}
+        self.models_lock = threading.Lock()
+
+    def get_model(self, model_name: str, config: Optional[configparser.ConfigParser] = None):
+        from hermes.model_registry import create_model
+
+        config = config if config is not None else self.config
+        key = (model_name, json.dumps(get_config_sections(config), sort_keys=True))
+        with self.models_lock:
+            if key not in self.models:
+                # Initialized once here: sessions stream on it concurrently, so they must not rebuild its clients
+                model = create_model(model_name, config)
+                model.initialize()
+                try:
+                    model.warm_up()
+                except Exception:
+                    # Best effort: the first request simply opens its own connection
+                    pass
+                self.models[key] = model
+            return self.models[key]
+
+    def run_session(self, request: Dict[str, Any], rfile: IO[str], wfile: IO[str]):
+        from hermes.chat_application import ChatApplication
+        from hermes.context_orchestrator import ContextOrchestrator
+        from hermes.context_provider_loader import load_context_providers
+        from hermes.main import build_parser, configure_file_processor, get_default_model, get_initial_prompt, get_special_command
+        from hermes.model_registry import create_processors
+
+        context_orchestrator = ContextOrchestrator(load_context_providers())
+        parser = build_parser(context_orchestrator, SessionArgumentParser)
+        args = parser.parse_args(request['argv'])
+        resolve_client_paths(args, request['cwd'])
+        config = get_session_config(self.config, args)
+
+        model_name = args.model or get_default_model(config)
+        if model_name is None:
+            raise DaemonSessionError("No model specified and no default model found in config. Use --model to specify a model or set a default in the config file.")
+        args.model = model_name
+
+        special_command = get_special_command(args)
+        initial_prompt = get_initial_prompt(args)
+        model = self.get_model(model_name, config)
+        file_processor, prompt_builder = create_processors(model_name)
+        configure_file_processor(file_processor, args)
+        context_orchestrator.load_contexts(args)
+
+        ui = RemoteChatUI(rfile, wfile)
+        app = ChatApplication(model, ui, file_processor, prompt_builder, self.special_command_prompts, context_orchestrator, model_initialized=True)
+        app.prepare()
+        if request.get('interactive'):
+            app.run_interactive(initial_prompt, special_command)
+        else:
+            app.run_piped(initial_prompt or request.get('stdin') or '', special_command)
+
+def resolve_client_paths(args: argparse.Namespace, cwd: str):
+    """The daemon has its own working directory, so make the client's relative paths absolute."""
+    for name in PATH_ARGUMENTS:
+        value = getattr(args, name, None)
+        if isinstance(value, str):
+            setattr(args, name, os.path.join(cwd, value))
+        elif isinstance(value, list):
+            setattr(args, name, [os.path.join(cwd, item) for item in value])
+
+class SessionHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        rfile = self.request.makefile('r', encoding='utf-8')
+        wfile = self.request.makefile('w', encoding='utf-8')
+        request = read_message(rfile)
+        if request is None or request.get('type') != 'run':
+            return
+        try:
+            self.server.hermes_daemon.run_session(request, rfile, wfile)
+            send_message(wfile, {'type': 'exit', 'code': 0})
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away (e.g. ctrl+c); nothing left to report to
+            pass
+        except Exception as e:
+            send_message(wfile, {'type': 'error', 'message': str(e)})
+            send_message(wfile, {'type': 'exit', 'code': 1})
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, hermes_daemon: HermesDaemon):
+        self.hermes_daemon = hermes_daemon
+        super().__init__(socket_path, SessionHandler)
+
+def serve(config, special_command_prompts: Dict[str, str], socket_path: Optional[str] = None):
+    socket_path = socket_path or get_socket_path()
+    if is_daemon_running(socket_path):
+        raise SystemExit(f"A Hermes daemon is already listening on {socket_path}")
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with DaemonServer(socket_path, HermesDaemon(config, special_command_prompts)) as server:
+        os.chmod(socket_path, 0o600)
+        print(f"Hermes daemon listening on {socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+def read_chunks(rfile: IO[str]) -> Generator[str, None, None]:
+    while True:
+        message = read_message(rfile)
+        if message is None or message['type'] == 'end':
+            return
+        yield message['text']
+
+def run_client(argv: List[str], socket_path: Optional[str] = None) -> int:
+    from hermes.ui.chat_ui import ChatUI
+
+    interactive = sys.stdin.isatty()
+    stdin_text = None
+    if not interactive and not any(arg.startswith('--prompt') for arg in argv):
+        stdin_text = sys.stdin.read().strip()
+
+    ui = ChatUI(prints_raw='--pretty' not in argv)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or get_socket_path())
+        rfile = sock.makefile('r', encoding='utf-8')
+        wfile = sock.makefile('w', encoding='utf-8')
+        send_message(wfile, {'type': 'run', 'argv': argv, 'cwd': os.getcwd(), 'interactive': interactive, 'stdin': stdin_text})
+
+        while True:
+            message = read_message(rfile)
+            if message is None:
+                return 1
+            if message['type'] == 'response':
+                ui.display_response(read_chunks(rfile))
+            elif message['type'] == 'status':
+                ui.display_status(message['message'])
+            elif message['type'] == 'input':
+                try:
+                    text = ui.get_user_input()
+                except (KeyboardInterrupt, EOFError):
+                    text = 'exit'
+                send_message(wfile, {'type': 'input', 'text': text})
+            elif message['type'] == 'error':
+                print(message['message'], file=sys.stderr)
+            elif message['type'] == 'exit':
+                return message['code']
@@ -1,30 +1,37 @@
 import os
-import importlib
-import inspect
-from typing import List
-from hermes.context_providers.base import ContextProvider
+import sys
+import importlib.util
+from types import ModuleType
+from typing import List, Tuple
 
-def load_extensions() -> List[ContextProvider]:
-    providers = []
-    extension_dir = os.path.expanduser("~/.config/hermes/extra_context_providers")
-    
-    if not os.path.exists(extension_dir):
-        return providers
+EXTENSION_DIR = os.path.expanduser("~/.config/hermes/extra_context_providers")
 
-    for subfolder in os.listdir(extension_dir):
-        subfolder_path = os.path.join(extension_dir, subfolder)
-        if not os.path.isdir(subfolder_path):
-            continue
+def get_extension_sources() -> List[Tuple[str, str]]:
+    """
+    List the extension folders as (directory, module prefix) pairs.
 
-        for filename in os.listdir(subfolder_path):
-            if filename.endswith('.py'):
-                module_name = f"extra_context_providers.{subfolder}.{filename[:-3]}"
-                spec = importlib.util.spec_from_file_location(module_name, os.path.join(subfolder_path, filename))
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+    Each subfolder of the extension directory is a separate source so that editing one
+    extension only invalidates that folder's entry in the discovery manifest.
+    """
+    if not os.path.isdir(EXTENSION_DIR):
+        return []
 
-                for name, obj in inspect.getmembers(module):
-                    if inspect.isclass(obj) and issubclass(obj, ContextProvider) and obj != ContextProvider:
-                        providers.append(obj())
+    sources = []
+    for subfolder in sorted(os.listdir(EXTENSION_DIR)):
+        subfolder_path = os.path.join(EXTENSION_DIR, subfolder)
+        if os.path.isdir(subfolder_path):
+            sources.append((subfolder_path, f"extra_context_providers.{subfolder}"))
+    return sources
 
-    return providers
+def load_extension_module(module_name: str, file_path: str) -> ModuleType:
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
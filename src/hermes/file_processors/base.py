@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 import os
-from typing import Any
+from typing import Any, Optional
+from hermes.utils.file_snapshot import FileSnapshot, get_snapshot
 
 class FileProcessor(ABC):
     @abstractmethod
@@ -10,6 +11,10 @@ class FileProcessor(ABC):
     def exists(self, file_path: str) -> bool:
         return os.path.exists(file_path)
 
+    def get_snapshot(self, file_path: str) -> Optional[FileSnapshot]:
+        """The file's content, read once per run however many times it's asked for; None if it doesn't exist."""
+        return get_snapshot(file_path) if self.exists(file_path) else None
+
     @abstractmethod
     def write_file(self, file_path: str, content: str, mode: str = 'w') -> None:
         pass
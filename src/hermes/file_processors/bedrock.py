@@ -5,8 +5,7 @@ class BedrockFileProcessor(FileProcessor):
         if not self.exists(file_path):
             return b"empty"
 
-        with open(file_path, 'rb') as file:
-            return file.read()
+        return self.get_snapshot(file_path).data
 
     def write_file(self, file_path: str, content: str, mode: str = 'w') -> None:
         with open(file_path, mode, encoding='utf-8') as file:
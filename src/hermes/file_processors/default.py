@@ -1,9 +1,13 @@
 from .base import FileProcessor
-import PyPDF2
-from docx import Document
+from .documents import PageRanges, get_document_extractor
+from typing import Optional
 import os
 
 class DefaultFileProcessor(FileProcessor):
+    def __init__(self, page_ranges: Optional[PageRanges] = None):
+        # The pages of PDFs to include (--pdf-pages); None for all
+        self.page_ranges = page_ranges
+
     def read_file(self, file_path: str) -> str:
         if not self.exists(file_path):
             return "empty"
@@ -15,17 +19,15 @@ class DefaultFileProcessor(FileProcessor):
         elif ext == '.docx':
             return self.extract_text_from_docx(file_path)
         else:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            # Newlines translated as reading in text mode does
+            return self.get_snapshot(file_path).text.replace('\r\n', '\n').replace('\r', '\n')
 
     def extract_text_from_pdf(self, file_path: str) -> str:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            return ' '.join(page.extract_text() for page in reader.pages)
+        # Collects the text the file context provider prefetched, or extracts it now, on worker processes if large
+        return get_document_extractor().extract(file_path, self.page_ranges)
 
     def extract_text_from_docx(self, file_path: str) -> str:
-        doc = Document(file_path)
-        return ' '.join(paragraph.text for paragraph in doc.paragraphs)
+        return get_document_extractor().extract(file_path, self.page_ranges)
 
     def write_file(self, file_path: str, content: str, mode: str = 'w') -> None:
         with open(file_path, mode, encoding='utf-8') as file:
@@ -0,0 +1,243 @@
+"""
+Extracts the text of PDF and DOCX files on a process pool.
+
+Text extraction is CPU-bound pure Python, so threads can't spread it over cores. Large
+PDFs are split into page ranges extracted by separate worker processes and joined back
+in page order, and separate documents are extracted side by side. The file context
+provider prefetches its documents while the other contexts load; the file processor
+then collects the text, extracting it itself for anything that wasn't prefetched.
+Extracted text goes into the document cache, so unchanged documents aren't extracted again.
+"""
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from hermes.utils.document_cache import DocumentCache, get_document_cache
+from hermes.utils.file_walker import DOCUMENT_EXTENSIONS
+
+# Fewest pages worth handing to a worker process of their own
+MIN_CHUNK_PAGES = 8
+# Below this many pages of work, starting worker processes costs more than it saves
+MIN_POOL_PAGES = 16
+# A DOCX file counts as this many pages when deciding whether to use the pool
+DOCX_PAGES = 8
+# Part of the document cache key; bump when a change here alters the extracted text
+EXTRACTION_VERSION = 1
+
+PageRanges = List[Tuple[int, Optional[int]]]
+FileKey = Tuple[str, float, int]
+
+def parse_page_ranges(spec: str) -> PageRanges:
+    """Parse a 1-based page selection such as '1-5,8,10-' into (first, last) pairs, last being None for 'to the end'."""
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition('-')
+        try:
+            start = int(first) if first.strip() else 1
+            end = (int(last) if last.strip() else None) if dash else start
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}") from None
+        if start < 1 or (end is not None and end < start):
+            raise ValueError(f"Invalid page range: {part!r}")
+        ranges.append((start, end))
+    if not ranges:
+        raise ValueError(f"Invalid page selection: {spec!r}")
+    return ranges
+
+def select_pages(page_ranges: Optional[PageRanges], page_count: int) -> List[int]:
+    """The 0-based indexes of the selected pages, in document order; pages past the end are ignored."""
+    if page_ranges is None:
+        return list(range(page_count))
+    selected = set()
+    for first, last in page_ranges:
+        selected.update(range(first - 1, min(last or page_count, page_count)))
+    return sorted(selected)
+
+def split_pages(pages: List[int], parts: int, min_chunk_pages: int = MIN_CHUNK_PAGES) -> List[List[int]]:
+    """Split pages into at most `parts` contiguous chunks of at least min_chunk_pages each (except the last)."""
+    size = max(min_chunk_pages, math.ceil(len(pages) / max(parts, 1)), 1)
+    return [pages[index:index + size] for index in range(0, len(pages), size)]
+
+def count_pdf_pages(path: str) -> int:
+    from PyPDF2 import PdfReader
+
+    with open(path, 'rb') as file:
+        return len(PdfReader(file).pages)
+
+def extract_pdf_pages(path: str, pages: Sequence[int]) -> List[str]:
+    """Runs in a worker process: the text of the given pages, in the given order."""
+    from PyPDF2 import PdfReader
+
+    with open(path, 'rb') as file:
+        reader = PdfReader(file)
+        return [reader.pages[index].extract_text() for index in pages]
+
+def extract_docx(path: str) -> List[str]:
+    from docx import Document
+
+    return [' '.join(paragraph.text for paragraph in Document(path).paragraphs)]
+
+def get_extractor_name(extension: str, page_ranges: Optional[PageRanges] = None) -> str:
+    """Identifies the extraction in the document cache: what is extracted, by which library version, with which settings."""
+    if extension == '.pdf':
+        import PyPDF2
+
+        pages = ','.join(f"{first}-{'' if last is None else last}" for first, last in page_ranges) if page_ranges else 'all'
+        return f"pdf-text/{EXTRACTION_VERSION}/PyPDF2-{PyPDF2.__version__}/pages={pages}"
+    import docx
+
+    return f"docx-text/{EXTRACTION_VERSION}/python-docx-{docx.__version__}"
+
+def get_file_key(path: str) -> FileKey:
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime, stat.st_size
+
+def resolved(value) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+def completed(function, *args) -> Future:
+    """Run function here and now, wrapped in a Future like a pool submission."""
+    future: Future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+class DocumentJob(NamedTuple):
+    key: FileKey
+    # The extraction's results in page order
+    chunks: List[Future]
+    # (content hash, extractor) to cache the text under once collected; None if it came from the cache
+    store: Optional[Tuple[str, str]] = None
+    # The page selection the job extracts
+    page_ranges: Optional[PageRanges] = None
+
+class DocumentExtractor:
+    """
+    Args:
+        workers: Worker processes; defaults to the number of cores. With one, everything is extracted in-process
+        min_pool_pages: Pages of work below which documents are extracted in-process
+        min_chunk_pages: Fewest pages given to one worker task
+        use_cache: Reuse text extracted from the same content before, from the document cache
+    """
+    def __init__(self, workers: Optional[int] = None, min_pool_pages: int = MIN_POOL_PAGES, min_chunk_pages: int = MIN_CHUNK_PAGES,
+                 use_cache: bool = True):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_pool_pages = min_pool_pages
+        self.min_chunk_pages = min_chunk_pages
+        self.use_cache = use_cache
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+        # Prefetched documents by absolute path
+        self.jobs: Dict[str, DocumentJob] = {}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # Not fork: the providers loading on other threads may hold locks a forked child would inherit
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self.executor
+
+    def get_cache(self) -> Optional[DocumentCache]:
+        return get_document_cache() if self.use_cache else None
+
+    def lookup(self, path: str, page_ranges: Optional[PageRanges]) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """The document's cached text, or None and the (content hash, extractor) to cache it under."""
+        cache = self.get_cache()
+        if cache is None:
+            return None, None
+        extractor = get_extractor_name(os.path.splitext(path)[1].lower(), page_ranges)
+        try:
+            digest = cache.get_digest(path)
+        except OSError:
+            return None, None
+        text = cache.get(digest, extractor)
+        return text, (digest, extractor) if text is None else None
+
+    def prefetch(self, paths: List[str], page_ranges: Optional[PageRanges] = None):
+        """Start extracting the documents among paths in the background, for extract() to collect."""
+        planned = []
+        for path in paths:
+            extension = os.path.splitext(path)[1].lower()
+            if extension not in DOCUMENT_EXTENSIONS or not os.path.isfile(path):
+                continue
+            key = get_file_key(path)
+            text, store = self.lookup(path, page_ranges)
+            if text is not None:
+                with self.lock:
+                    self.jobs[key[0]] = DocumentJob(key, [resolved([text])], None, page_ranges)
+                continue
+            pages = select_pages(page_ranges, count_pdf_pages(path)) if extension == '.pdf' else None
+            planned.append((path, key, pages, store))
+
+        use_pool = self.use_pool(sum(DOCX_PAGES if pages is None else len(pages) for _, _, pages, _ in planned))
+        for path, key, pages, store in planned:
+            chunks = self.start(path, pages, use_pool)
+            with self.lock:
+                self.jobs[key[0]] = DocumentJob(key, chunks, store, page_ranges)
+
+    def use_pool(self, page_count: int) -> bool:
+        return self.workers > 1 and page_count >= self.min_pool_pages
+
+    def start(self, path: str, pages: Optional[List[int]], use_pool: bool) -> List[Future]:
+        """Submit a document's extraction; pages is None for a DOCX file."""
+        if pages is None:
+            return [self.get_executor().submit(extract_docx, path) if use_pool else completed(extract_docx, path)]
+        if not use_pool:
+            return [completed(extract_pdf_pages, path, pages)]
+        executor = self.get_executor()
+        return [executor.submit(extract_pdf_pages, path, chunk) for chunk in split_pages(pages, self.workers, self.min_chunk_pages)]
+
+    def extract(self, path: str, page_ranges: Optional[PageRanges] = None) -> str:
+        """
+        The document's text, selected pages joined in order: the prefetched result if the file and
+        selection are unchanged, else the cached text for its content, else extracted now.
+        """
+        key = get_file_key(path)
+        with self.lock:
+            job = self.jobs.pop(key[0], None)
+        if job is None or job.key != key or job.page_ranges != page_ranges:
+            text, store = self.lookup(path, page_ranges)
+            if text is not None:
+                return text
+            if os.path.splitext(path)[1].lower() == '.pdf':
+                pages = select_pages(page_ranges, count_pdf_pages(path))
+                job = DocumentJob(key, self.start(path, pages, self.use_pool(len(pages))), store, page_ranges)
+            else:
+                job = DocumentJob(key, self.start(path, None, False), store, page_ranges)
+
+        text = ' '.join(page for chunk in job.chunks for page in chunk.result())
+        cache = self.get_cache()
+        if job.store is not None and cache is not None:
+            cache.set(*job.store, text)
+        return text
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+            jobs, self.jobs = self.jobs, {}
+        for job in jobs.values():
+            for chunk in job.chunks:
+                chunk.cancel()
+        if executor is not None:
+            executor.shutdown()
+
+_extractor: Optional[DocumentExtractor] = None
+_extractor_lock = threading.Lock()
+
+def get_document_extractor() -> DocumentExtractor:
+    """The process-wide extractor, so a daemon keeps its worker processes between sessions."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = DocumentExtractor()
+        return _extractor
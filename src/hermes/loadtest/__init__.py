@@ -0,0 +1 @@
+"""Offline benchmarking tools: the OpenAI-compatible stub server and the load harness."""
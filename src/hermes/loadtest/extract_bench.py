@@ -0,0 +1,67 @@
+"""
+Benchmark URL content extraction on a corpus of saved pages.
+
+Reports conversion time and output size for each --url-mode, on every .html file below
+the given directories (or on a generated page padded with navigation, scripts and SVG):
+
+    python -m hermes.loadtest.extract_bench ~/saved-pages --max-tokens 8000
+"""
+import argparse
+import os
+import time
+from typing import List, Optional, Tuple
+
+from hermes.chat_models.history import BYTES_PER_TOKEN, estimate_tokens
+from hermes.utils.html_extract import URL_MODES, extract_content
+
+def generate_page(sections: int = 50) -> str:
+    nav = '<nav><ul>' + ''.join(f'<li><a href="/docs/{index}">Section {index}</a></li>' for index in range(200)) + '</ul></nav>'
+    icon = '<svg viewBox="0 0 24 24">' + '<path d="M12 2L2 7l10 5 10-5-10-5z"/>' * 20 + '</svg>'
+    script = '<script>' + 'window.analytics.push({event: "view"});' * 200 + '</script>'
+    body = ''.join(
+        f'<h2>Section {index}</h2>{icon}<p>Paragraph {index} explains <a href="/x{index}">a feature</a> in detail. ' * 3 + '</p>'
+        f'<pre><code>hermes --url https://example.com/{index}</code></pre>'
+        for index in range(sections)
+    )
+    return f'<html><head><style>{"body { margin: 0 } " * 200}</style>{script}</head><body>{nav}<header>Site</header><main><h1>Docs</h1>{body}</main><aside>{nav}</aside><footer>Footer</footer>{script}</body></html>'
+
+def load_corpus(paths: List[str]) -> List[Tuple[str, str]]:
+    pages = []
+    for path in paths:
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(root, name) for root, _, names in os.walk(path) for name in names if name.endswith(('.html', '.htm'))
+        ]
+        for file_path in sorted(files):
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append((file_path, f.read()))
+    return pages
+
+def benchmark(pages: List[Tuple[str, str]], mode: str, max_bytes: Optional[int], repeat: int) -> Tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [extract_content(html, mode, max_bytes) for _, html in pages]
+    seconds = (time.perf_counter() - start) / repeat
+    return seconds, sum(len(output.encode('utf-8')) for output in outputs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark --url-mode conversion on saved pages")
+    parser.add_argument("paths", nargs='*', help="Saved .html files or directories of them")
+    parser.add_argument("--max-bytes", type=int, help="Cap each page's content, as --url-max-bytes does")
+    parser.add_argument("--max-tokens", type=int, help="Cap each page's content, as --url-max-tokens does")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.paths) if args.paths else [('generated', generate_page())]
+    if not pages:
+        parser.error("No .html files found")
+    caps = [cap for cap in (args.max_bytes, args.max_tokens * BYTES_PER_TOKEN if args.max_tokens else None) if cap]
+    max_bytes = min(caps) if caps else None
+
+    input_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+    print(f"{len(pages)} pages, {input_bytes / 1024:,.0f} KiB of HTML")
+    for mode in URL_MODES:
+        seconds, output_bytes = benchmark(pages, mode, max_bytes, args.repeat)
+        print(f"{mode:<5} {seconds * 1000 / len(pages):8.1f}ms/page {output_bytes / 1024:8.1f} KiB ~{estimate_tokens(output_bytes):,} tokens")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Load generator measuring Hermes's own overhead.
+
+Runs ChatApplication conversations or WorkflowExecutor workflows end to end, with
+scripted input and no terminal output, from --concurrency threads. Each worker owns its
+model, as separate Hermes processes would. With the fake model the time it deliberately
+waits is known, so the report separates Hermes-side latency and CPU from "provider" time.
+
+    python -m hermes.loadtest --scenario chat --runs 200 --concurrency 8 --turns 3
+    python -m hermes.loadtest --scenario workflow --first-chunk-delay 0.2 --chunks-per-second 50
+    python -m hermes.loadtest --stub --chunk-delay 0.005   # real OpenAI SDK against the local stub
+    python -m hermes.loadtest --scenario workflow --workflow review.yaml --model claude --replay review.jsonl --replay-speed 1
+"""
+import argparse
+import configparser
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from hermes.chat_application import ChatApplication
+from hermes.chat_models.fake import FakeModel, generate_reply
+from hermes.chat_models.wrappers import find_wrapper
+from hermes.context_orchestrator import ContextOrchestrator
+from hermes.model_registry import create_model, create_processors
+from hermes.ui.chat_ui import ChatUI
+from hermes.utils.stream_buffer import StreamBuffer
+
+DEFAULT_WORKFLOW = """\
+loadtest:
+  type: sequential
+  tasks:
+    draft:
+      type: llm
+      prompt: "Draft an answer to: {initial_prompt}"
+    review:
+      type: llm
+      prompt: "Review the draft and list its weaknesses."
+    summary:
+      type: llm
+      prompt: "Summarize the final answer in three sentences."
+"""
+
+class HeadlessChatUI(ChatUI):
+    """Scripted user input; raw mode discards output, pretty mode renders the markdown into a buffer."""
+    def __init__(self, prints_raw: bool, inputs: List[str]):
+        super().__init__(prints_raw)
+        from rich.console import Console
+        self._console = Console(file=io.StringIO(), width=100)
+        self.inputs = list(inputs) + ['exit']
+
+    def display_response(self, response_generator):
+        if not self.prints_raw:
+            return super().display_response(response_generator)
+        buffer = StreamBuffer()
+        for _ in buffer.tee(response_generator):
+            pass
+        return buffer.getvalue()
+
+    def get_user_input(self) -> str:
+        return self.inputs.pop(0)
+
+def percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+class LoadHarness:
+    def __init__(self, model_name: str, config: configparser.ConfigParser, run_once: Callable[[Any], None]):
+        self.model_name = model_name
+        self.config = config
+        self.run_once = run_once
+        self.lock = threading.Lock()
+        self.next_run = 0
+        self.latencies: List[float] = []
+        self.overheads: List[float] = []
+        self.requests = 0
+        self.errors: List[str] = []
+
+    def worker(self, runs: int):
+        model = create_model(self.model_name, self.config)
+        fake = find_wrapper(model, FakeModel)
+        while True:
+            with self.lock:
+                if self.next_run >= runs:
+                    return
+                self.next_run += 1
+            simulated = fake.simulated_seconds if fake else 0.0
+            requests = fake.requests if fake else 0
+            start = time.perf_counter()
+            try:
+                self.run_once(model)
+            except Exception as e:
+                with self.lock:
+                    self.errors.append(f"{type(e).__name__}: {e}")
+                continue
+            latency = time.perf_counter() - start
+            with self.lock:
+                self.latencies.append(latency)
+                if fake:
+                    self.overheads.append(latency - (fake.simulated_seconds - simulated))
+                    self.requests += fake.requests - requests
+
+    def run(self, runs: int, concurrency: int) -> Dict[str, Any]:
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        threads = [threading.Thread(target=self.worker, args=(runs,), daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+        report: Dict[str, Any] = {
+            'runs': len(self.latencies), 'errors': len(self.errors), 'concurrency': concurrency,
+            'wall_seconds': wall, 'runs_per_second': len(self.latencies) / wall if wall else 0.0,
+            'cpu_seconds': cpu, 'cpu_ms_per_run': cpu * 1000 / max(len(self.latencies), 1),
+        }
+        if self.latencies:
+            report.update({f'latency_p{p}_ms': percentile(self.latencies, p) * 1000 for p in (50, 95, 99)})
+        if self.overheads:
+            report['requests'] = self.requests
+            report.update({f'overhead_p{p}_ms': percentile(self.overheads, p) * 1000 for p in (50, 95, 99)})
+            report['overhead_ms_per_request'] = sum(self.overheads) * 1000 / max(self.requests, 1)
+        if self.errors:
+            report['first_error'] = self.errors[0]
+        return report
+
+def chat_runner(model_name: str, prompt: str, turns: int, pretty: bool) -> Callable[[Any], None]:
+    def run_once(model):
+        file_processor, prompt_builder = create_processors(model_name)
+        ui = HeadlessChatUI(prints_raw=not pretty, inputs=[prompt] * (turns - 1))
+        app = ChatApplication(model, ui, file_processor, prompt_builder, {}, ContextOrchestrator([]))
+        app.prepare()
+        app.run_interactive(prompt, {})
+    return run_once
+
+def workflow_runner(model_name: str, prompt: str, workflow_file: str) -> Callable[[Any], None]:
+    from hermes.workflows.executor import WorkflowExecutor
+
+    def run_once(model):
+        _, prompt_builder = create_processors(model_name)
+        executor = WorkflowExecutor(workflow_file, model, prompt_builder, [], prompt, lambda *args, **kwargs: None)
+        executor.execute()
+    return run_once
+
+def build_config(args) -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    if args.config:
+        config.read(args.config)
+    if args.model == 'fake':
+        fake = {
+            'reply_words': str(args.reply_words), 'chunk_size': str(args.chunk_size),
+            'chunks_per_second': str(args.chunks_per_second), 'first_chunk_delay': str(args.first_chunk_delay),
+            'error_rate': str(args.error_rate),
+        }
+        config.read_dict({'FAKE': fake})
+    if args.replay:
+        config.read_dict({'CASSETTE': {'replay': args.replay, 'speed': str(args.replay_speed)}})
+    return config
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    for key, value in report.items():
+        lines.append(f"{key:<26} {value:,.2f}" if isinstance(value, float) else f"{key:<26} {value}")
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=['chat', 'workflow'], default='chat')
+    parser.add_argument("--runs", type=int, default=50, help="Conversations or workflows to run in total")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=3, help="Messages per chat conversation")
+    parser.add_argument("--workflow", help="Workflow YAML to run (default: three sequential LLM tasks)")
+    parser.add_argument("--prompt", default="Explain how HTTP keep-alive works.")
+    parser.add_argument("--pretty", action="store_true", help="Render responses as markdown, as ChatUI --pretty does")
+    parser.add_argument("--model", default='fake', help="Registered model to drive (default: fake)")
+    parser.add_argument("--config", help="Config file for real providers")
+    parser.add_argument("--stub", action="store_true", help="Drive the openai model against an in-process OpenAI stub server (its CPU time is included)")
+    parser.add_argument("--reply-words", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--chunks-per-second", type=float, default=0)
+    parser.add_argument("--first-chunk-delay", type=float, default=0)
+    parser.add_argument("--chunk-delay", type=float, default=0, help="Seconds between stub chunks (--stub)")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--replay", metavar="CASSETTE", help="Serve recorded responses (from hermes --record) to every worker; use with the recorded --model")
+    parser.add_argument("--replay-speed", type=float, default=0, help="Replay pace relative to the recording (0 = as fast as possible)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    stub = None
+    if args.stub:
+        from .openai_stub import OpenAIStubServer, split_reply
+        stub = OpenAIStubServer(split_reply(generate_reply(args.reply_words), args.chunk_size), first_chunk_delay=args.first_chunk_delay, chunk_delay=args.chunk_delay)
+        stub.__enter__()
+        args.model = 'openai'
+    config = build_config(args)
+    if stub is not None:
+        config.read_dict({'OPENAI': {'api_key': 'stub', 'base_url': stub.base_url}})
+
+    workflow_file = args.workflow
+    try:
+        if args.scenario == 'workflow':
+            if workflow_file is None:
+                with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False) as f:
+                    f.write(DEFAULT_WORKFLOW)
+                workflow_file = f.name
+            run_once = workflow_runner(args.model, args.prompt, workflow_file)
+        else:
+            run_once = chat_runner(args.model, args.prompt, args.turns, args.pretty)
+        report = LoadHarness(args.model, config, run_once).run(args.runs, args.concurrency)
+    finally:
+        if stub is not None:
+            stub.__exit__(None, None, None)
+        if workflow_file is not None and args.workflow is None:
+            os.unlink(workflow_file)
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
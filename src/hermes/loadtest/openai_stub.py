@@ -0,0 +1,128 @@
+"""
+Local stand-in for the OpenAI chat completions API, with pacing and injected faults.
+
+Point OpenAIModel at it with [OPENAI] base_url to exercise the real SDK and HTTP stack
+without API calls:
+
+    python -m hermes.loadtest.openai_stub --port 8765 --reply-words 200 --chunk-delay 0.01
+
+Faults are queued per request: ('status', code, headers) fails the request, and
+('disconnect', n) drops the connection after n chunks.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+Fault = Optional[Tuple[Any, ...]]
+
+class OpenAIStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            self.server.requests.append(body)
+            fault = self.server.faults.pop(0) if self.server.faults else None
+
+        if fault is not None and fault[0] == 'status':
+            _, status, headers = fault
+            payload = json.dumps({'error': {'message': f'injected {status}', 'type': 'stub_error'}}).encode('utf-8')
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        events = [self.chunk(body, {'role': 'assistant'})]
+        events += [self.chunk(body, {'content': text}) for text in self.server.reply]
+        events.append(self.chunk(body, {}, finish_reason='stop'))
+        if body.get('stream_options', {}).get('include_usage'):
+            prompt_tokens = sum(len(str(message.get('content', '')).split()) for message in body['messages'])
+            events.append(dict(self.chunk(body, {}), choices=[], usage={
+                'prompt_tokens': prompt_tokens, 'completion_tokens': len(self.server.reply),
+                'total_tokens': prompt_tokens + len(self.server.reply),
+            }))
+        encoded = [f"data: {json.dumps(event)}\n\n".encode('utf-8') for event in events] + [b"data: [DONE]\n\n"]
+        if fault is not None and fault[0] == 'disconnect':
+            # Promise the full body, send part of it and hang up, like a dropped connection
+            sent = encoded[:1 + fault[1]]
+            self.close_connection = True
+        else:
+            sent = encoded
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(sum(map(len, encoded))))
+        self.end_headers()
+        if self.server.first_chunk_delay:
+            time.sleep(self.server.first_chunk_delay)
+        for index, data in enumerate(sent):
+            if index > 1 and self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def chunk(self, body: Dict[str, Any], delta: Dict[str, Any], finish_reason: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+        }
+
+class OpenAIStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, reply: List[str], faults: Optional[List[Fault]] = None, first_chunk_delay: float = 0, chunk_delay: float = 0, port: int = 0):
+        super().__init__(('127.0.0.1', port), OpenAIStubHandler)
+        self.reply = reply
+        self.faults = list(faults or [])
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.requests: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+def split_reply(text: str, chunk_size: int) -> List[str]:
+    return [text[start:start + chunk_size] for start in range(0, len(text), chunk_size)]
+
+def main():
+    from hermes.chat_models.fake import generate_reply
+
+    parser = argparse.ArgumentParser(description="Serve a local OpenAI-compatible chat completions stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reply-words", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=16, help="Characters per streamed chunk")
+    parser.add_argument("--first-chunk-delay", type=float, default=0, help="Seconds before the first chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0, help="Seconds between chunks")
+    args = parser.parse_args()
+
+    server = OpenAIStubServer(split_reply(generate_reply(args.reply_words), args.chunk_size), first_chunk_delay=args.first_chunk_delay, chunk_delay=args.chunk_delay, port=args.port)
+    print(f"Serving on {server.base_url} (set [OPENAI] base_url to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark PDF text extraction against the number of worker processes.
+
+Reports pages/sec extracting every .pdf below the given directories (or a generated
+corpus) with 1, 2, 4, ... workers up to the core count, then for a warm run served
+from a scratch document cache:
+
+    python -m hermes.loadtest.pdf_bench ~/papers --pages 1-20
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from hermes.file_processors.documents import DocumentExtractor, PageRanges, count_pdf_pages, parse_page_ranges, select_pages
+
+def make_pdf(path: str, page_texts: List[str], lines_per_page: int = 1):
+    """Write a PDF with each page's text repeated on lines_per_page lines of Helvetica."""
+    from PyPDF2 import PageObject, PdfWriter
+    from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica'),
+    })
+    writer = PdfWriter()
+    for text in page_texts:
+        page = PageObject.create_blank_page(None, 612, 792)
+        page[NameObject('/Resources')] = DictionaryObject({NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})})
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        lines = ''.join(f"0 -14 Td ({escaped}) Tj " for _ in range(lines_per_page))
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 72 740 Td {lines}ET".encode('latin-1', errors='replace'))
+        page[NameObject('/Contents')] = content
+        writer.add_page(page)
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+def generate_corpus(directory: str, files: int = 4, pages: int = 100) -> List[str]:
+    paths = []
+    for index in range(files):
+        path = os.path.join(directory, f"document{index}.pdf")
+        make_pdf(path, [f"Document {index} page {page} discusses extraction throughput in some detail." for page in range(pages)], lines_per_page=40)
+        paths.append(path)
+    return paths
+
+def find_pdfs(paths: List[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+        else:
+            found.extend(sorted(
+                os.path.join(root, name) for root, _, names in os.walk(path) for name in names if name.lower().endswith('.pdf')
+            ))
+    return found
+
+def benchmark(paths: List[str], workers: int, page_ranges: Optional[PageRanges], use_cache: bool = False) -> float:
+    """Seconds to extract the corpus with a fresh pool, including starting its worker processes."""
+    extractor = DocumentExtractor(workers=workers, use_cache=use_cache)
+    try:
+        start = time.perf_counter()
+        extractor.prefetch(paths, page_ranges)
+        for path in paths:
+            extractor.extract(path, page_ranges)
+        return time.perf_counter() - start
+    finally:
+        extractor.shutdown()
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction pages/sec against worker processes")
+    parser.add_argument("paths", nargs='*', help="PDF files or directories of them")
+    parser.add_argument("--pages", help="Page selection, as --pdf-pages takes")
+    parser.add_argument("--max-workers", type=int, default=cores, help=f"Most worker processes to try (default: {cores}, the core count)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = find_pdfs(args.paths) if args.paths else generate_corpus(directory)
+        if not paths:
+            parser.error("No .pdf files found")
+        page_ranges = parse_page_ranges(args.pages) if args.pages else None
+        pages = sum(len(select_pages(page_ranges, count_pdf_pages(path))) for path in paths)
+        print(f"{len(paths)} PDFs, {pages} pages, {cores} cores")
+
+        counts, workers = [], 1
+        while workers < args.max_workers:
+            counts.append(workers)
+            workers *= 2
+        counts.append(args.max_workers)
+        baseline = None
+        for workers in counts:
+            seconds = benchmark(paths, workers, page_ranges)
+            baseline = baseline or seconds
+            print(f"{workers:>3} workers {pages / seconds:8.1f} pages/sec {baseline / seconds:5.2f}x")
+
+        os.environ['HERMES_CACHE_DIR'] = os.path.join(directory, 'cache')
+        benchmark(paths, args.max_workers, page_ranges, use_cache=True)
+        seconds = benchmark(paths, args.max_workers, page_ranges, use_cache=True)
+        print(f"warm cache  {pages / seconds:8.1f} pages/sec {baseline / seconds:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Local HTTP server for benchmarking URL contexts without touching the network.
+
+Serves an in-memory site (or a directory of saved pages) over HTTP/1.1 keep-alive, with
+a fixed per-response delay standing in for a remote server's latency, and counts the
+requests, TCP connections and peak concurrent requests it saw. With etags, pages carry an ETag and conditional
+requests for unchanged pages get a 304:
+
+    python -m hermes.loadtest.site_server --pages 15 --delay 0.2
+"""
+import argparse
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+Page = Tuple[str, bytes]
+
+class SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        with self.server.lock:
+            self.server.requests.append(path)
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            self.respond(path)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def respond(self, path: str):
+        page = self.server.pages.get(path)
+        if page is None:
+            self.send_error(404)
+            return
+        content_type, body = page
+        etag = f'"{hashlib.sha1(body).hexdigest()}"' if self.server.etags else None
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        for name, value in self.server.headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages: Dict[str, Page], delay: float = 0, etags: bool = False, headers: Optional[Dict[str, str]] = None, port: int = 0):
+        super().__init__(('127.0.0.1', port), SiteHandler)
+        self.pages = pages
+        self.delay = delay
+        self.etags = etags
+        self.headers = headers or {}
+        self.requests: List[str] = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+def html_page(title: str, paragraphs: int = 20) -> Page:
+    body = ''.join(f"<p>{title} paragraph {index} with some filler text.</p>" for index in range(paragraphs))
+    return 'text/html; charset=utf-8', f"<html><head><title>{title}</title></head><body><h1>{title}</h1>{body}</body></html>".encode('utf-8')
+
+def generate_site(count: int) -> Dict[str, Page]:
+    return {f"/page{index}.html": html_page(f"Page {index}") for index in range(count)}
+
+def load_site(directory: str) -> Dict[str, Page]:
+    """Serve every file below directory at its relative path."""
+    pages = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                pages['/' + relative] = (mimetypes.guess_type(name)[0] or 'application/octet-stream', f.read())
+    return pages
+
+def benchmark_url_loading(urls: List[str], workers: Optional[int], **options) -> float:
+    from argparse import Namespace
+    from hermes.context_providers.url_context_provider import URLContextProvider
+
+    options.setdefault('no_url_cache', True)
+    start = time.perf_counter()
+    URLContextProvider().load_context(Namespace(url=urls, url_workers=workers, url_timeout=None, **options))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark URL context loading against a local site")
+    parser.add_argument("--pages", type=int, default=15, help="Pages to generate")
+    parser.add_argument("--site", help="Serve saved pages from this directory instead of generated ones")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds the server waits before each response")
+    parser.add_argument("--workers", type=int, default=None, help="URL fetch workers to compare against one")
+    args = parser.parse_args()
+
+    pages = load_site(args.site) if args.site else generate_site(args.pages)
+    with SiteServer(pages, delay=args.delay, etags=True) as server, tempfile.TemporaryDirectory() as cache_dir:
+        urls = [server.url(path) for path in sorted(pages)]
+        for workers in (1, args.workers):
+            server.connections = 0
+            seconds = benchmark_url_loading(urls, workers)
+            label = workers or 'default'
+            print(f"{len(urls)} URLs, {label} workers: {seconds * 1000:.0f}ms over {server.connections} connections")
+
+        os.environ['HERMES_CACHE_DIR'] = cache_dir
+        benchmark_url_loading(urls, args.workers, no_url_cache=False)
+        seconds = benchmark_url_loading(urls, args.workers, no_url_cache=False)
+        print(f"{len(urls)} URLs, revalidating the cache (304s): {seconds * 1000:.0f}ms")
+        seconds = benchmark_url_loading(urls, args.workers, no_url_cache=False, url_max_age=3600)
+        print(f"{len(urls)} URLs, fresh in the cache: {seconds * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
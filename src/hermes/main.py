@@ -6,12 +6,7 @@ from datetime import datetime
 import sys
 import argparse
 import configparser
-from typing import Dict
-import os
-
-from hermes.prompt_builders.bedrock_prompt_builder import BedrockPromptBuilder
-from hermes.prompt_builders.markdown_prompt_builder import MarkdownPromptBuilder
-from hermes.prompt_builders.xml_prompt_builder import XMLPromptBuilder
+from typing import Dict, Optional
 
 if os.name == 'posix':
     import readline
@@ -23,19 +18,10 @@ elif os.name == 'nt':
         readline = None
 
 from .utils.file_utils import process_file_name
-from .file_processors.default import DefaultFileProcessor
-from .file_processors.bedrock import BedrockFileProcessor
-from .chat_models.claude import ClaudeModel
-from .chat_models.bedrock import BedrockModel
-from .chat_models.gemini import GeminiModel
-from .chat_models.openai import OpenAIModel
-from .chat_models.ollama import OllamaModel
-from .chat_models.deepseek import DeepSeekModel
-from .chat_models.reflection import ReflectionModel
-from .chat_models.groq import GroqModel
+from .model_registry import create_model_and_processors, get_model_names
 from .ui.chat_ui import ChatUI
 from .chat_application import ChatApplication
-from .workflows.executor import WorkflowExecutor
+from .chat_models.startup import ModelStartup
 from .context_orchestrator import ContextOrchestrator
 from .context_provider_loader import load_context_providers
 
@@ -44,41 +30,121 @@ def get_default_model(config):
         return config['BASE']['model']
     return None
 
-def main():
-    parser = argparse.ArgumentParser(description="Multi-model chat application with workflow support")
-    parser.add_argument("--model", choices=["claude", "bedrock-claude", "bedrock-claude-3.5", "bedrock-opus", "bedrock-mistral", "gemini", "openai", "ollama", "deepseek", "reflection", "groq"], help="Choose the model to use")
+def build_parser(context_orchestrator: ContextOrchestrator, parser_class=argparse.ArgumentParser) -> argparse.ArgumentParser:
+    parser = parser_class(description="Multi-model chat application with workflow support")
+    parser.add_argument("--model", choices=get_model_names(), help="Choose the model to use")
     parser.add_argument("--prompt", help="Prompt text to send immediately")
     parser.add_argument("--prompt-file", help="File containing prompt to send immediately")
     parser.add_argument("--append", "-a", help="Append to the specified file")
     parser.add_argument("--update", "-u", help="Update the specified file")
     parser.add_argument("--pretty", help="Print the output by rendering markdown", action="store_true")
     parser.add_argument("--workflow", help="Specify a workflow YAML file to execute")
-
-    # Load context providers dynamically (including extensions)
-    context_providers = load_context_providers()
-    context_orchestrator = ContextOrchestrator(context_providers)
+    parser.add_argument("--daemon", help="Run a long-lived Hermes daemon that later hermes invocations connect to", action="store_true")
+    parser.add_argument("--no-daemon", help="Run in this process even if a Hermes daemon is running", action="store_true")
+    parser.add_argument("--response-cache", help="Reuse cached responses for identical requests (see [RESPONSE_CACHE] in the config)", action="store_true")
+    parser.add_argument("--prompt-cache", help="Ask the provider to cache the file context between turns (Claude, Bedrock, Gemini)", action="store_true")
+    parser.add_argument("--context-timeout", type=float, help="Seconds a context provider may take to load before Hermes continues without it (default: 120, 0 waits forever)")
+    parser.add_argument("--history-tokens", type=int, help="Drop the oldest conversation turns once the history exceeds this many tokens")
+    parser.add_argument("--record", metavar="CASSETTE", help="Record every request and its timed response stream to a cassette file")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Serve responses from a recorded cassette instead of calling the model")
+    parser.add_argument("--replay-speed", type=float, help="Replay at this multiple of the recorded pace (1 = original speed); default is as fast as possible")
+    parser.add_argument("--stats", help="Print latency and throughput stats after each response (also logged to [STATS] jsonl)", action="store_true")
 
     # Add arguments from context providers (including extensions)
     context_orchestrator.add_arguments(parser)
+    return parser
 
-    args = parser.parse_args()
-
+def load_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     config_dir = os.path.join(os.path.expanduser("~"), ".config", "multillmchat")
     config_path = os.path.join(config_dir, "config.ini")
     os.makedirs(config_dir, exist_ok=True)
     config.read(config_path)
+    return config
+
+def apply_argument_overrides(args, config: configparser.ConfigParser):
+    """Fold CLI flags into config sections, which is where the model factory reads its options from."""
+    if getattr(args, 'response_cache', False):
+        if not config.has_section('RESPONSE_CACHE'):
+            config.add_section('RESPONSE_CACHE')
+        config['RESPONSE_CACHE']['enabled'] = 'true'
+    if getattr(args, 'prompt_cache', False):
+        if not config.has_section('PROMPT_CACHE'):
+            config.add_section('PROMPT_CACHE')
+        config['PROMPT_CACHE']['enabled'] = 'true'
+    if getattr(args, 'history_tokens', None):
+        if not config.has_section('HISTORY'):
+            config.add_section('HISTORY')
+        config['HISTORY']['max_tokens'] = str(args.history_tokens)
+    for option in ('record', 'replay'):
+        if getattr(args, option, None):
+            if not config.has_section('CASSETTE'):
+                config.add_section('CASSETTE')
+            config['CASSETTE'][option] = getattr(args, option)
+    if getattr(args, 'replay_speed', None) is not None:
+        if not config.has_section('CASSETTE'):
+            config.add_section('CASSETTE')
+        config['CASSETTE']['speed'] = str(args.replay_speed)
+    if getattr(args, 'stats', False):
+        if not config.has_section('STATS'):
+            config.add_section('STATS')
+        config['STATS']['print'] = 'true'
+
+def configure_file_processor(file_processor, args):
+    """Pass --pdf-pages on to file processors that extract document text, for files read without a prefetch too."""
+    from .file_processors.default import DefaultFileProcessor
+    from .file_processors.documents import parse_page_ranges
+    if getattr(args, 'pdf_pages', None) and isinstance(file_processor, DefaultFileProcessor):
+        file_processor.page_ranges = parse_page_ranges(args.pdf_pages)
+
+def report_model_stats(model):
+    from .chat_models.cassette import ReplayChatModel
+    from .chat_models.hedged import HedgedChatModel
+    from .chat_models.response_cache import CachedChatModel
+    from .chat_models.retry import RetryingChatModel
+    from .chat_models.wrappers import find_wrapper
+
+    for model_class in (CachedChatModel, RetryingChatModel, HedgedChatModel, ReplayChatModel):
+        found = find_wrapper(model, model_class)
+        stats_line = found.get_stats_line() if found is not None else None
+        if stats_line:
+            print(stats_line, file=sys.stderr)
+
+def load_special_command_prompts() -> Dict[str, str]:
+    special_command_prompts_path = os.path.join(os.path.dirname(__file__), "config", "special_command_prompts.yaml")
+    with open(special_command_prompts_path, 'r') as f:
+        return yaml.safe_load(f)
+
+def main():
+    argv = sys.argv[1:]
+    if "--daemon" not in argv and "--no-daemon" not in argv:
+        from .daemon import should_use_daemon, run_client
+        if should_use_daemon(argv):
+            sys.exit(run_client(argv))
+
+    # Load context providers dynamically (including extensions)
+    context_providers = load_context_providers()
+    context_orchestrator = ContextOrchestrator(context_providers)
+    parser = build_parser(context_orchestrator)
+
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    apply_argument_overrides(args, config)
+
+    # Load special command prompts
+    special_command_prompts = load_special_command_prompts()
+
+    if args.daemon:
+        from .daemon import serve
+        serve(config, special_command_prompts)
+        return
 
     if args.model is None:
         args.model = get_default_model(config)
         if args.model is None:
             parser.error("No model specified and no default model found in config. Use --model to specify a model or set a default in the config file.")
 
-    # Load special command prompts
-    special_command_prompts_path = os.path.join(os.path.dirname(__file__), "config", "special_command_prompts.yaml")
-    with open(special_command_prompts_path, 'r') as f:
-        special_command_prompts = yaml.safe_load(f)
-
     if args.workflow:
         run_workflow(args, config)
     else:
@@ -88,13 +154,18 @@ def custom_print(text, *args, **kwargs):
     print(text, flush=True, *args, **kwargs)
 
 def run_workflow(args, config):
+    # Imported here so that chat runs don't pay for the workflow task modules (pdfminer etc.)
+    from .workflows.executor import WorkflowExecutor
+
     model, file_processor, prompt_builder = create_model_and_processors(args.model, config)
+    configure_file_processor(file_processor, args)
 
     input_files = args.files
     initial_prompt = args.prompt or (open(args.prompt_file, 'r').read().strip() if args.prompt_file else "")
 
     executor = WorkflowExecutor(args.workflow, model, prompt_builder, input_files, initial_prompt, custom_print)
     result = executor.execute()
+    report_model_stats(model)
 
     # Create /tmp/hermes/ directory if it doesn't exist
     os.makedirs('/tmp/hermes/', exist_ok=True)
@@ -108,70 +179,41 @@ def run_workflow(args, config):
 
     print(f"Workflow execution completed. Detailed report saved to {filename}")
 
-def run_chat_application(args, config, special_command_prompts, context_orchestrator):
-    if args.model is None:
-        args.model = get_default_model(config)
+def get_special_command(args) -> Dict[str, str]:
     special_command: Dict[str, str] = {}
     if args.append:
         special_command['append'] = args.append
     elif args.update:
         special_command['update'] = args.update
+    return special_command
 
-    initial_prompt = None
+def get_initial_prompt(args) -> Optional[str]:
     if args.prompt:
-        initial_prompt = args.prompt
+        return args.prompt
     elif args.prompt_file:
         with open(args.prompt_file, 'r') as f:
-            initial_prompt = f.read().strip()
+            return f.read().strip()
+    return None
+
+def run_chat_application(args, config, special_command_prompts, context_orchestrator):
+    if args.model is None:
+        args.model = get_default_model(config)
+    special_command = get_special_command(args)
+    initial_prompt = get_initial_prompt(args)
 
     model, file_processor, prompt_builder = create_model_and_processors(args.model, config)
+    configure_file_processor(file_processor, args)
+    # Initialize and warm up the model while contexts load and the prompt is built
+    model_startup = ModelStartup(model)
 
     # Load contexts from arguments
     context_orchestrator.load_contexts(args)
 
     ui = ChatUI(prints_raw=not args.pretty)
-    app = ChatApplication(model, ui, file_processor, prompt_builder, special_command_prompts, context_orchestrator)
+    app = ChatApplication(model, ui, file_processor, prompt_builder, special_command_prompts, context_orchestrator, model_startup)
 
     app.run(initial_prompt, special_command)
-
-def create_model_and_processors(model_name: str, config: configparser.ConfigParser):
-    if model_name == "claude":
-        model = ClaudeModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = XMLPromptBuilder(file_processor)
-    elif model_name.startswith("bedrock-"):
-        model_tag = '-'.join(model_name.split("-")[1:])
-        model = BedrockModel(config, model_tag)
-        file_processor = BedrockFileProcessor()
-        prompt_builder = BedrockPromptBuilder(file_processor)
-    elif model_name == "gemini":
-        model = GeminiModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = XMLPromptBuilder(file_processor)
-    elif model_name == "openai":
-        model = OpenAIModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = XMLPromptBuilder(file_processor)
-    elif model_name == "ollama":
-        model = OllamaModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = XMLPromptBuilder(file_processor)
-    elif model_name == "deepseek":
-        model = DeepSeekModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = XMLPromptBuilder(file_processor)
-    elif model_name == "reflection":
-        model = ReflectionModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = MarkdownPromptBuilder(file_processor)
-    elif model_name == "groq":
-        model = GroqModel(config)
-        file_processor = DefaultFileProcessor()
-        prompt_builder = MarkdownPromptBuilder(file_processor)
-    else:
-        raise ValueError(f"Unsupported model: {model_name}")
-
-    return model, file_processor, prompt_builder
+    report_model_stats(model)
 
 if __name__ == "__main__":
     main()
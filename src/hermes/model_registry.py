@@ -0,0 +1,101 @@
+import configparser
+import importlib
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_FILE_PROCESSOR = 'hermes.file_processors.default.DefaultFileProcessor'
+BEDROCK_FILE_PROCESSOR = 'hermes.file_processors.bedrock.BedrockFileProcessor'
+XML_PROMPT_BUILDER = 'hermes.prompt_builders.xml_prompt_builder.XMLPromptBuilder'
+MARKDOWN_PROMPT_BUILDER = 'hermes.prompt_builders.markdown_prompt_builder.MarkdownPromptBuilder'
+BEDROCK_PROMPT_BUILDER = 'hermes.prompt_builders.bedrock_prompt_builder.BedrockPromptBuilder'
+
+class ModelSpec(NamedTuple):
+    """Dotted import paths for everything a model choice needs, resolved only when the model is created."""
+    model_class: str
+    file_processor: str = DEFAULT_FILE_PROCESSOR
+    prompt_builder: str = XML_PROMPT_BUILDER
+    model_args: Tuple[Any, ...] = ()
+    async_model_class: Optional[str] = None
+
+MODEL_REGISTRY: Dict[str, ModelSpec] = {
+    "claude": ModelSpec('hermes.chat_models.claude.ClaudeModel', async_model_class='hermes.chat_models.claude.AsyncClaudeModel'),
+    "bedrock-claude": ModelSpec('hermes.chat_models.bedrock.BedrockModel', BEDROCK_FILE_PROCESSOR, BEDROCK_PROMPT_BUILDER, ('claude',), async_model_class='hermes.chat_models.bedrock.AsyncBedrockModel'),
+    "bedrock-claude-3.5": ModelSpec('hermes.chat_models.bedrock.BedrockModel', BEDROCK_FILE_PROCESSOR, BEDROCK_PROMPT_BUILDER, ('claude-3.5',), async_model_class='hermes.chat_models.bedrock.AsyncBedrockModel'),
+    "bedrock-opus": ModelSpec('hermes.chat_models.bedrock.BedrockModel', BEDROCK_FILE_PROCESSOR, BEDROCK_PROMPT_BUILDER, ('opus',), async_model_class='hermes.chat_models.bedrock.AsyncBedrockModel'),
+    "bedrock-mistral": ModelSpec('hermes.chat_models.bedrock.BedrockModel', BEDROCK_FILE_PROCESSOR, BEDROCK_PROMPT_BUILDER, ('mistral',), async_model_class='hermes.chat_models.bedrock.AsyncBedrockModel'),
+    "gemini": ModelSpec('hermes.chat_models.gemini.GeminiModel', async_model_class='hermes.chat_models.gemini.AsyncGeminiModel'),
+    "openai": ModelSpec('hermes.chat_models.openai.OpenAIModel', async_model_class='hermes.chat_models.openai.AsyncOpenAIModel'),
+    "ollama": ModelSpec('hermes.chat_models.ollama.OllamaModel', async_model_class='hermes.chat_models.ollama.AsyncOllamaModel'),
+    "deepseek": ModelSpec('hermes.chat_models.deepseek.DeepSeekModel', async_model_class='hermes.chat_models.deepseek.AsyncDeepSeekModel'),
+    "reflection": ModelSpec('hermes.chat_models.reflection.ReflectionModel', prompt_builder=MARKDOWN_PROMPT_BUILDER, async_model_class='hermes.chat_models.reflection.AsyncReflectionModel'),
+    "groq": ModelSpec('hermes.chat_models.groq.GroqModel', prompt_builder=MARKDOWN_PROMPT_BUILDER, async_model_class='hermes.chat_models.groq.AsyncGroqModel'),
+    # Offline model with scripted pacing and faults, for benchmarking Hermes itself (see [FAKE])
+    "fake": ModelSpec('hermes.chat_models.fake.FakeModel', async_model_class='hermes.chat_models.fake.AsyncFakeModel'),
+    # Races the [HEDGE] backends; messages stay provider-neutral, so it uses the default processors
+    "hedged": ModelSpec('hermes.chat_models.hedged.create_hedged_model'),
+}
+
+def get_model_names() -> List[str]:
+    return list(MODEL_REGISTRY)
+
+def import_object(dotted_path: str) -> Any:
+    """Import and return the attribute named by a dotted path such as 'package.module.ClassName'."""
+    module_name, _, attribute = dotted_path.rpartition('.')
+    return getattr(importlib.import_module(module_name), attribute)
+
+def get_model_spec(model_name: str) -> ModelSpec:
+    spec = MODEL_REGISTRY.get(model_name)
+    if spec is None:
+        raise ValueError(f"Unsupported model: {model_name}")
+    return spec
+
+def create_async_model(model_name: str, config: configparser.ConfigParser):
+    """Create the AsyncChatModel variant of a registered model, for driving many conversations concurrently."""
+    spec = get_model_spec(model_name)
+    if spec.async_model_class is None:
+        raise ValueError(f"Unsupported model: {model_name}")
+    return import_object(spec.async_model_class)(config, *spec.model_args)
+
+def wrap_model(model, config: configparser.ConfigParser):
+    """Apply the opt-in ChatModelWrappers enabled in the config around a provider model."""
+    from hermes.chat_models.cassette import RecordingChatModel, ReplayChatModel, get_cassette_settings, load_cassette
+    from hermes.chat_models.response_cache import CachedChatModel, is_response_cache_enabled, open_response_cache
+    from hermes.chat_models.retry import RetryingChatModel, create_retry_policy, is_retry_enabled
+
+    cassette = get_cassette_settings(config)
+    if cassette['replay']:
+        model = ReplayChatModel(model, load_cassette(cassette['replay']), cassette['speed'])
+    if is_retry_enabled(config):
+        model = RetryingChatModel(model, create_retry_policy(config))
+    # Outside the retries, so recordings hold the stream the session saw, waits included
+    if cassette['record']:
+        model = RecordingChatModel(model, cassette['record'])
+    # Outermost, so cache hits skip retries and the circuit breaker
+    if is_response_cache_enabled(config):
+        model = CachedChatModel(model, open_response_cache(config))
+    return model
+
+def create_provider_model(model_name: str, config: configparser.ConfigParser):
+    """Create the bare registered model, without the config-driven wrappers, history policy or stats."""
+    spec = get_model_spec(model_name)
+    return import_object(spec.model_class)(config, *spec.model_args)
+
+def create_model(model_name: str, config: configparser.ConfigParser):
+    from hermes.chat_models.history import create_history_policy
+    from hermes.chat_models.stats import create_stats_recorder
+
+    model = wrap_model(create_provider_model(model_name, config), config)
+    model.history_policy = create_history_policy(config, model)
+    model.stats_recorder = create_stats_recorder(config)
+    return model
+
+def create_processors(model_name: str):
+    """Create the per-conversation file processor and prompt builder for a model."""
+    spec = get_model_spec(model_name)
+    file_processor = import_object(spec.file_processor)()
+    prompt_builder = import_object(spec.prompt_builder)(file_processor)
+    return file_processor, prompt_builder
+
+def create_model_and_processors(model_name: str, config: configparser.ConfigParser):
+    model = create_model(model_name, config)
+    file_processor, prompt_builder = create_processors(model_name)
+    return model, file_processor, prompt_builder
@@ -3,7 +3,6 @@ import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional, Union
 
 from hermes.file_processors.base import FileProcessor
-from hermes.utils.file_utils import is_binary
 
 from .base import PromptBuilder
 
@@ -18,10 +17,12 @@ class BedrockPromptBuilder(PromptBuilder):
         self.contents.append({'text': content + '\n'})
 
     def add_file(self, file_path: str, name: str):
-        if is_binary(file_path):
+        # One read serves the binary check and the content
+        snapshot = self.file_processor.get_snapshot(file_path)
+        if snapshot is not None and snapshot.binary:
             _, ext = os.path.splitext(file_path)
             ext = ext.lower()
-            content_bytes = self.file_processor.read_file(file_path)
+            content_bytes = snapshot.data
             self.contents.append({
                 'document': {
                     'format': ext[1:],
@@ -32,8 +33,7 @@ class BedrockPromptBuilder(PromptBuilder):
                 }
             })
         else:
-            print(f"{file_path} is not binary")
-            file_content = self.file_processor.read_file(file_path).decode('utf-8')
+            file_content = snapshot.text if snapshot is not None else self.file_processor.read_file(file_path).decode('utf-8')
             file_elem = ET.Element("document", name=name)
             file_elem.text = file_content
             self.contents.append({'text': ET.tostring(file_elem, encoding='unicode')})
@@ -1,37 +1,51 @@
-from rich.console import Console
-from rich.markdown import Markdown
-from rich import live as Live
-from rich.spinner import Spinner
-from rich.panel import Panel
 from typing import Generator
 import os
 import sys
+import time
+
+from hermes.utils.stream_buffer import StreamBuffer
+
+# Re-rendering the markdown costs O(response length), so pretty mode redraws at most this often
+RENDER_INTERVAL = 0.05
 
 class ChatUI:
     def __init__(self, prints_raw: bool):
-        self.console = Console()
         self.prints_raw = prints_raw
+        self._console = None
+
+    @property
+    def console(self):
+        # rich is only imported once something actually renders through it
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
 
     def display_response(self, response_generator: Generator[str, None, None]):
+        buffer = StreamBuffer()
         if self.prints_raw:
-            buffer = ""
-            for text in response_generator:
-                buffer += text
+            for text in buffer.tee(response_generator):
                 print(text, end="", flush=True)
             print()
-            return buffer
+            return buffer.getvalue()
+
+        from rich import live as Live
+        from rich.markdown import Markdown
+        from rich.spinner import Spinner
 
         with Live.Live(console=self.console, auto_refresh=False) as live:
             live.update(Spinner("dots", text="Assistant is thinking..."))
 
-            buffer = ""
-            for text in response_generator:
-                buffer += text
-                live.update(Markdown("Assistant: \n" + buffer))
-                live.refresh()
+            last_render = 0.0
+            for _ in buffer.tee(response_generator):
+                now = time.monotonic()
+                if now - last_render >= RENDER_INTERVAL:
+                    live.update(Markdown("Assistant: \n" + buffer.getvalue()))
+                    live.refresh()
+                    last_render = now
 
-            live.update(Markdown("Assistant: \n" + buffer))
-        return buffer
+            live.update(Markdown("Assistant: \n" + buffer.getvalue()))
+        return buffer.getvalue()
 
     def get_user_input(self) -> str:
         if os.isatty(0):  # Check if input is coming from a terminal
@@ -53,4 +67,6 @@ class ChatUI:
             return sys.stdin.read().strip()
 
     def display_status(self, message: str):
+        from rich.panel import Panel
+
         self.console.print(Panel(message, expand=False), style="bold yellow")
@@ -0,0 +1,15 @@
+import os
+
+def get_cache_dir(*parts: str) -> str:
+    """
+    Return (and create) the Hermes cache directory, optionally a subdirectory of it.
+
+    Honors HERMES_CACHE_DIR, then XDG_CACHE_HOME, falling back to ~/.cache/hermes.
+    """
+    base = os.environ.get('HERMES_CACHE_DIR')
+    if not base:
+        xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg_cache, "hermes")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
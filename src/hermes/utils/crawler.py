@@ -0,0 +1,169 @@
+"""
+Bounded breadth-first crawler for pulling a documentation section into the context.
+
+Follows same-origin links up to a depth, fetching concurrently with a cap per host,
+skipping URLs that robots.txt disallows and pages whose canonical URL was already seen.
+Pages are yielded as they complete, until the page or total size limit is reached.
+"""
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Callable, Deque, Dict, Generator, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+from hermes.utils.html_extract import truncate_text
+
+USER_AGENT = 'hermes'
+PER_HOST_LIMIT = 4
+SKIPPED_EXTENSIONS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.pdf', '.zip', '.gz', '.tar', '.whl',
+    '.mp3', '.mp4', '.webm', '.css', '.js', '.json', '.xml', '.woff', '.woff2', '.ttf',
+)
+
+class CrawledPage(NamedTuple):
+    url: str
+    depth: int
+    content: str
+
+def canonicalize_url(url: str) -> str:
+    """Drop the fragment and default port and lowercase the scheme and host, so equal pages compare equal."""
+    parts = urlsplit(urldefrag(url)[0])
+    scheme, host = parts.scheme.lower(), (parts.hostname or '').lower()
+    netloc = host if parts.port in (None, {'http': 80, 'https': 443}.get(scheme)) else f"{host}:{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+def get_origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+class LinkExtractor(HTMLParser):
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links: List[str] = []
+        self.canonical: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag == 'base' and attributes.get('href'):
+            self.base_url = urljoin(self.base_url, attributes['href'])
+        elif tag == 'a' and attributes.get('href'):
+            self.links.append(urljoin(self.base_url, attributes['href']))
+        elif tag == 'link' and 'canonical' in (attributes.get('rel') or '').lower().split() and attributes.get('href'):
+            self.canonical = urljoin(self.base_url, attributes['href'])
+
+def extract_links(html: str, base_url: str) -> Tuple[List[str], Optional[str]]:
+    """Return the page's absolute link targets and its declared canonical URL."""
+    extractor = LinkExtractor(base_url)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.links, extractor.canonical
+
+class SiteCrawler:
+    """
+    Args:
+        fetch: Returns a URL's raw body and its converted content
+        get_robots: Returns an origin's robots.txt text, or None if it has none
+        max_depth: Link hops to follow from the start URLs
+        max_pages: Pages to fetch at most
+        max_bytes: Total size of the yielded content; the page crossing it is cut short
+        workers: Pages fetched at once
+        per_host: Pages fetched at once from any one host
+    """
+    def __init__(self, fetch: Callable[[str], Tuple[str, str]], get_robots: Callable[[str], Optional[str]],
+                 max_depth: int, max_pages: int, max_bytes: int, workers: int, per_host: int = PER_HOST_LIMIT):
+        self.fetch = fetch
+        self.get_robots = get_robots
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.per_host = per_host
+        self.seen: Set[str] = set()
+        self.robots: Dict[str, RobotFileParser] = {}
+        self.robots_lock = threading.Lock()
+
+    def is_allowed(self, url: str) -> bool:
+        origin = get_origin(url)
+        with self.robots_lock:
+            if origin not in self.robots:
+                parser = RobotFileParser()
+                try:
+                    robots = self.get_robots(origin)
+                except Exception:
+                    # An unreachable robots.txt doesn't forbid anything
+                    robots = None
+                parser.parse((robots or '').splitlines())
+                self.robots[origin] = parser
+            return self.robots[origin].can_fetch(USER_AGENT, url)
+
+    def fetch_page(self, url: str) -> Tuple[str, str]:
+        return self.fetch(url) if self.is_allowed(url) else ('', '')
+
+    def crawl(self, start_urls: List[str]) -> Generator[CrawledPage, None, None]:
+        origins = {get_origin(canonicalize_url(url)) for url in start_urls}
+        queue: Deque[Tuple[str, int]] = deque()
+        for url in map(canonicalize_url, start_urls):
+            if url not in self.seen:
+                self.seen.add(url)
+                queue.append((url, 0))
+
+        active: Dict[str, int] = {}
+        pending: Dict[Future, Tuple[str, int]] = {}
+        submitted = 0
+        remaining = self.max_bytes
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hermes-crawl") as executor:
+            try:
+                while queue or pending:
+                    # Start whatever the per-host limits allow, in breadth-first order
+                    deferred: Deque[Tuple[str, int]] = deque()
+                    while queue and len(pending) < self.workers and submitted < self.max_pages:
+                        url, depth = queue.popleft()
+                        host = urlsplit(url).netloc
+                        if active.get(host, 0) >= self.per_host:
+                            deferred.append((url, depth))
+                            continue
+                        active[host] = active.get(host, 0) + 1
+                        pending[executor.submit(self.fetch_page, url)] = (url, depth)
+                        submitted += 1
+                    queue.extendleft(reversed(deferred))
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, depth = pending.pop(future)
+                        host = urlsplit(url).netloc
+                        active[host] -= 1
+                        try:
+                            body, content = future.result()
+                        except Exception:
+                            if depth == 0:
+                                raise
+                            continue
+                        if not content:
+                            continue
+
+                        links, canonical = extract_links(body, url)
+                        if canonical is not None and canonicalize_url(canonical) != url:
+                            canonical = canonicalize_url(canonical)
+                            if canonical in self.seen:
+                                continue
+                            self.seen.add(canonical)
+                        if depth < self.max_depth:
+                            for link in map(canonicalize_url, links):
+                                if link not in self.seen and get_origin(link) in origins and not urlsplit(link).path.lower().endswith(SKIPPED_EXTENSIONS):
+                                    self.seen.add(link)
+                                    queue.append((link, depth + 1))
+
+                        size = len(content.encode('utf-8'))
+                        if size > remaining:
+                            yield CrawledPage(url, depth, truncate_text(content, remaining))
+                            return
+                        remaining -= size
+                        yield CrawledPage(url, depth, content)
+            finally:
+                for future in pending:
+                    future.cancel()
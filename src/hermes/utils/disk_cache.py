@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+class DiskCache:
+    """
+    Small SQLite-backed key/value store with a total size bound (least recently used
+    entries are evicted first) and an optional time-to-live.
+
+    Safe to share between threads; every process opening the same file sees the same entries.
+    """
+    def __init__(self, path: str, max_bytes: int, ttl: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self.connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self.evict()
+
+    def delete(self, key: str):
+        with self.lock:
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def total_size(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        if self.ttl is not None:
+            self.connection.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,))
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.connection.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
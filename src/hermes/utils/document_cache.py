@@ -0,0 +1,90 @@
+"""
+On-disk cache of the text extracted from documents, shared by everything that extracts it.
+
+Entries are keyed by a hash of the file's content and by the extractor (its library
+version and settings), so an edited file or an upgraded extractor misses while a copied
+or touched file still hits. Hashes are memoized by (path, size, mtime), so warm runs
+don't read the file at all; as with git's index, a file modified within a few seconds
+of being hashed is hashed again next time, since an edit in the same clock tick would
+leave its size and mtime unchanged. Text is stored zlib-compressed, the total bounded by
+HERMES_DOCUMENT_CACHE_MB (default 256, 0 disables the cache), least recently used first.
+"""
+import hashlib
+import os
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional
+
+from hermes.utils.cache_utils import get_cache_dir
+from hermes.utils.disk_cache import DiskCache
+
+DEFAULT_MAX_MB = 256
+# Files modified this recently when hashed aren't memoized by their size and mtime
+RACY_SECONDS = 2.0
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class DocumentCache:
+    """
+    Args:
+        cache: Store for the compressed text and the memoized hashes
+    """
+    def __init__(self, cache: DiskCache):
+        self.cache = cache
+
+    def get_digest(self, path: str) -> str:
+        """The file's content hash, reusing the last one while its size and mtime are unchanged. Raises OSError."""
+        stat = os.stat(path)
+        key = f"hash:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached.decode('ascii')
+        digest = hash_file(path)
+        if time.time() - stat.st_mtime > RACY_SECONDS:
+            self.cache.set(key, digest.encode('ascii'))
+        return digest
+
+    def get(self, digest: str, extractor: str) -> Optional[str]:
+        cached = self.cache.get(f"text:{extractor}:{digest}")
+        return zlib.decompress(cached).decode('utf-8') if cached is not None else None
+
+    def set(self, digest: str, extractor: str, text: str):
+        self.cache.set(f"text:{extractor}:{digest}", zlib.compress(text.encode('utf-8')))
+
+    def get_or_extract(self, path: str, extractor: str, extract: Callable[[], str]) -> str:
+        """The cached text for the file's current content, else extract() stored for next time."""
+        try:
+            digest = self.get_digest(path)
+        except OSError:
+            # Missing or unreadable: let the extractor report it
+            return extract()
+        text = self.get(digest, extractor)
+        if text is None:
+            text = extract()
+            self.set(digest, extractor, text)
+        return text
+
+_caches: Dict[str, DocumentCache] = {}
+_caches_lock = threading.Lock()
+
+def get_document_cache() -> Optional[DocumentCache]:
+    """The cache in the current cache directory, opened once per process; None if disabled or unavailable."""
+    max_bytes = int(float(os.environ.get('HERMES_DOCUMENT_CACHE_MB') or DEFAULT_MAX_MB) * 1024 * 1024)
+    if max_bytes <= 0:
+        return None
+    with _caches_lock:
+        try:
+            path = os.path.join(get_cache_dir(), 'documents.sqlite')
+            if path not in _caches:
+                _caches[path] = DocumentCache(DiskCache(path, max_bytes))
+        except Exception:
+            # A read-only or corrupt cache shouldn't stop documents from being read
+            return None
+        return _caches[path]
@@ -0,0 +1,101 @@
+"""
+One read of a file, shared by everything that looks at it during a run.
+
+The file walker, the file processors and the prompt builders all ask for a file's
+snapshot instead of opening it themselves. A snapshot is read once and memoized by
+(path, mtime, size), so a file attached to every task of a workflow, or sniffed for
+binary content and then read, costs one read; its text and hash are worked out on first
+use and kept. A file modified within a couple of seconds of being read isn't memoized,
+since an edit in the same clock tick would leave its mtime and size unchanged.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+SNIFF_SIZE = 8192
+# Total size of the memoized snapshots; the least recently used are dropped past it
+MAX_SNAPSHOT_BYTES = 128 * 1024 * 1024
+# Files modified this recently when read aren't memoized
+RACY_SECONDS = 2.0
+
+def is_binary_data(sample: bytes) -> bool:
+    if b'\x00' in sample:
+        return True
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still text
+        return e.start < len(sample) - 3
+    return False
+
+class FileSnapshot:
+    """A file's content as read once; text, binary and digest are computed on first use."""
+    def __init__(self, path: str, data: bytes, mtime_ns: int):
+        self.path = path
+        self.data = data
+        self.mtime_ns = mtime_ns
+        self._text: Optional[str] = None
+        self._binary: Optional[bool] = None
+        self._digest: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        """The content decoded as UTF-8. Raises UnicodeDecodeError, leaving it to callers how to handle other encodings."""
+        if self._text is None:
+            self._text = self.data.decode('utf-8')
+        return self._text
+
+    @property
+    def binary(self) -> bool:
+        if self._binary is None:
+            self._binary = is_binary_data(self.data[:SNIFF_SIZE])
+        return self._binary
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the content, in hex."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+_snapshots: 'OrderedDict[str, FileSnapshot]' = OrderedDict()
+_snapshots_size = 0
+_snapshots_lock = threading.Lock()
+
+def get_snapshot(path: str) -> FileSnapshot:
+    """The file's snapshot, read now unless the memoized one is still current. Raises OSError."""
+    global _snapshots_size
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and (snapshot.mtime_ns, snapshot.size) == (stat.st_mtime_ns, stat.st_size):
+            _snapshots.move_to_end(key)
+            return snapshot
+
+    with open(key, 'rb') as f:
+        data = f.read()
+    snapshot = FileSnapshot(path, data, stat.st_mtime_ns)
+    if time.time() - stat.st_mtime > RACY_SECONDS and len(data) <= MAX_SNAPSHOT_BYTES:
+        with _snapshots_lock:
+            previous = _snapshots.pop(key, None)
+            _snapshots_size -= previous.size if previous is not None else 0
+            _snapshots[key] = snapshot
+            _snapshots_size += snapshot.size
+            while _snapshots_size > MAX_SNAPSHOT_BYTES:
+                _, evicted = _snapshots.popitem(last=False)
+                _snapshots_size -= evicted.size
+    return snapshot
+
+def clear_snapshots():
+    global _snapshots_size
+    with _snapshots_lock:
+        _snapshots.clear()
+        _snapshots_size = 0
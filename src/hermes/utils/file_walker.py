@@ -0,0 +1,263 @@
+"""
+Expands file arguments (files, directories and glob patterns) into the files to attach.
+
+Directories are walked in sorted order, honoring .gitignore files and skipping VCS and
+dependency directories, hidden entries, lockfiles, minified bundles, binary files and
+files over a size limit. Files named explicitly are always kept. Files are then read and
+decoded on a thread pool, until a total byte budget is used up; the files past it are
+never read. The reads are memoized file snapshots, which the file processors reuse.
+"""
+import glob
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Counter as CounterType, List, NamedTuple, Optional, Tuple
+
+from hermes.utils.file_snapshot import get_snapshot
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+SKIPPED_DIRECTORIES = {
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox', '.nox',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache', '.idea', '.vscode',
+}
+SKIPPED_FILES = {
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'Pipfile.lock', 'Cargo.lock',
+    'composer.lock', 'Gemfile.lock', 'go.sum', 'uv.lock', '.DS_Store',
+}
+SKIPPED_SUFFIXES = ('.min.js', '.min.css', '.map', '.pyc', '.pyo', '.so', '.dll', '.dylib', '.class', '.o')
+# Binary formats the file processors extract text from
+DOCUMENT_EXTENSIONS = {'.pdf', '.docx'}
+
+class GitIgnore:
+    """The patterns of one .gitignore, matched against paths relative to its directory."""
+    def __init__(self, directory: str, lines: List[str]):
+        self.directory = directory
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip(' ')
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated or line.startswith('\\'):
+                line = line[1:]
+            directory_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            pattern = translate_gitignore_pattern(line.lstrip('/'))
+            self.rules.append((re.compile(('^' if anchored else '(?:^|.*/)') + pattern + '$'), negated, directory_only))
+
+    @classmethod
+    def load(cls, directory: str) -> Optional['GitIgnore']:
+        try:
+            with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                return cls(directory, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a ! pattern, None if no pattern applies."""
+        relative = os.path.relpath(path, self.directory).replace(os.sep, '/')
+        result = None
+        for regex, negated, directory_only in self.rules:
+            if (is_dir or not directory_only) and regex.match(relative):
+                result = not negated
+        return result
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    parts, index = [], 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif pattern.startswith('/**', index) and index + 3 == len(pattern):
+            parts.append('/.*')
+            index += 3
+        elif pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+        elif char == '*':
+            parts.append('[^/]*')
+            index += 1
+        elif char == '?':
+            parts.append('[^/]')
+            index += 1
+        elif char == '[' and ']' in pattern[index + 1:]:
+            end = pattern.index(']', index + 1)
+            body = pattern[index + 1:end]
+            parts.append('[' + ('^' + body[1:] if body.startswith('!') else body) + ']')
+            index = end + 1
+        else:
+            parts.append(re.escape(char))
+            index += 1
+    return ''.join(parts)
+
+def split_glob(pattern: str) -> Tuple[str, re.Pattern, Optional[int]]:
+    """
+    Split a glob into the directory to walk, a regex for paths relative to it (** spans directories)
+    and how many path segments deep its matches are, None if ** makes that unbounded.
+    """
+    parts = pattern.replace(os.sep, '/').split('/')
+    index = next(index for index, part in enumerate(parts) if glob.has_magic(part))
+    base = '/'.join(parts[:index])
+    depth = None if any('**' in part for part in parts[index:]) else len(parts) - index
+    return (base or ('/' if pattern.startswith('/') else '')), re.compile('^' + translate_gitignore_pattern('/'.join(parts[index:])) + '$'), depth
+
+def is_ignored(gitignores: List[GitIgnore], path: str, is_dir: bool) -> bool:
+    ignored = False
+    for gitignore in gitignores:
+        result = gitignore.match(path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+class WalkedFile(NamedTuple):
+    path: str
+    explicit: bool
+    size: int
+
+class LoadedFile(NamedTuple):
+    path: str
+    size: int
+    text: Optional[str]
+
+class FileWalker:
+    """
+    Args:
+        use_gitignore: Skip files matched by .gitignore files in walked directories
+        max_file_size: Skip walked files larger than this many bytes
+        max_total_bytes: Stop adding files once their total size would exceed this
+        workers: Files read at once
+    """
+    def __init__(self, use_gitignore: bool = True, max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+                 max_total_bytes: Optional[int] = None, workers: int = DEFAULT_WORKERS):
+        self.use_gitignore = use_gitignore
+        self.max_file_size = max_file_size
+        self.max_total_bytes = max_total_bytes
+        self.workers = workers
+        self.skipped: CounterType[str] = Counter()
+        self.walk_seconds = 0.0
+        self.read_seconds = 0.0
+
+    def expand(self, arguments: List[str]) -> List[WalkedFile]:
+        start = time.perf_counter()
+        files: List[WalkedFile] = []
+        seen = set()
+
+        def add(path: str, explicit: bool, size: int):
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                files.append(WalkedFile(path, explicit, size))
+
+        for argument in arguments:
+            if os.path.isdir(argument):
+                for path, size in self.walk(argument):
+                    if self.keep_file(size):
+                        add(path, False, size)
+            elif glob.has_magic(argument) and not os.path.exists(argument):
+                base, regex, depth = split_glob(argument)
+                for path, size in self.walk(base or os.curdir, depth):
+                    relative = os.path.relpath(path, base or os.curdir)
+                    if regex.match(relative.replace(os.sep, '/')) and self.keep_file(size):
+                        add(path if base else relative, False, size)
+            else:
+                # Named explicitly: kept as given, even if missing (the file processor reports it)
+                add(argument, True, os.path.getsize(argument) if os.path.isfile(argument) else 0)
+        self.walk_seconds = time.perf_counter() - start
+        return files
+
+    def walk(self, top: str, max_depth: Optional[int] = None):
+        """Yield (path, size) of the kept files below top, at most max_depth path segments deep."""
+        gitignores: List[Tuple[str, GitIgnore]] = []
+        for directory, dirnames, filenames in os.walk(top):
+            if max_depth is not None:
+                relative = os.path.relpath(directory, top)
+                level = 0 if relative == os.curdir else relative.count(os.sep) + 1
+                if level + 1 >= max_depth:
+                    # Files here are as deep as the glob reaches, so don't descend further
+                    dirnames[:] = []
+            # Drop the .gitignore files of directories we've left
+            gitignores = [(owner, gitignore) for owner, gitignore in gitignores if directory == owner or directory.startswith(owner.rstrip(os.sep) + os.sep)]
+            if self.use_gitignore:
+                gitignore = GitIgnore.load(directory)
+                if gitignore is not None:
+                    gitignores.append((directory, gitignore))
+            active = [gitignore for _, gitignore in gitignores]
+
+            kept = []
+            for name in sorted(dirnames):
+                if name in SKIPPED_DIRECTORIES or name.startswith('.'):
+                    self.skipped['ignored directory'] += 1
+                elif active and is_ignored(active, os.path.join(directory, name), True):
+                    self.skipped['gitignored'] += 1
+                else:
+                    kept.append(name)
+            dirnames[:] = kept
+
+            for name in sorted(filenames):
+                path = os.path.join(directory, name)
+                if name.startswith('.') or name in SKIPPED_FILES or name.endswith(SKIPPED_SUFFIXES):
+                    self.skipped['ignored file'] += 1
+                elif active and is_ignored(active, path, False):
+                    self.skipped['gitignored'] += 1
+                else:
+                    try:
+                        size = os.path.getsize(path)
+                    except OSError:
+                        continue
+                    yield path, size
+
+    def keep_file(self, size: int) -> bool:
+        if size > self.max_file_size:
+            self.skipped['too large'] += 1
+            return False
+        return True
+
+    def load(self, arguments: List[str]) -> List[LoadedFile]:
+        """Expand the arguments, then read and decode the files within the budget in parallel, keeping their order."""
+        files = self.expand(arguments)
+        start = time.perf_counter()
+        selected, total = [], 0
+        for index, walked in enumerate(files):
+            if self.max_total_bytes is not None and total + walked.size > self.max_total_bytes:
+                self.skipped['over budget'] += len(files) - index
+                break
+            selected.append(walked)
+            total += walked.size
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hermes-files") as executor:
+            loaded = list(executor.map(self.read, selected))
+        self.read_seconds = time.perf_counter() - start
+
+        kept = []
+        for walked, result in zip(selected, loaded):
+            if result is None:
+                self.skipped['binary'] += 1
+            else:
+                kept.append(result)
+        return kept
+
+    def read(self, walked: WalkedFile) -> Optional[LoadedFile]:
+        """Read and decode a file; None for a walked binary file. Documents are left to the file processor."""
+        if not os.path.isfile(walked.path) or os.path.splitext(walked.path)[1].lower() in DOCUMENT_EXTENSIONS:
+            return LoadedFile(walked.path, walked.size, None)
+        snapshot = get_snapshot(walked.path)
+        if snapshot.binary:
+            return LoadedFile(walked.path, walked.size, None) if walked.explicit else None
+        try:
+            text = snapshot.text
+        except UnicodeDecodeError:
+            # Invalid UTF-8 past the sniffed sample; keep the rest of the file readable
+            text = snapshot.data.decode('utf-8', errors='replace')
+        return LoadedFile(walked.path, snapshot.size, text)
+
+    def summary(self, files: List[LoadedFile]) -> str:
+        skipped = ', '.join(f"{count} {reason}" for reason, count in sorted(self.skipped.items()))
+        return (
+            f"Files: {len(files)} included ({sum(file.size for file in files) / 1024:,.0f} KiB)"
+            f"{', skipped ' + skipped if skipped else ''}; walked in {self.walk_seconds * 1000:.0f}ms, read in {self.read_seconds * 1000:.0f}ms"
+        )
@@ -0,0 +1,182 @@
+"""
+Single-pass extraction of a web page's readable content, ahead of markdown conversion.
+
+Scripts, styles, inline SVG and other non-content elements are always dropped, as are
+navigation, headers, footers, sidebars and forms. When the page marks its main content
+(<main>, <article> or role="main") only that is kept; otherwise the rest of the body is.
+The page is fed to the parser in slices, and parsing stops as soon as max_bytes of
+content have been collected, so the tail of a huge page is never parsed.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from markdownify import markdownify as md
+
+URL_MODES = ['full', 'main', 'text']
+FEED_SIZE = 64 * 1024
+TRUNCATION_NOTE = "\n\n[Truncated]"
+
+SKIP_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'svg', 'math', 'canvas', 'iframe', 'object', 'embed', 'select'}
+BOILERPLATE_TAGS = {'nav', 'header', 'footer', 'aside', 'form', 'button', 'dialog'}
+BOILERPLATE_ROLES = {'navigation', 'banner', 'contentinfo', 'complementary', 'search', 'dialog'}
+MAIN_TAGS = {'main', 'article'}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+BLOCK_TAGS = {
+    'address', 'blockquote', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul', 'main', 'article',
+}
+KEPT_ATTRIBUTES = {'href', 'src', 'alt', 'title'}
+# Removed with one regex pass before parsing, which is far cheaper than parsing them tag by tag
+PRESTRIP_PATTERN = re.compile(r'<!--.*?-->|<(script|style|svg|noscript|template|math)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+# Start tags that implicitly close an open element of the same kind, as in <li>one<li>two
+IMPLIED_END_TAGS = {'li': {'li'}, 'dt': {'dt', 'dd'}, 'dd': {'dt', 'dd'}, 'tr': {'tr', 'td', 'th'}, 'td': {'td', 'th'}, 'th': {'td', 'th'}}
+
+class StopParsing(Exception):
+    pass
+
+class ContentExtractor(HTMLParser):
+    """
+    Collects either simplified HTML (for markdownify) or plain text, for the whole page
+    and, separately, for its main content.
+
+    Args:
+        as_text: Produce plain text instead of HTML
+        max_bytes: Stop parsing once this much content has been collected
+    """
+    def __init__(self, as_text: bool = False, max_bytes: Optional[int] = None):
+        super().__init__(convert_charrefs=True)
+        self.as_text = as_text
+        self.max_bytes = max_bytes
+        self.stack: List[str] = []
+        self.skipping = 0
+        self.in_main = 0
+        self.found_main = False
+        self.page_parts: List[str] = []
+        self.main_parts: List[str] = []
+        self.page_size = 0
+        self.main_size = 0
+        self.pre = 0
+
+    @property
+    def done(self) -> bool:
+        if self.max_bytes is None:
+            return False
+        return self.main_size >= self.max_bytes if self.found_main else self.page_size >= self.max_bytes
+
+    def run(self, html: str) -> str:
+        html = PRESTRIP_PATTERN.sub('', html)
+        try:
+            for start in range(0, len(html), FEED_SIZE):
+                self.feed(html[start:start + FEED_SIZE])
+            self.close()
+        except StopParsing:
+            pass
+        return ''.join(self.main_parts if self.main_size else self.page_parts)
+
+    def emit(self, markup: str, size: int = 0):
+        if self.in_main:
+            self.main_parts.append(markup)
+            self.main_size += size
+        if self.max_bytes is None or self.page_size < self.max_bytes:
+            self.page_parts.append(markup)
+            self.page_size += size
+        if size and self.done:
+            raise StopParsing()
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag == 'body':
+            # An unclosed <head> must not swallow the page
+            self.handle_endtag('head')
+        if self.stack:
+            open_tag = self.stack[-1].split(' ')[0]
+            if open_tag in IMPLIED_END_TAGS.get(tag, ()) or (open_tag == 'p' and tag in BLOCK_TAGS):
+                self.handle_endtag(open_tag)
+        if tag in VOID_TAGS:
+            if not self.skipping:
+                self.emit_tag(tag, attributes)
+            return
+
+        if self.skipping or tag in SKIP_TAGS or tag in BOILERPLATE_TAGS or attributes.get('role') in BOILERPLATE_ROLES:
+            kind = 'skip'
+            self.skipping += 1
+        elif tag in MAIN_TAGS or attributes.get('role') == 'main':
+            kind = 'main'
+            self.in_main += 1
+            self.found_main = True
+        else:
+            kind = ''
+        self.stack.append(f"{tag} {kind}")
+        if tag == 'pre':
+            self.pre += 1
+        if kind != 'skip':
+            self.emit_tag(tag, attributes)
+
+    def handle_endtag(self, tag):
+        # Close everything opened since the matching start tag, tolerating unclosed <p>, <li>...
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index].split(' ')[0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > index:
+            open_tag, kind = self.stack.pop().split(' ')
+            if kind == 'skip':
+                self.skipping -= 1
+                continue
+            if kind == 'main':
+                self.in_main -= 1
+            if open_tag == 'pre':
+                self.pre -= 1
+            if self.as_text:
+                if open_tag in BLOCK_TAGS:
+                    self.emit('\n\n')
+            else:
+                self.emit(f"</{open_tag}>")
+            if kind == 'main':
+                # Keep separate articles apart when they are joined
+                self.emit('\n')
+
+    def emit_tag(self, tag: str, attributes):
+        if self.as_text:
+            if tag == 'br':
+                self.emit('\n')
+            elif tag in BLOCK_TAGS:
+                self.emit('\n\n' + ('- ' if tag == 'li' else ''))
+            return
+        kept = ''.join(f' {name}="{escape(value)}"' for name, value in attributes.items() if name in KEPT_ATTRIBUTES and value)
+        self.emit(f"<{tag}{kept}>")
+
+    def handle_data(self, data):
+        if self.skipping:
+            return
+        text = data if self.pre else re.sub(r'\s+', ' ', data)
+        self.emit(text if self.as_text else escape(text, quote=False), len(text.encode('utf-8')))
+
+def truncate_text(text: str, max_bytes: Optional[int]) -> str:
+    encoded = text.encode('utf-8')
+    if max_bytes is None or len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode('utf-8', errors='ignore').rstrip() + TRUNCATION_NOTE
+
+def clean_text(text: str) -> str:
+    # Collapsed whitespace leaves at most one stray leading space; deeper indentation is from <pre>
+    lines = [(line[1:] if line.startswith(' ') and not line.startswith('  ') else line).rstrip() for line in text.splitlines()]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip() + '\n'
+
+def extract_content(html: str, mode: str = 'main', max_bytes: Optional[int] = None) -> str:
+    """
+    Convert a page for the prompt.
+
+    :param html: The page's HTML
+    :param mode: 'full' converts the whole page to markdown, 'main' only its main content,
+                 'text' returns the main content as plain text without running markdownify
+    :param max_bytes: Cap on the size of the result, which is cut and marked if longer
+    """
+    if mode == 'full':
+        return truncate_text(md(html, heading_style="ATX"), max_bytes)
+    content = ContentExtractor(as_text=mode == 'text', max_bytes=max_bytes).run(html)
+    converted = clean_text(content) if mode == 'text' else md(content, heading_style="ATX")
+    return truncate_text(converted, max_bytes)
@@ -0,0 +1,126 @@
+"""
+On-disk cache of fetched web pages, storing both the raw response and its converted text.
+
+Freshness follows the response's Cache-Control max-age (or Expires), unless overridden
+with a fixed max age. Stale pages with an ETag or Last-Modified are revalidated with a
+conditional GET; a 304 reuses the stored conversion. The total size is bounded by
+HERMES_URL_CACHE_MB (default 128), least recently used pages going first.
+"""
+import json
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from hermes.utils.cache_utils import get_cache_dir
+from hermes.utils.disk_cache import DiskCache
+
+DEFAULT_MAX_MB = 128
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+def get_freshness_lifetime(headers) -> Optional[float]:
+    """Seconds the response may be used without revalidation, or None if the server didn't say."""
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+    for name in ('s-maxage', 'max-age'):
+        if (directives.get(name) or '').isdigit():
+            return float(directives[name])
+    expires, date = parse_http_date(headers.get('Expires')), parse_http_date(headers.get('Date'))
+    if expires is not None:
+        return max(expires - (date or time.time()), 0)
+    return None
+
+class HTTPCacheEntry(NamedTuple):
+    url: str
+    body: str
+    content: str
+    content_type: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    lifetime: Optional[float]
+    # Settings content was converted with; other settings reconvert body without fetching
+    conversion: str = ''
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        lifetime = max_age if max_age is not None else self.lifetime
+        return lifetime is not None and time.time() - self.stored_at <= lifetime
+
+    def validator_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class HTTPCache:
+    """
+    Args:
+        cache: Store for the entries, keyed by URL
+        max_age: Seconds a stored page counts as fresh, overriding the response headers
+        offline: Serve stored pages whatever their age and never touch the network
+    """
+    def __init__(self, cache: DiskCache, max_age: Optional[float] = None, offline: bool = False):
+        self.cache = cache
+        self.max_age = max_age
+        self.offline = offline
+
+    def get(self, url: str) -> Optional[HTTPCacheEntry]:
+        cached = self.cache.get(url)
+        return HTTPCacheEntry(**json.loads(cached)) if cached is not None else None
+
+    def store(self, url: str, response: Any, content: str, conversion: str = '') -> Optional[HTTPCacheEntry]:
+        if 'no-store' in parse_cache_control(response.headers.get('Cache-Control')):
+            return None
+        entry = HTTPCacheEntry(
+            url=url,
+            body=response.text,
+            content=content,
+            content_type=response.headers.get('Content-Type'),
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            stored_at=self.received_at(response),
+            lifetime=get_freshness_lifetime(response.headers),
+            conversion=conversion,
+        )
+        self.put(entry)
+        return entry
+
+    def refresh(self, entry: HTTPCacheEntry, response: Any) -> HTTPCacheEntry:
+        """Restart a revalidated entry's freshness, taking any updated headers from the 304."""
+        headers = response.headers
+        lifetime = get_freshness_lifetime(headers) if 'Cache-Control' in headers or 'Expires' in headers else entry.lifetime
+        entry = entry._replace(
+            etag=headers.get('ETag') or entry.etag,
+            last_modified=headers.get('Last-Modified') or entry.last_modified,
+            stored_at=self.received_at(response),
+            lifetime=lifetime,
+        )
+        self.put(entry)
+        return entry
+
+    def put(self, entry: HTTPCacheEntry):
+        self.cache.set(entry.url, json.dumps(entry._asdict()).encode('utf-8'))
+
+    def received_at(self, response: Any) -> float:
+        age = response.headers.get('Age', '')
+        return time.time() - (float(age) if age.isdigit() else 0)
+
+def open_url_cache(max_age: Optional[float] = None, offline: bool = False) -> HTTPCache:
+    max_bytes = int(float(os.environ.get('HERMES_URL_CACHE_MB') or DEFAULT_MAX_MB) * 1024 * 1024)
+    return HTTPCache(DiskCache(os.path.join(get_cache_dir(), 'urls.sqlite'), max_bytes), max_age, offline)
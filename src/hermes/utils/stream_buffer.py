@@ -0,0 +1,29 @@
+from typing import Generator, Iterable, List
+
+class StreamBuffer:
+    """
+    Accumulates streamed response chunks in linear time.
+
+    Chunks are kept by reference and only joined when the text is read, instead of copying
+    the whole response on every `+=`. Reading compacts the chunks into one string, so
+    repeated reads without new chunks cost nothing.
+    """
+    def __init__(self):
+        self.chunks: List[str] = []
+
+    def append(self, chunk: str):
+        self.chunks.append(chunk)
+
+    def tee(self, chunks: Iterable[str]) -> Generator[str, None, None]:
+        """Yield chunks through unchanged while recording them."""
+        for chunk in chunks:
+            self.append(chunk)
+            yield chunk
+
+    def getvalue(self) -> str:
+        if len(self.chunks) != 1:
+            self.chunks = [''.join(self.chunks)]
+        return self.chunks[0]
+
+    def __str__(self) -> str:
+        return self.getvalue()
@@ -23,6 +23,8 @@ class WorkflowExecutor:
     def execute(self) -> Dict[str, Any]:
         """Execute the workflow and return the final context."""
         self.model.initialize()
+        # Each run is its own conversation, even when the model is reused across runs
+        self.context.set_global('chat_session', self.model.new_session())
 
         result = self.root_task.execute(self.context)
         self.context.task_contexts[self.root_task.task_id] = result
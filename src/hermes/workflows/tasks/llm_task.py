@@ -4,6 +4,7 @@ from ...chat_models.base import ChatModel
 from ...workflows.context import WorkflowContext
 from ...utils.file_utils import process_file_name
 from ...prompt_builders.base import PromptBuilder
+from ...utils.stream_buffer import StreamBuffer
 
 class LLMTask(Task):
     def __init__(self, task_id: str, task_config: Dict[str, Any], model: ChatModel, printer: Callable[[str], None]):
@@ -40,16 +41,24 @@ class LLMTask(Task):
         full_message = prompt_builder.build_prompt()
 
         # Send the message to the model and collect the response
-        response = ""
-        for chunk in self.model.send_message(full_message):
+        # Isolated tasks get a fresh session on the shared model instead of joining the workflow's conversation
+        session = context.get_global('chat_session')
+        if self.get_config('isolated_session', False):
+            responses = self.model.new_session().send_message(full_message)
+        elif session is not None:
+            responses = session.send_message(full_message)
+        else:
+            responses = self.model.send_message(full_message)
+
+        response = StreamBuffer()
+        for chunk in response.tee(responses):
             if self.print_output:
                 self.printer(chunk, end='')
-            response += chunk
         if self.print_output:
             self.printer("\n")
 
         return {
-            'response': response,
+            'response': response.getvalue(),
             'prompt': prompt,
             'full_message': full_message
         }
@@ -1,12 +1,17 @@
 import os
 from typing import Any, Dict, Callable
 
+import pdfminer
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import LTChar, LTTextContainer
 
+from hermes.utils.document_cache import get_document_cache
 from ..context import WorkflowContext
 from .base import Task
 
+# Part of the document cache key; bump when a change here alters the markdown
+MARKDOWN_VERSION = 1
+
 
 class MarkdownExtractionTask(Task):
     def __init__(self, task_id: str, task_config: Dict[str, Any], printer: Callable[[str], None]):
@@ -30,6 +35,13 @@ class MarkdownExtractionTask(Task):
         }
 
     def pdf_to_markdown(self, pdf_path):
+        cache = get_document_cache()
+        if cache is None:
+            return self.extract_markdown(pdf_path)
+        extractor = f"pdf-markdown/{MARKDOWN_VERSION}/pdfminer-{pdfminer.__version__}"
+        return cache.get_or_extract(pdf_path, extractor, lambda: self.extract_markdown(pdf_path))
+
+    def extract_markdown(self, pdf_path):
         markdown_lines = []
         for page_layout in extract_pages(pdf_path):
             for element in page_layout:
@@ -0,0 +1,68 @@
+"""Local stand-in for the Anthropic Messages API that records requests and streams a canned reply."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+class AnthropicStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(body)
+        cached = any(
+            isinstance(message['content'], list) and any('cache_control' in block for block in message['content'])
+            for message in body['messages']
+        )
+        seen_before = cached and self.server.cache_written
+        self.server.cache_written = self.server.cache_written or cached
+        usage = {
+            'input_tokens': 10,
+            'output_tokens': 1,
+            'cache_creation_input_tokens': 2000 if cached and not seen_before else 0,
+            'cache_read_input_tokens': 2000 if seen_before else 0,
+        }
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        events = [
+            ('message_start', {'type': 'message_start', 'message': {
+                'id': 'msg_stub', 'type': 'message', 'role': 'assistant', 'model': body['model'],
+                'content': [], 'stop_reason': None, 'stop_sequence': None, 'usage': usage}}),
+            ('content_block_start', {'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}}),
+        ]
+        events += [
+            ('content_block_delta', {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text}})
+            for text in self.server.reply
+        ]
+        events += [
+            ('content_block_stop', {'type': 'content_block_stop', 'index': 0}),
+            ('message_delta', {'type': 'message_delta', 'delta': {'stop_reason': 'end_turn', 'stop_sequence': None}, 'usage': {'output_tokens': 5}}),
+            ('message_stop', {'type': 'message_stop'}),
+        ]
+        for event, data in events:
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+class AnthropicStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, reply: List[str]):
+        super().__init__(('127.0.0.1', 0), AnthropicStubHandler)
+        self.reply = reply
+        self.requests: List[Dict[str, Any]] = []
+        self.cache_written = False
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
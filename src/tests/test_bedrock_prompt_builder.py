@@ -1,7 +1,8 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from hermes.prompt_builders.bedrock_prompt_builder import BedrockPromptBuilder
 from hermes.file_processors.base import FileProcessor
+from hermes.utils.file_snapshot import FileSnapshot
 
 @pytest.fixture
 def mock_file_processor():
@@ -20,26 +21,37 @@ def test_add_text_with_name(bedrock_prompt_builder):
     assert bedrock_prompt_builder.contents == [{'text': 'greeting:\nHello, world!\n'}]
 
 def test_add_file_binary(bedrock_prompt_builder, mock_file_processor):
-    with patch('hermes.prompt_builders.bedrock_prompt_builder.is_binary', return_value=True):
-        mock_file_processor.read_file.return_value = b'binary_content'
-        bedrock_prompt_builder.add_file('test.pdf', 'test_doc')
-        assert bedrock_prompt_builder.contents == [{
-            'document': {
-                'format': 'pdf',
-                'name': 'test_doc',
-                'source': {
-                    'bytes': b'binary_content'
-                }
+    snapshot = FileSnapshot('test.pdf', b'binary\x00content', 0)
+    mock_file_processor.get_snapshot.return_value = snapshot
+    bedrock_prompt_builder.add_file('test.pdf', 'test_doc')
+    assert bedrock_prompt_builder.contents == [{
+        'document': {
+            'format': 'pdf',
+            'name': 'test_doc',
+            'source': {
+                'bytes': b'binary\x00content'
             }
-        }]
+        }
+    }]
+    # The snapshot's bytes are sent as they are, not read again
+    assert bedrock_prompt_builder.contents[0]['document']['source']['bytes'] is snapshot.data
+    mock_file_processor.read_file.assert_not_called()
 
 def test_add_file_text(bedrock_prompt_builder, mock_file_processor):
-    with patch('hermes.prompt_builders.bedrock_prompt_builder.is_binary', return_value=False):
-        mock_file_processor.read_file.return_value = b'text_content'
-        bedrock_prompt_builder.add_file('test.txt', 'test_doc')
-        assert bedrock_prompt_builder.contents == [{
-            'text': '<document name="test_doc">text_content</document>'
-        }]
+    mock_file_processor.get_snapshot.return_value = FileSnapshot('test.txt', b'text_content', 0)
+    bedrock_prompt_builder.add_file('test.txt', 'test_doc')
+    assert bedrock_prompt_builder.contents == [{
+        'text': '<document name="test_doc">text_content</document>'
+    }]
+    mock_file_processor.read_file.assert_not_called()
+
+def test_add_missing_file(bedrock_prompt_builder, mock_file_processor):
+    mock_file_processor.get_snapshot.return_value = None
+    mock_file_processor.read_file.return_value = b'empty'
+    bedrock_prompt_builder.add_file('missing.txt', 'test_doc')
+    assert bedrock_prompt_builder.contents == [{
+        'text': '<document name="test_doc">empty</document>'
+    }]
 
 def test_add_image(bedrock_prompt_builder, mock_file_processor):
     mock_file_processor.read_file.return_value = b'image_content'
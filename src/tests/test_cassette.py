@@ -0,0 +1,74 @@
+import configparser
+import os
+import tempfile
+import time
+import unittest
+
+from hermes.chat_models.cassette import RecordingChatModel, ReplayChatModel, load_cassette
+from hermes.chat_models.fake import FakeModel
+from hermes.model_registry import create_model
+
+def fake_model(reply, chunks_per_second=0):
+    config = configparser.ConfigParser()
+    config.read_dict({'FAKE': {'reply': reply, 'chunk_size': '3', 'chunks_per_second': str(chunks_per_second)}})
+    return FakeModel(config)
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'session.jsonl')
+
+    def record_conversation(self, reply, chunks_per_second=0):
+        session = RecordingChatModel(fake_model(reply, chunks_per_second), self.path).new_session()
+        list(session.send_message('First'))
+        list(session.send_message('Second'))
+        return session
+
+    def test_records_requests_and_timed_chunks(self):
+        self.record_conversation('abcdefg')
+
+        first, second = load_cassette(self.path)
+        self.assertEqual(first['messages'], [{'role': 'user', 'content': 'First'}])
+        self.assertEqual([chunk for _, chunk in first['chunks']], ['abc', 'def', 'g'])
+        self.assertEqual(first['params'], {'model': 'fake'})
+        self.assertEqual(first['provider'], 'hermes.chat_models.fake.FakeModel')
+        self.assertIn('output_tokens', first['usage'])
+        self.assertEqual(len(second['messages']), 3)
+
+    def test_replay_matches_requests_and_falls_back_to_order(self):
+        self.record_conversation('abcdefg')
+        model = ReplayChatModel(fake_model('unused'), load_cassette(self.path))
+
+        session = model.new_session()
+        self.assertEqual(list(session.send_message('First')), ['abc', 'def', 'g'])
+        self.assertEqual(list(model.new_session().send_message('Edited prompt')), ['abc', 'def', 'g'])
+        self.assertEqual((model.matched, model.unmatched), (1, 1))
+        with self.assertRaises(LookupError):
+            list(session.send_message('Second'))
+
+    def test_replay_at_recorded_speed(self):
+        self.record_conversation('abcdefghi', chunks_per_second=50)
+        recorded = load_cassette(self.path)[0]['chunks'][-1][0]
+
+        fast, paced = (ReplayChatModel(fake_model('unused'), load_cassette(self.path), speed) for speed in (0, 1))
+        start = time.perf_counter()
+        list(fast.send_message('First'))
+        fast_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        list(paced.send_message('First'))
+        paced_seconds = time.perf_counter() - start
+
+        self.assertGreaterEqual(paced_seconds, recorded)
+        self.assertLess(fast_seconds, recorded)
+
+    def test_replay_needs_no_provider_credentials(self):
+        self.record_conversation('abc')
+        config = configparser.ConfigParser()
+        config.read_dict({'CASSETTE': {'replay': self.path}})
+        model = create_model('openai', config)
+        model.initialize()
+        self.assertEqual(list(model.send_message('First')), ['abc'])
+
+if __name__ == '__main__':
+    unittest.main()
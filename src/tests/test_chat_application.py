@@ -10,6 +10,7 @@ class TestChatApplication(unittest.TestCase):
         self.prompt_builder = MagicMock()
         self.special_command_prompts = MagicMock()
         self.context_orchestrator = MagicMock()
+        self.session = self.model.new_session.return_value
         self.app = ChatApplication(self.model, self.ui, self.file_processor, self.prompt_builder, self.special_command_prompts, self.context_orchestrator)
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -21,7 +22,7 @@ class TestChatApplication(unittest.TestCase):
         self.context_orchestrator.build_prompt.assert_called_once_with(self.prompt_builder)
         self.prompt_builder.add_text.assert_called_once_with(initial_prompt)
         self.prompt_builder.build_prompt.assert_called_once()
-        self.model.send_message.assert_called_once()
+        self.session.send_message.assert_called_once()
         self.ui.display_response.assert_called_once()
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -29,7 +30,7 @@ class TestChatApplication(unittest.TestCase):
         self.ui.get_user_input.side_effect = ["User input", "exit"]
         self.app.run()
         self.model.initialize.assert_called_once()
-        self.assertEqual(self.model.send_message.call_count, 1)
+        self.assertEqual(self.session.send_message.call_count, 1)
         self.assertEqual(self.ui.display_response.call_count, 1)
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -41,7 +42,7 @@ class TestChatApplication(unittest.TestCase):
             call("Test"),
             call(self.special_command_prompts['append'].format(file_name='output.txt'))
         ])
-        self.model.send_message.assert_called_once()
+        self.session.send_message.assert_called_once()
         self.ui.display_response.assert_called_once()
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -53,7 +54,7 @@ class TestChatApplication(unittest.TestCase):
             call("Test"),
             call(self.special_command_prompts['update'].format(file_name='output.txt'))
         ])
-        self.model.send_message.assert_called_once()
+        self.session.send_message.assert_called_once()
         self.ui.display_response.assert_called_once()
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -68,7 +69,7 @@ class TestChatApplication(unittest.TestCase):
         self.ui.get_user_input.side_effect = ["First input", "Second input", "exit"]
         self.app.run()
         self.model.initialize.assert_called_once()
-        self.assertEqual(self.model.send_message.call_count, 2)
+        self.assertEqual(self.session.send_message.call_count, 2)
         self.assertEqual(self.ui.display_response.call_count, 2)
 
     @patch('sys.stdin.isatty', return_value=True)
@@ -76,16 +77,16 @@ class TestChatApplication(unittest.TestCase):
         self.ui.get_user_input.side_effect = ["First input", "quit"]
         self.app.run()
         self.model.initialize.assert_called_once()
-        self.assertEqual(self.model.send_message.call_count, 1)
+        self.assertEqual(self.session.send_message.call_count, 1)
 
     @patch('sys.stdin.isatty', return_value=True)
     def test_run_with_clear_command(self, mock_isatty):
         self.ui.get_user_input.side_effect = ["/clear", "User input", "exit"]
         self.app.run()
-        self.model.initialize.assert_called()
-        self.assertEqual(self.model.initialize.call_count, 2)  # Once at start, once after /clear
+        self.model.initialize.assert_called_once()
+        self.assertEqual(self.model.new_session.call_count, 2)  # Once at start, once after /clear
         self.ui.display_status.assert_called_with("Chat history cleared.")
-        self.assertEqual(self.model.send_message.call_count, 1)
+        self.assertEqual(self.session.send_message.call_count, 1)
 
     @patch('sys.stdin.isatty', return_value=False)
     @patch('sys.stdin.read')
@@ -96,7 +97,7 @@ class TestChatApplication(unittest.TestCase):
         self.context_orchestrator.build_prompt.assert_called_once_with(self.prompt_builder)
         self.prompt_builder.add_text.assert_called_once_with("Piped input")
         self.prompt_builder.build_prompt.assert_called_once()
-        self.model.send_message.assert_called_once()
+        self.session.send_message.assert_called_once()
         self.ui.display_response.assert_called_once()
 
     @patch('sys.stdin.isatty', return_value=False)
@@ -108,7 +109,7 @@ class TestChatApplication(unittest.TestCase):
         self.context_orchestrator.build_prompt.assert_called_once_with(self.prompt_builder)
         self.prompt_builder.add_text.assert_called_once_with("Initial prompt")
         self.prompt_builder.build_prompt.assert_called_once()
-        self.model.send_message.assert_called_once()
+        self.session.send_message.assert_called_once()
         self.ui.display_response.assert_called_once()
 
 if __name__ == '__main__':
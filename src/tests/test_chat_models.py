@@ -1,13 +1,32 @@
+import asyncio
+import configparser
+import sys
 import unittest
-from unittest.mock import MagicMock, patch
-from hermes.chat_models.claude import ClaudeModel
-from hermes.chat_models.bedrock import BedrockModel
-from hermes.chat_models.gemini import GeminiModel
-from hermes.chat_models.openai import OpenAIModel
-from hermes.chat_models.ollama import OllamaModel
+from unittest.mock import AsyncMock, MagicMock, patch
+from hermes.chat_models import client_pool
+from hermes.chat_models.adapters import SyncChatModelAdapter
+from hermes.chat_models.claude import AsyncClaudeModel, ClaudeModel
+from hermes.chat_models.bedrock import AsyncBedrockModel, BedrockModel
+from hermes.chat_models.gemini import AsyncGeminiModel, GeminiModel
+from hermes.chat_models.groq import AsyncGroqModel, GroqModel
+from hermes.chat_models.openai import AsyncOpenAIModel, OpenAIModel
+from hermes.chat_models.ollama import AsyncOllamaModel, OllamaModel
+
+async def async_iter(items):
+    for item in items:
+        yield item
+
+def collect(async_iterator):
+    async def consume():
+        return [chunk async for chunk in async_iterator]
+    return asyncio.run(consume())
+
+def openai_chunks(*texts):
+    return [MagicMock(choices=[MagicMock(delta=MagicMock(content=text))], usage=None, x_groq=None) for text in texts]
 
 class TestClaudeModel(unittest.TestCase):
     def setUp(self):
+        client_pool.clear()
         self.config = MagicMock()
         self.config.__getitem__.return_value = {'api_key': 'test_key'}
         self.model = ClaudeModel(self.config)
@@ -15,7 +34,34 @@ class TestClaudeModel(unittest.TestCase):
     @patch('anthropic.Anthropic')
     def test_initialize(self, mock_anthropic):
         self.model.initialize()
-        mock_anthropic.assert_called_once_with(api_key='test_key')
+        mock_anthropic.assert_called_once_with(api_key='test_key', max_retries=0)
+
+    @patch('anthropic.Anthropic')
+    def test_reinitialize_reuses_pooled_client(self, mock_anthropic):
+        self.model.initialize()
+        ClaudeModel(self.config).initialize()
+        self.model.initialize()
+        mock_anthropic.assert_called_once_with(api_key='test_key', max_retries=0)
+
+    @patch('anthropic.Anthropic')
+    def test_configs_with_different_transport_settings_get_their_own_client(self, mock_anthropic):
+        configs = []
+        for sections in ({}, {'RETRY': {'enabled': 'false'}}, {'HTTP': {'max_connections': '4'}}):
+            config = configparser.ConfigParser()
+            config.read_dict(dict(sections, ANTHROPIC={'api_key': 'test_key'}))
+            configs.append(config)
+        for config in configs + configs:
+            ClaudeModel(config).initialize()
+        self.assertEqual(mock_anthropic.call_count, 3)
+        self.assertEqual(mock_anthropic.call_args_list[0].kwargs['max_retries'], 0)
+        self.assertNotIn('max_retries', mock_anthropic.call_args_list[1].kwargs)
+
+    def test_http2_without_h2_is_reported(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'HTTP': {'http2': 'true'}})
+        with patch.dict(sys.modules, {'h2': None}):
+            with self.assertRaisesRegex(ValueError, 'h2'):
+                client_pool.http_client_kwargs(config)
 
     @patch('anthropic.Anthropic')
     def test_send_message(self, mock_anthropic):
@@ -26,9 +72,28 @@ class TestClaudeModel(unittest.TestCase):
 
         result = list(self.model.send_message('Test message'))
         self.assertEqual(result, ['Hello', ' World'])
+        self.assertEqual(self.model.messages[-1], {'role': 'assistant', 'content': 'Hello World'})
+
+    @patch('anthropic.Anthropic')
+    def test_sessions_share_client_but_not_history(self, mock_anthropic):
+        self.model.initialize()
+        mock_anthropic.return_value.messages.stream.return_value.__enter__.return_value.text_stream = ['Hi']
+        first, second = self.model.new_session(), self.model.new_session()
+
+        list(first.send_message('First'))
+        list(first.send_message('Again'))
+        list(second.send_message('Second'))
+
+        self.assertEqual(len(first.messages), 4)
+        self.assertEqual(second.messages, [
+            {'role': 'user', 'content': 'Second'},
+            {'role': 'assistant', 'content': 'Hi'}
+        ])
+        mock_anthropic.assert_called_once()
 
 class TestBedrockModel(unittest.TestCase):
     def setUp(self):
+        client_pool.clear()
         self.config = MagicMock()
         self.model = BedrockModel(self.config, 'claude')
 
@@ -37,6 +102,14 @@ class TestBedrockModel(unittest.TestCase):
         self.model.initialize()
         mock_boto3_client.assert_called_once_with('bedrock-runtime')
 
+    @patch('boto3.client')
+    def test_initialize_applies_http_pool_settings(self, mock_boto3_client):
+        self.model = BedrockModel({'HTTP': {'max_connections': '4'}}, 'claude')
+        self.model.initialize()
+        self.model.initialize()
+        mock_boto3_client.assert_called_once()
+        self.assertEqual(mock_boto3_client.call_args.kwargs['config'].max_pool_connections, 4)
+
     @patch('boto3.client')
     def test_send_message(self, mock_boto3_client):
         self.model.initialize()
@@ -69,16 +142,21 @@ class TestGeminiModel(unittest.TestCase):
     @patch('google.generativeai.GenerativeModel')
     def test_send_message(self, mock_generative_model, mock_configure):
         self.model.initialize()
-        mock_generative_model.return_value.start_chat.return_value.send_message.return_value = [
+        mock_generative_model.return_value.generate_content.return_value = [
             MagicMock(text='Hello'),
             MagicMock(text=' World')
         ]
 
         result = list(self.model.send_message('Test message'))
         self.assertEqual(result, ['Hello', ' World'])
+        self.assertEqual(self.model.messages, [
+            {'role': 'user', 'parts': ['Test message']},
+            {'role': 'model', 'parts': ['Hello World']}
+        ])
 
 class TestOpenAIModel(unittest.TestCase):
     def setUp(self):
+        client_pool.clear()
         self.config = MagicMock()
         self.config.__getitem__.return_value = {'api_key': 'test_key'}
         self.model = OpenAIModel(self.config)
@@ -86,7 +164,7 @@ class TestOpenAIModel(unittest.TestCase):
     @patch('openai.Client')
     def test_initialize(self, mock_client):
         self.model.initialize()
-        mock_client.assert_called_once_with(api_key='test_key', base_url='https://api.openai.com/v1')
+        mock_client.assert_called_once_with(api_key='test_key', base_url='https://api.openai.com/v1', max_retries=0)
 
     @patch('openai.Client')
     def test_send_message(self, mock_client):
@@ -100,6 +178,32 @@ class TestOpenAIModel(unittest.TestCase):
         result = list(self.model.send_message('Test message'))
         self.assertEqual(result, ['Hello', ' World'])
 
+    @patch('openai.Client')
+    def test_usage_from_final_chunk(self, mock_client):
+        self.model.initialize()
+        final = MagicMock(choices=[], usage=MagicMock(prompt_tokens=12, completion_tokens=2, prompt_tokens_details=MagicMock(cached_tokens=8)))
+        mock_client.return_value.chat.completions.create.return_value = iter(openai_chunks('Hello', ' World') + [final])
+
+        usage = {}
+        self.assertEqual(list(self.model.stream_response([{'role': 'user', 'content': 'Hi'}], usage)), ['Hello', ' World'])
+        self.assertEqual(usage, {'input_tokens': 12, 'output_tokens': 2, 'cache_read_tokens': 8})
+        self.assertEqual(mock_client.return_value.chat.completions.create.call_args.kwargs['stream_options'], {'include_usage': True})
+
+class TestGroqModel(unittest.TestCase):
+    @patch('hermes.chat_models.groq.Groq')
+    def test_usage_from_x_groq(self, mock_groq):
+        client_pool.clear()
+        config = MagicMock()
+        config.__getitem__.return_value = {'api_key': 'test_key'}
+        model = GroqModel(config)
+        model.initialize()
+        final = MagicMock(choices=[MagicMock(delta=MagicMock(content=None))], x_groq=MagicMock(usage=MagicMock(prompt_tokens=40, completion_tokens=5)))
+        mock_groq.return_value.chat.completions.create.return_value = iter(openai_chunks('Hello') + [final])
+
+        usage = {}
+        self.assertEqual(list(model.stream_response([{'role': 'user', 'content': 'Hi'}], usage)), ['Hello'])
+        self.assertEqual(usage, {'input_tokens': 40, 'output_tokens': 5})
+
 class TestOllamaModel(unittest.TestCase):
     def setUp(self):
         self.config = MagicMock()
@@ -122,6 +226,17 @@ class TestOllamaModel(unittest.TestCase):
         result = list(self.model.send_message('Test message'))
         self.assertEqual(result, ['Hello', ' World'])
 
+    @patch('ollama.chat')
+    def test_usage_from_final_chunk(self, mock_chat):
+        self.model.initialize()
+        mock_chat.return_value = [
+            {'message': {'content': 'Hello'}, 'done': False},
+            {'message': {'content': ''}, 'done': True, 'prompt_eval_count': 26, 'eval_count': 3},
+        ]
+        usage = {}
+        list(self.model.stream_response([{'role': 'user', 'content': 'Hi'}], usage))
+        self.assertEqual(usage, {'input_tokens': 26, 'output_tokens': 3})
+
     @patch('ollama.chat')
     def test_send_message_assert(self, mock_ollama_chat):
         self.model.initialize()
@@ -139,5 +254,92 @@ class TestOllamaModel(unittest.TestCase):
             {'role': 'assistant', 'content': 'Hello World'}
         ])
 
+class TestAsyncModels(unittest.TestCase):
+    def setUp(self):
+        client_pool.clear()
+        self.config = MagicMock()
+        self.config.__getitem__.return_value = {'api_key': 'test_key', 'model': 'test-model'}
+
+    @patch('anthropic.AsyncAnthropic')
+    def test_claude(self, mock_anthropic):
+        model = AsyncClaudeModel(self.config)
+        model.initialize()
+        mock_stream = MagicMock()
+        mock_stream.text_stream = async_iter(['Hello', ' World'])
+        mock_anthropic.return_value.messages.stream.return_value.__aenter__.return_value = mock_stream
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+        self.assertEqual(model.messages[-1], {'role': 'assistant', 'content': 'Hello World'})
+
+    @patch('openai.AsyncClient')
+    def test_openai(self, mock_client):
+        model = AsyncOpenAIModel(self.config)
+        model.initialize()
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=async_iter(openai_chunks('Hello', ' World')))
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+        self.assertEqual(model.messages, [
+            {'role': 'user', 'content': 'Test message'},
+            {'role': 'assistant', 'content': 'Hello World'}
+        ])
+
+    @patch('hermes.chat_models.groq.AsyncGroq')
+    def test_groq(self, mock_groq):
+        model = AsyncGroqModel(self.config)
+        model.initialize()
+        mock_groq.return_value.chat.completions.create = AsyncMock(return_value=async_iter(openai_chunks('Hello', ' World')))
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+
+    @patch('ollama.AsyncClient')
+    def test_ollama(self, mock_client):
+        model = AsyncOllamaModel(self.config)
+        model.initialize()
+        mock_client.return_value.chat = AsyncMock(return_value=async_iter([
+            {'message': {'content': 'Hello'}},
+            {'message': {'content': ' World'}},
+        ]))
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+        self.assertEqual(model.messages[-1], {'role': 'assistant', 'content': 'Hello World'})
+
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    def test_gemini(self, mock_generative_model, mock_configure):
+        model = AsyncGeminiModel(self.config)
+        model.initialize()
+        mock_generative_model.return_value.generate_content_async = AsyncMock(
+            return_value=async_iter([MagicMock(text='Hello'), MagicMock(text=' World')])
+        )
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+
+    @patch('boto3.client')
+    def test_bedrock_runs_on_executor(self, mock_boto3_client):
+        model = AsyncBedrockModel(self.config, 'claude')
+        model.initialize()
+        mock_boto3_client.return_value.converse_stream.return_value = {
+            'stream': [
+                {'contentBlockDelta': {'delta': {'text': 'Hello'}}},
+                {'contentBlockDelta': {'delta': {'text': ' World'}}},
+                {'messageStop': True}
+            ]
+        }
+
+        self.assertEqual(collect(model.send_message('Test message')), ['Hello', ' World'])
+
+class TestSyncChatModelAdapter(unittest.TestCase):
+    @patch('openai.AsyncClient')
+    def test_adapter_streams_async_model_synchronously(self, mock_client):
+        config = MagicMock()
+        config.__getitem__.return_value = {'api_key': 'test_key'}
+        async_model = AsyncOpenAIModel(config)
+        mock_client.return_value.chat.completions.create = AsyncMock(return_value=async_iter(openai_chunks('Hello', ' World')))
+
+        model = SyncChatModelAdapter(async_model)
+        model.initialize()
+        self.assertEqual(list(model.send_message('Test message')), ['Hello', ' World'])
+        self.assertEqual(model.messages[-1], {'role': 'assistant', 'content': 'Hello World'})
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,7 @@
+import threading
+import time
 import unittest
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 from unittest.mock import MagicMock, patch
 from hermes.context_orchestrator import ContextOrchestrator
 from hermes.context_providers.base import ContextProvider
@@ -18,7 +20,7 @@ class TestContextOrchestrator(unittest.TestCase):
         self.mock_provider2.add_argument.assert_called_once_with(mock_parser)
 
     def test_load_contexts(self):
-        mock_args = MagicMock()
+        mock_args = Namespace()
         self.orchestrator.load_contexts(mock_args)
         self.mock_provider1.load_context.assert_called_once_with(mock_args)
         self.mock_provider2.load_context.assert_called_once_with(mock_args)
@@ -29,5 +31,71 @@ class TestContextOrchestrator(unittest.TestCase):
         self.mock_provider1.add_to_prompt.assert_called_once_with(mock_prompt_builder)
         self.mock_provider2.add_to_prompt.assert_called_once_with(mock_prompt_builder)
 
+class SlowProvider(ContextProvider):
+    def __init__(self, name, seconds):
+        self.name = name
+        self.seconds = seconds
+        self.loaded = False
+
+    def add_argument(self, parser):
+        pass
+
+    def load_context(self, args):
+        time.sleep(self.seconds)
+        self.loaded = True
+
+    def add_to_prompt(self, prompt_builder):
+        prompt_builder.add_text(self.name)
+
+class AsyncProvider(SlowProvider):
+    async def load_context_async(self, args):
+        import asyncio
+        await asyncio.sleep(self.seconds)
+        self.loaded = True
+
+class StuckProvider(SlowProvider):
+    load_timeout = 0.05
+
+    def __init__(self):
+        super().__init__('stuck', 0)
+        self.release = threading.Event()
+
+    def load_context(self, args):
+        self.release.wait(5)
+
+class TestParallelLoading(unittest.TestCase):
+    def test_providers_load_concurrently_and_add_in_order(self):
+        providers = [SlowProvider('slow', 0.2), AsyncProvider('async', 0.2), SlowProvider('fast', 0)]
+        orchestrator = ContextOrchestrator(providers)
+        start = time.perf_counter()
+        orchestrator.load_contexts(Namespace())
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+        prompt_builder = MagicMock()
+        orchestrator.build_prompt(prompt_builder)
+        self.assertEqual([call.args[0] for call in prompt_builder.add_text.call_args_list], ['slow', 'async', 'fast'])
+        self.assertTrue(all(provider.loaded for provider in providers))
+        self.assertIn('SlowProvider 2', orchestrator.summary())
+        self.assertIn('AsyncProvider 2', orchestrator.summary())
+
+    def test_stuck_provider_is_skipped(self):
+        stuck = StuckProvider()
+        self.addCleanup(stuck.release.set)
+        orchestrator = ContextOrchestrator([SlowProvider('first', 0), stuck])
+        with patch('sys.stderr') as stderr:
+            orchestrator.load_contexts(Namespace(context_timeout=10))
+        self.assertIn('StuckProvider', stderr.write.call_args_list[0].args[0])
+
+        prompt_builder = MagicMock()
+        orchestrator.build_prompt(prompt_builder)
+        self.assertEqual([call.args[0] for call in prompt_builder.add_text.call_args_list], ['first'])
+        self.assertIn('StuckProvider timed out', orchestrator.summary())
+
+    def test_load_errors_are_raised(self):
+        failing = SlowProvider('failing', 0)
+        failing.load_context = MagicMock(side_effect=FileNotFoundError('missing.txt'))
+        with self.assertRaises(FileNotFoundError):
+            ContextOrchestrator([failing]).load_contexts(Namespace())
+
 if __name__ == '__main__':
     unittest.main()
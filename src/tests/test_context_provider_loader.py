@@ -0,0 +1,183 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from argparse import ArgumentParser, Namespace
+from unittest.mock import MagicMock, patch
+
+from hermes import context_provider_loader
+from hermes.context_orchestrator import ContextOrchestrator
+from hermes.context_provider_loader import LazyContextProvider, load_context_providers
+from hermes.context_providers.file_context_provider import FileContextProvider
+from hermes.prompt_builders.base import PromptBuilder
+
+EXTENSION_SOURCE = textwrap.dedent("""
+    from hermes.context_providers.base import ContextProvider
+
+    class NotesContextProvider(ContextProvider):
+        def __init__(self):
+            self.notes = []
+
+        def add_argument(self, parser):
+            parser.add_argument('--note', action='append', help='A note')
+
+        def load_context(self, args):
+            self.notes = args.note
+
+        def add_to_prompt(self, prompt_builder):
+            for note in self.notes:
+                prompt_builder.add_text(note, name='Note')
+""")
+
+ALWAYS_ON_SOURCE = textwrap.dedent("""
+    from hermes.context_providers.base import ContextProvider
+
+    class AlwaysOnProvider(ContextProvider):
+        def add_argument(self, parser):
+            pass
+
+        def load_context(self, args):
+            pass
+
+        def add_to_prompt(self, prompt_builder):
+            prompt_builder.add_text('always here')
+""")
+
+STUCK_SOURCE = textwrap.dedent("""
+    import time
+    from hermes.context_providers.base import ContextProvider
+
+    class StuckExtensionProvider(ContextProvider):
+        load_timeout = 0.05
+
+        def add_argument(self, parser):
+            parser.add_argument('--stuck', action='store_true', help='Load something slow')
+
+        def load_context(self, args):
+            time.sleep(1)
+
+        def add_to_prompt(self, prompt_builder):
+            prompt_builder.add_text('too late')
+""")
+
+class TestContextProviderLoader(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.extension_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.extension_dir.name, 'notes'))
+        with open(os.path.join(self.extension_dir.name, 'notes', 'notes_provider.py'), 'w') as f:
+            f.write(EXTENSION_SOURCE)
+        os.makedirs(os.path.join(self.extension_dir.name, 'always'))
+        with open(os.path.join(self.extension_dir.name, 'always', 'always_provider.py'), 'w') as f:
+            f.write(ALWAYS_ON_SOURCE)
+
+        patchers = [
+            patch.dict(os.environ, {'HERMES_CACHE_DIR': self.cache_dir.name}),
+            patch('hermes.extension_loader.EXTENSION_DIR', self.extension_dir.name),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.cache_dir.cleanup)
+        self.addCleanup(self.extension_dir.cleanup)
+        self.addCleanup(sys.modules.pop, 'extra_context_providers.notes.notes_provider', None)
+        self.addCleanup(sys.modules.pop, 'extra_context_providers.always.always_provider', None)
+        self.addCleanup(sys.modules.pop, 'extra_context_providers.stuck.stuck_provider', None)
+
+    def test_manifest_is_reused_when_sources_are_unchanged(self):
+        first = load_context_providers()
+        with patch.object(context_provider_loader, 'scan_source') as mock_scan:
+            second = load_context_providers()
+        mock_scan.assert_not_called()
+        lazy_entries = lambda providers: [p.entry for p in providers if isinstance(p, LazyContextProvider)]
+        self.assertEqual(lazy_entries(first), lazy_entries(second))
+        self.assertEqual(len(first), len(second))
+
+    def test_changed_source_is_rescanned(self):
+        load_context_providers()
+        extension_file = os.path.join(self.extension_dir.name, 'notes', 'notes_provider.py')
+        stat = os.stat(extension_file)
+        os.utime(extension_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with patch.object(context_provider_loader, 'scan_source', return_value=[]) as mock_scan:
+            load_context_providers()
+        mock_scan.assert_called_once()
+        self.assertEqual(mock_scan.call_args[0][0], os.path.join(self.extension_dir.name, 'notes'))
+
+    def test_provider_is_only_activated_when_its_flag_is_present(self):
+        load_context_providers()
+        sys.modules.pop('extra_context_providers.notes.notes_provider', None)
+
+        providers = load_context_providers()
+        parser = ArgumentParser()
+        for provider in providers:
+            provider.add_argument(parser)
+
+        args = parser.parse_args(['--text', 'hello'])
+        for provider in providers:
+            provider.load_context(args)
+        self.assertNotIn('extra_context_providers.notes.notes_provider', sys.modules)
+
+        args = parser.parse_args(['--note', 'remember this'])
+        for provider in providers:
+            provider.load_context(args)
+        self.assertIn('extra_context_providers.notes.notes_provider', sys.modules)
+
+        prompt_builder = MagicMock(spec=PromptBuilder)
+        for provider in providers:
+            provider.add_to_prompt(prompt_builder)
+        prompt_builder.add_text.assert_any_call('remember this', name='Note')
+
+    def test_provider_without_arguments_loads_on_every_run(self):
+        load_context_providers()
+        providers = load_context_providers()
+        always_on = [provider for provider in providers if type(provider).__name__ == 'AlwaysOnProvider']
+        self.assertEqual(len(always_on), 1)
+
+        parser = ArgumentParser()
+        for provider in providers:
+            provider.add_argument(parser)
+        args = parser.parse_args([])
+        prompt_builder = MagicMock(spec=PromptBuilder)
+        for provider in providers:
+            provider.load_context(args)
+            provider.add_to_prompt(prompt_builder)
+        prompt_builder.add_text.assert_any_call('always here')
+
+    def test_extension_load_timeout_applies_through_the_manifest(self):
+        os.makedirs(os.path.join(self.extension_dir.name, 'stuck'))
+        with open(os.path.join(self.extension_dir.name, 'stuck', 'stuck_provider.py'), 'w') as f:
+            f.write(STUCK_SOURCE)
+        load_context_providers()
+        providers = load_context_providers()
+        stuck = next(p for p in providers if isinstance(p, LazyContextProvider) and p.provider_name == 'StuckExtensionProvider')
+        self.assertEqual(stuck.provider_load_timeout, 0.05)
+
+        orchestrator = ContextOrchestrator(providers)
+        parser = ArgumentParser()
+        orchestrator.add_arguments(parser)
+        with patch('sys.stderr') as stderr:
+            orchestrator.load_contexts(parser.parse_args(['--stuck']))
+        self.assertIn('StuckExtensionProvider is still loading after 0.05s', stderr.write.call_args_list[0].args[0])
+        self.assertIn('StuckExtensionProvider timed out', orchestrator.summary())
+
+    def test_lazy_provider_delegates_to_real_provider(self):
+        entry = {
+            'module': 'hermes.context_providers.file_context_provider',
+            'path': None,
+            'class': 'FileContextProvider',
+            'arguments': [[['files'], {'nargs': '*'}]],
+        }
+        provider = LazyContextProvider(entry)
+        provider.add_argument(ArgumentParser())
+        provider.load_context(Namespace(files=['a.txt']))
+        self.assertIsInstance(provider.provider, FileContextProvider)
+        self.assertEqual(provider.provider.files, ['a.txt'])
+
+    def test_unrecordable_arguments_fall_back_to_eager_loading(self):
+        provider = MagicMock()
+        provider.add_argument.side_effect = lambda parser: parser.add_argument('--when', type=lambda value: value)
+        self.assertIsNone(context_provider_loader.record_arguments(provider))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import Mock, patch
+
+from hermes.context_providers.url_context_provider import URLContextProvider
+from hermes.loadtest.site_server import SiteServer
+from hermes.utils.crawler import canonicalize_url, extract_links
+
+def page(body, head=''):
+    return 'text/html', f"<html><head>{head}</head><body><main>{body}</main></body></html>".encode('utf-8')
+
+SITE = {
+    '/docs/index.html': page('<h1>Index</h1><a href="a.html">A</a> <a href="b.html#intro">B</a> <a href="/private/x.html">X</a> '
+                             '<a href="https://elsewhere.example/">Out</a> <a href="logo.png">Logo</a> <a href="copy.html">Copy</a>'),
+    '/docs/a.html': page('<h1>A</h1><a href="c.html">C</a> <a href="index.html">Back</a>'),
+    '/docs/b.html': page('<h1>B</h1><a href="a.html">A</a>'),
+    '/docs/c.html': page('<h1>C</h1><a href="d.html">D</a>'),
+    '/docs/d.html': page('<h1>D</h1>'),
+    '/docs/copy.html': page('<h1>Copy of A</h1>', '<link rel="canonical" href="/docs/a.html">'),
+    '/private/x.html': page('<h1>Private</h1>'),
+    '/robots.txt': ('text/plain', b"User-agent: *\nDisallow: /private/\n"),
+}
+
+class TestCrawler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.dict(os.environ, {'HERMES_CACHE_DIR': self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def crawl(self, server, **options):
+        provider = URLContextProvider()
+        args = {'url': None, 'url_crawl': [server.url('/docs/index.html')], 'url_workers': None, 'url_timeout': None, 'no_url_cache': True}
+        provider.load_context(Namespace(**{**args, **options}))
+        prompt_builder = Mock()
+        provider.add_to_prompt(prompt_builder)
+        return [call.kwargs['name'].rsplit('/', 1)[1] for call in prompt_builder.add_text.call_args_list]
+
+    def test_crawls_same_origin_links_to_depth(self):
+        with SiteServer(SITE) as server:
+            pages = self.crawl(server, url_crawl_depth=2)
+
+        self.assertEqual(sorted(pages), ['a.html', 'b.html', 'c.html', 'index.html'])
+        self.assertNotIn('/private/x.html', server.requests)
+        self.assertNotIn('/docs/logo.png', server.requests)
+        self.assertEqual(server.requests.count('/docs/a.html'), 1)
+
+    def test_page_and_size_limits(self):
+        with SiteServer(SITE) as server:
+            self.assertEqual(len(self.crawl(server, url_crawl_max_pages=3)), 3)
+        with SiteServer(SITE) as server:
+            provider = URLContextProvider()
+            provider.load_context(Namespace(url=None, url_crawl=[server.url('/docs/index.html')], url_crawl_max_bytes=10, no_url_cache=True))
+            provider.add_to_prompt(Mock())
+        self.assertEqual(len(provider.crawled_pages), 1)
+        self.assertTrue(provider.crawled_pages[0].content.endswith('[Truncated]'))
+
+    def test_per_host_concurrency_limit(self):
+        site = {'/docs/index.html': page(''.join(f'<a href="p{index}.html">{index}</a>' for index in range(12)))}
+        site.update({f'/docs/p{index}.html': page(f'<h1>{index}</h1>') for index in range(12)})
+        with SiteServer(site, delay=0.05) as server:
+            pages = self.crawl(server, url_workers=8)
+
+        self.assertEqual(len(pages), 13)
+        self.assertLessEqual(server.max_active, 4)
+
+    def test_canonical_urls(self):
+        self.assertEqual(canonicalize_url('HTTP://Example.com:80/a#top'), 'http://example.com/a')
+        self.assertEqual(canonicalize_url('https://example.com'), 'https://example.com/')
+        links, canonical = extract_links('<link rel="canonical" href="/a"><a href="b?x=1">b</a>', 'https://example.com/docs/')
+        self.assertEqual(links, ['https://example.com/docs/b?x=1'])
+        self.assertEqual(canonical, 'https://example.com/a')
+
+if __name__ == '__main__':
+    unittest.main()
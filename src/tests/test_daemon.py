@@ -0,0 +1,128 @@
+import configparser
+import os
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from hermes.daemon import DaemonServer, HermesDaemon, run_client, should_use_daemon
+from hermes.file_processors.default import DefaultFileProcessor
+from hermes.prompt_builders.xml_prompt_builder import XMLPromptBuilder
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.socket_path = os.path.join(self.tmp_dir.name, 'hermes.sock')
+
+        env_patcher = patch.dict(os.environ, {'HERMES_CACHE_DIR': self.tmp_dir.name, 'HERMES_DAEMON_SOCKET': self.socket_path})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+        self.model = MagicMock()
+        self.session = self.model.new_session.return_value
+        self.session.send_message.side_effect = lambda message: iter(['Hello', ' World'])
+        self.sent_prompts = []
+
+        def create_processors(model_name):
+            file_processor = DefaultFileProcessor()
+            prompt_builder = XMLPromptBuilder(file_processor)
+            self.sent_prompts.append(prompt_builder)
+            return file_processor, prompt_builder
+
+        self.create_model = patch('hermes.model_registry.create_model', return_value=self.model).start()
+        patch('hermes.model_registry.create_processors', side_effect=create_processors).start()
+        self.addCleanup(patch.stopall)
+
+        self.server = DaemonServer(self.socket_path, HermesDaemon(configparser.ConfigParser(), {}))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    @patch('sys.stdin')
+    def test_one_shot_prompt_streams_response(self, mock_stdin):
+        mock_stdin.isatty.return_value = False
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            code = run_client(['--model', 'claude', '--prompt', 'Hi'])
+        self.assertEqual(code, 0)
+        self.assertEqual(mock_stdout.getvalue(), "Hello World\n")
+        mock_stdin.read.assert_not_called()
+        self.model.initialize.assert_called_once()
+
+    @patch('sys.stdin')
+    def test_piped_stdin_and_relative_files_are_forwarded(self, mock_stdin):
+        mock_stdin.isatty.return_value = False
+        mock_stdin.read.return_value = "Piped question"
+        with open(os.path.join(self.tmp_dir.name, 'notes.txt'), 'w') as f:
+            f.write('file contents')
+
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        try:
+            with patch('sys.stdout', new_callable=StringIO):
+                code = run_client(['--model', 'claude', 'notes.txt'])
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(code, 0)
+        prompt = self.sent_prompts[-1].build_prompt()
+        self.assertIn('file contents', prompt)
+        self.assertIn('Piped question', prompt)
+
+    @patch('sys.stdin')
+    def test_each_connection_gets_its_own_session(self, mock_stdin):
+        mock_stdin.isatty.return_value = False
+        with patch('sys.stdout', new_callable=StringIO):
+            run_client(['--model', 'claude', '--prompt', 'First'])
+            run_client(['--model', 'claude', '--prompt', 'Second'])
+        self.assertEqual(len(self.sent_prompts), 2)
+        self.assertNotIn('First', self.sent_prompts[1].build_prompt())
+        self.create_model.assert_called_once()
+        self.assertEqual(self.model.new_session.call_count, 2)
+        # The shared model is initialized once by the daemon, not again by each session
+        self.model.initialize.assert_called_once()
+        self.model.warm_up.assert_called_once()
+
+    @patch('sys.stdin')
+    def test_session_flags_apply_to_a_copy_of_the_config(self, mock_stdin):
+        mock_stdin.isatty.return_value = False
+        with patch('sys.stdout', new_callable=StringIO):
+            run_client(['--model', 'claude', '--prompt', 'First', '--response-cache', '--history-tokens', '500'])
+            run_client(['--model', 'claude', '--prompt', 'Second', '--response-cache', '--history-tokens', '500'])
+            run_client(['--model', 'claude', '--prompt', 'Third'])
+
+        self.assertEqual(self.create_model.call_count, 2)
+        session_config = self.create_model.call_args_list[0][0][1]
+        self.assertEqual(session_config['RESPONSE_CACHE']['enabled'], 'true')
+        self.assertEqual(session_config['HISTORY']['max_tokens'], '500')
+        plain_config = self.create_model.call_args_list[1][0][1]
+        self.assertFalse(plain_config.has_section('RESPONSE_CACHE'))
+        self.assertFalse(self.server.hermes_daemon.config.has_section('RESPONSE_CACHE'))
+
+    @patch('hermes.ui.chat_ui.ChatUI.get_user_input', side_effect=['Follow-up', 'exit'])
+    @patch('sys.stdin')
+    def test_interactive_session_reads_input_from_client(self, mock_stdin, mock_get_user_input):
+        mock_stdin.isatty.return_value = True
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            code = run_client(['--model', 'claude', '--prompt', 'Hi'])
+        self.assertEqual(code, 0)
+        self.assertEqual(self.session.send_message.call_count, 2)
+        self.session.send_message.assert_called_with('Follow-up')
+        self.assertEqual(mock_stdout.getvalue(), "Hello World\nHello World\n")
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdin')
+    def test_invalid_arguments_are_reported_to_client(self, mock_stdin, mock_stderr):
+        mock_stdin.isatty.return_value = False
+        code = run_client(['--model', 'not-a-model', '--prompt', 'Hi'])
+        self.assertEqual(code, 1)
+        self.assertIn("invalid choice", mock_stderr.getvalue())
+
+    def test_should_use_daemon(self):
+        self.assertTrue(should_use_daemon(['--prompt', 'Hi']))
+        self.assertFalse(should_use_daemon(['--workflow', 'flow.yaml']))
+        self.assertFalse(should_use_daemon(['--help']))
+
+if __name__ == '__main__':
+    unittest.main()
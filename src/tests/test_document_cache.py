@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hermes.utils.disk_cache import DiskCache
+from hermes.utils.document_cache import DocumentCache, get_document_cache
+
+class TestDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.disk_cache = DiskCache(os.path.join(self.directory.name, 'documents.sqlite'), 1024 * 1024)
+        self.addCleanup(self.disk_cache.close)
+        self.cache = DocumentCache(self.disk_cache)
+        self.path = self.write('doc.pdf', b'%PDF version one', age=60)
+
+    def write(self, name, data, age=0):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def test_warm_lookup_skips_extraction(self):
+        extract = MagicMock(return_value='text ' * 1000)
+        self.assertEqual(self.cache.get_or_extract(self.path, 'pdf-text/1', extract), 'text ' * 1000)
+        self.assertEqual(self.cache.get_or_extract(self.path, 'pdf-text/1', extract), 'text ' * 1000)
+        extract.assert_called_once()
+        # Stored compressed
+        self.assertLess(self.disk_cache.total_size(), 1000)
+
+    def test_keyed_by_content_and_extractor(self):
+        self.cache.get_or_extract(self.path, 'pdf-text/1', lambda: 'one')
+        copy = self.write('copy.pdf', b'%PDF version one')
+        self.assertEqual(self.cache.get_or_extract(copy, 'pdf-text/1', lambda: 'other'), 'one')
+        self.assertEqual(self.cache.get_or_extract(self.path, 'pdf-text/2', lambda: 'upgraded'), 'upgraded')
+        self.write('doc.pdf', b'%PDF version two', age=30)
+        self.assertEqual(self.cache.get_or_extract(self.path, 'pdf-text/1', lambda: 'two'), 'two')
+
+    def test_hash_memoized_by_size_and_mtime(self):
+        digest = self.cache.get_digest(self.path)
+        with patch('hermes.utils.document_cache.hash_file') as hash_file:
+            self.assertEqual(self.cache.get_digest(self.path), digest)
+        hash_file.assert_not_called()
+
+    def test_recently_modified_file_is_hashed_again(self):
+        path = self.write('fresh.pdf', b'%PDF just written')
+        digest = self.cache.get_digest(path)
+        with patch('hermes.utils.document_cache.hash_file', return_value=digest) as hash_file:
+            self.cache.get_digest(path)
+        hash_file.assert_called_once()
+
+    def test_missing_file_is_left_to_the_extractor(self):
+        extract = MagicMock(side_effect=FileNotFoundError)
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get_or_extract(os.path.join(self.directory.name, 'missing.pdf'), 'pdf-text/1', extract)
+
+    def test_disabled_by_zero_size(self):
+        with patch.dict(os.environ, {'HERMES_CACHE_DIR': self.directory.name, 'HERMES_DOCUMENT_CACHE_MB': '0'}):
+            self.assertIsNone(get_document_cache())
+        with patch.dict(os.environ, {'HERMES_CACHE_DIR': self.directory.name, 'HERMES_DOCUMENT_CACHE_MB': '1'}):
+            self.assertIs(get_document_cache(), get_document_cache())
+
+if __name__ == '__main__':
+    unittest.main()
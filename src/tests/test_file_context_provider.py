@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
-from argparse import ArgumentParser
-from unittest.mock import MagicMock
+from argparse import ArgumentParser, Namespace
+from unittest.mock import MagicMock, patch
 from hermes.context_providers.file_context_provider import FileContextProvider
+from hermes.utils.file_walker import FileWalker
 from hermes.prompt_builders.base import PromptBuilder
 
 class TestFileContextProvider(unittest.TestCase):
@@ -15,8 +18,7 @@ class TestFileContextProvider(unittest.TestCase):
         self.assertEqual(args.files, ['file1.txt', 'file2.txt'])
 
     def test_load_context(self):
-        args = MagicMock()
-        args.files = ['file1.txt', 'file2.txt']
+        args = Namespace(files=['file1.txt', 'file2.txt'])
         self.provider.load_context(args)
         self.assertEqual(self.provider.files, ['file1.txt', 'file2.txt'])
 
@@ -28,5 +30,76 @@ class TestFileContextProvider(unittest.TestCase):
         prompt_builder.add_file.assert_any_call('file2.txt', 'file2')
         self.assertEqual(prompt_builder.add_file.call_count, 2)
 
+class TestFileWalking(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = self.tmpdir.name
+        files = {
+            '.gitignore': 'build/\n*.log\n!keep.log\n',
+            'README.md': 'readme',
+            'src/app.py': 'print(1)',
+            'src/pkg/__init__.py': '',
+            'src/pkg/.gitignore': '/generated.py\n',
+            'src/pkg/generated.py': 'x = 1',
+            'src/pkg/util.py': 'y = 2',
+            'build/out.txt': 'built',
+            'debug.log': 'log',
+            'keep.log': 'kept',
+            'package-lock.json': '{}',
+            'node_modules/lib/index.js': 'module',
+            'big.txt': 'x' * 5000,
+        }
+        for name, content in files.items():
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+        with open(os.path.join(self.root, 'image.bin'), 'wb') as f:
+            f.write(b'\x89PNG\x00\x00data')
+
+    def load(self, files, **options):
+        provider = FileContextProvider()
+        with patch('sys.stderr'):
+            provider.load_context(Namespace(files=files, **options))
+        return [os.path.relpath(path, self.root) for path in provider.files], provider
+
+    def test_directory_walk_honors_gitignore_and_filters(self):
+        files, provider = self.load([self.root], max_file_size=1000)
+        self.assertEqual(files, ['README.md', 'keep.log', 'src/app.py', 'src/pkg/__init__.py', 'src/pkg/util.py'])
+        self.assertEqual(provider.loaded_files[0].text, 'readme')
+        self.assertNotEqual(provider.names[provider.files[3]], provider.names[provider.files[0]])
+
+    def test_no_gitignore(self):
+        files, _ = self.load([self.root], no_gitignore=True)
+        self.assertIn('build/out.txt', files)
+        self.assertIn('src/pkg/generated.py', files)
+        self.assertNotIn('node_modules/lib/index.js', files)
+
+    def test_glob_patterns(self):
+        files, _ = self.load([os.path.join(self.root, 'src', '**', '*.py')])
+        self.assertEqual(files, ['src/app.py', 'src/pkg/__init__.py', 'src/pkg/util.py'])
+
+    def test_glob_without_double_star_stays_at_its_depth(self):
+        with patch('os.path.getsize', wraps=os.path.getsize) as getsize:
+            files, _ = self.load([os.path.join(self.root, '*.md')])
+        self.assertEqual(files, ['README.md'])
+        # Only the base directory is listed, nothing below it is visited
+        self.assertEqual({os.path.dirname(call.args[0]) for call in getsize.call_args_list}, {self.root})
+
+        files, _ = self.load([os.path.join(self.root, 'src', '*', '*.py')])
+        self.assertEqual(files, ['src/pkg/__init__.py', 'src/pkg/util.py'])
+
+    def test_explicit_files_are_kept(self):
+        files, _ = self.load([os.path.join(self.root, 'image.bin'), os.path.join(self.root, 'debug.log')])
+        self.assertEqual(files, ['image.bin', 'debug.log'])
+
+    def test_budget_stops_before_reading(self):
+        with patch.object(FileWalker, 'read', autospec=True, side_effect=FileWalker.read) as read:
+            files, provider = self.load([self.root], files_max_bytes=10)
+        self.assertEqual(files, ['README.md'])
+        self.assertEqual(read.call_count, 1)
+        self.assertIn('over budget', provider.walker.summary(provider.loaded_files))
+
 if __name__ == '__main__':
     unittest.main()
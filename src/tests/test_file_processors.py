@@ -1,8 +1,14 @@
 import unittest
 import tempfile
 import os
+from argparse import Namespace
+from unittest.mock import patch
+from hermes.context_providers.file_context_provider import FileContextProvider
 from hermes.file_processors.default import DefaultFileProcessor
 from hermes.file_processors.bedrock import BedrockFileProcessor
+from hermes.file_processors.documents import DocumentExtractor, get_document_extractor, parse_page_ranges, select_pages, split_pages
+from hermes.loadtest.pdf_bench import make_pdf
+from hermes.main import configure_file_processor
 
 class TestDefaultFileProcessor(unittest.TestCase):
     def setUp(self):
@@ -24,6 +30,86 @@ class TestDefaultFileProcessor(unittest.TestCase):
         self.assertEqual(content, 'Test content')
         os.unlink(tf.name)
 
+class TestDocumentExtraction(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {'HERMES_CACHE_DIR': os.path.join(self.directory.name, 'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = os.path.join(self.directory.name, 'doc.pdf')
+        make_pdf(self.path, [f"Page{index}" for index in range(1, 21)])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def page_numbers(self, text):
+        return [int(word[4:]) for word in text.split() if word.startswith('Page')]
+
+    def test_parse_page_ranges(self):
+        self.assertEqual(parse_page_ranges('1-5, 8,10-'), [(1, 5), (8, 8), (10, None)])
+        self.assertEqual(parse_page_ranges('-3'), [(1, 3)])
+        for spec in ('', '0', '5-2', 'a-b'):
+            with self.assertRaises(ValueError):
+                parse_page_ranges(spec)
+
+    def test_select_and_split_pages(self):
+        self.assertEqual(select_pages(parse_page_ranges('8-9,1-2,30-'), 10), [0, 1, 7, 8])
+        self.assertEqual(select_pages(parse_page_ranges('9-'), 10), [8, 9])
+        self.assertEqual(split_pages(list(range(20)), 4, min_chunk_pages=2), [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11, 12, 13, 14], [15, 16, 17, 18, 19]])
+        self.assertEqual(split_pages(list(range(20)), 4), [list(range(8)), list(range(8, 16)), list(range(16, 20))])
+
+    def test_pool_keeps_page_order(self):
+        extractor = DocumentExtractor(workers=3, min_pool_pages=1, min_chunk_pages=1)
+        try:
+            page_ranges = parse_page_ranges('2-4,15-')
+            extractor.prefetch([self.path, os.path.join(self.directory.name, 'notes.txt')], page_ranges)
+            self.assertEqual(len(extractor.jobs[os.path.abspath(self.path)].chunks), 3)
+            self.assertEqual(self.page_numbers(extractor.extract(self.path, page_ranges)), [2, 3, 4, 15, 16, 17, 18, 19, 20])
+            # Collected once; another selection is extracted afresh
+            self.assertEqual(self.page_numbers(extractor.extract(self.path)), list(range(1, 21)))
+        finally:
+            extractor.shutdown()
+
+    def test_changed_file_is_extracted_again(self):
+        extractor = DocumentExtractor(workers=1)
+        extractor.prefetch([self.path], parse_page_ranges('1'))
+        make_pdf(self.path, ['Changed'])
+        os.utime(self.path, (0, 0))
+        self.assertEqual(extractor.extract(self.path, parse_page_ranges('1')), 'Changed')
+
+    def test_warm_run_skips_extraction(self):
+        first = DocumentExtractor(workers=1)
+        first.prefetch([self.path], parse_page_ranges('1-2'))
+        self.assertEqual(self.page_numbers(first.extract(self.path, parse_page_ranges('1-2'))), [1, 2])
+        self.assertEqual(self.page_numbers(first.extract(self.path)), list(range(1, 21)))
+
+        second = DocumentExtractor(workers=1)
+        with patch('hermes.file_processors.documents.extract_pdf_pages') as extract_pdf_pages, \
+                patch('hermes.file_processors.documents.count_pdf_pages') as count_pdf_pages:
+            second.prefetch([self.path], parse_page_ranges('1-2'))
+            self.assertEqual(self.page_numbers(second.extract(self.path, parse_page_ranges('1-2'))), [1, 2])
+            self.assertEqual(self.page_numbers(second.extract(self.path)), list(range(1, 21)))
+        extract_pdf_pages.assert_not_called()
+        count_pdf_pages.assert_not_called()
+
+    def test_pdf_pages_argument(self):
+        args = Namespace(files=[self.path], pdf_pages='3,5', model=None)
+        FileContextProvider().load_context(args)
+        processor = DefaultFileProcessor()
+        configure_file_processor(processor, args)
+        with patch('hermes.file_processors.documents.count_pdf_pages') as count_pdf_pages:
+            self.assertEqual(self.page_numbers(processor.read_file(self.path)), [3, 5])
+        # The prefetched extraction was collected, not repeated
+        count_pdf_pages.assert_not_called()
+        self.assertNotIn(os.path.abspath(self.path), get_document_extractor().jobs)
+
+    def test_pdf_pages_without_prefetch(self):
+        # Workflows read input files without loading contexts, so nothing was prefetched
+        processor = DefaultFileProcessor()
+        configure_file_processor(processor, Namespace(pdf_pages='2,19-'))
+        self.assertEqual(self.page_numbers(processor.read_file(self.path)), [2, 19, 20])
+        self.assertEqual(self.page_numbers(DocumentExtractor(workers=1).extract(self.path, parse_page_ranges('4'))), [4])
+
 class TestBedrockFileProcessor(unittest.TestCase):
     def setUp(self):
         self.processor = BedrockFileProcessor()
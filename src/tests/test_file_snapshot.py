@@ -0,0 +1,81 @@
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from hermes.file_processors.default import DefaultFileProcessor
+from hermes.prompt_builders.xml_prompt_builder import XMLPromptBuilder
+from hermes.utils.file_snapshot import clear_snapshots, get_snapshot
+from hermes.utils.file_walker import FileWalker
+
+class TestFileSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        clear_snapshots()
+        self.addCleanup(clear_snapshots)
+        self.path = self.write('notes.txt', 'héllo\n'.encode('utf-8'))
+
+    def write(self, name, data, age=60):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def count_reads(self):
+        return patch('hermes.utils.file_snapshot.open', wraps=open, create=True)
+
+    def test_properties(self):
+        snapshot = get_snapshot(self.path)
+        self.assertEqual(snapshot.data, 'héllo\n'.encode('utf-8'))
+        self.assertEqual(snapshot.size, 7)
+        self.assertEqual(snapshot.text, 'héllo\n')
+        self.assertFalse(snapshot.binary)
+        self.assertEqual(snapshot.digest, hashlib.sha256(snapshot.data).hexdigest())
+        self.assertTrue(get_snapshot(self.write('image.png', b'\x89PNG\x00\x00')).binary)
+
+    def test_text_is_strict_utf8(self):
+        path = self.write('latin1.txt', 'café\r\n'.encode('latin-1'))
+        with self.assertRaises(UnicodeDecodeError):
+            get_snapshot(path).text
+        # As when the processor read the file in text mode itself
+        with self.assertRaises(UnicodeDecodeError):
+            DefaultFileProcessor().read_file(path)
+        self.assertEqual(DefaultFileProcessor().read_file(self.write('crlf.txt', b'a\r\nb\rc\n')), 'a\nb\nc\n')
+
+    def test_walker_processor_and_builder_share_one_read(self):
+        with self.count_reads() as opened:
+            FileWalker().load([self.directory.name])
+            builder = XMLPromptBuilder(DefaultFileProcessor())
+            for _ in range(3):
+                builder.add_file(self.path, 'notes')
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(builder.build_prompt().count('héllo'), 3)
+
+    def test_changed_file_is_read_again(self):
+        get_snapshot(self.path)
+        self.write('notes.txt', b'changed, and longer', age=30)
+        self.assertEqual(get_snapshot(self.path).text, 'changed, and longer')
+
+    def test_recently_modified_file_is_not_memoized(self):
+        path = self.write('fresh.txt', b'fresh', age=0)
+        with self.count_reads() as opened:
+            get_snapshot(path)
+            get_snapshot(path)
+        self.assertEqual(opened.call_count, 2)
+
+    def test_least_recently_used_are_evicted(self):
+        other = self.write('other.txt', b'x' * 10)
+        with patch('hermes.utils.file_snapshot.MAX_SNAPSHOT_BYTES', 12):
+            get_snapshot(self.path)
+            get_snapshot(other)
+            with self.count_reads() as opened:
+                get_snapshot(other)
+                get_snapshot(self.path)
+        self.assertEqual(opened.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,12 @@ class TestFileUtils(unittest.TestCase):
         self.assertTrue(is_binary(tf.name))
         os.unlink(tf.name)
 
+        # Agrees with the file walker on text whose sniffed sample ends mid-character
+        with tempfile.NamedTemporaryFile(delete=False) as tf:
+            tf.write(('a' * 8191 + 'é').encode('utf-8'))
+        self.assertFalse(is_binary(tf.name))
+        os.unlink(tf.name)
+
     def test_process_file_name(self):
         self.assertEqual(process_file_name('test_file.txt'), 'test_file')
         self.assertEqual(process_file_name('path/to/file.py'), 'file')
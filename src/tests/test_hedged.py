@@ -0,0 +1,103 @@
+import configparser
+import threading
+import unittest
+from unittest.mock import patch
+
+from hermes.chat_models.base import ChatModel, add_usage
+from hermes.chat_models.hedged import HedgedChatModel, create_hedged_model
+from hermes.chat_models.wrappers import find_wrapper
+from hermes.model_registry import create_model_and_processors
+
+class ScriptedModel(ChatModel):
+    """Streams a fixed reply, optionally waiting on an event before its first chunk or failing."""
+    def __init__(self, reply, release=None, error=None, system=None):
+        super().__init__(None)
+        self.reply = reply
+        self.release = release
+        self.error = error
+        self.system = system
+        self.requests = []
+        self.closed = threading.Event()
+
+    def initialize(self):
+        pass
+
+    def initial_messages(self):
+        return [{'role': 'system', 'content': self.system}] if self.system else []
+
+    def stream_response(self, messages, usage=None):
+        self.requests.append(messages)
+        try:
+            if self.release is not None:
+                self.release.wait(5)
+            if self.error is not None:
+                raise self.error
+            for chunk in self.reply:
+                yield chunk
+            add_usage(usage, output_tokens=len(self.reply))
+        finally:
+            self.closed.set()
+
+class TestHedgedChatModel(unittest.TestCase):
+    def test_first_backend_answers_without_hedging(self):
+        fast, spare = ScriptedModel(['Hello', ' World']), ScriptedModel(['Spare'])
+        model = HedgedChatModel(None, [('fast', fast), ('spare', spare)], first_chunk_timeout=1)
+        session = model.new_session()
+
+        self.assertEqual(list(session.send_message('Hi')), ['Hello', ' World'])
+        self.assertEqual(spare.requests, [])
+        self.assertEqual(session.last_usage, {'output_tokens': 2})
+        self.assertEqual(session.messages[-1], {'role': 'assistant', 'content': 'Hello World'})
+
+    def test_stalled_backend_is_hedged_and_cancelled(self):
+        release = threading.Event()
+        stalled = ScriptedModel(['Late'], release=release)
+        backup = ScriptedModel(['Backup'], system='Be brief')
+        model = HedgedChatModel(None, [('stalled', stalled), ('backup', backup)], first_chunk_timeout=0.05)
+
+        self.assertEqual(list(model.send_message('Hi')), ['Backup'])
+        self.assertEqual(backup.requests[0], [{'role': 'system', 'content': 'Be brief'}, {'role': 'user', 'content': 'Hi'}])
+
+        release.set()
+        self.assertTrue(stalled.closed.wait(5))
+        self.assertEqual(model.wins, {'backup': 1})
+        self.assertEqual(model.hedged_requests, 1)
+        self.assertEqual(model.messages[-1]['content'], 'Backup')
+
+    def test_failure_before_first_chunk_hedges_immediately(self):
+        failing = ScriptedModel([], error=RuntimeError('503'))
+        backup = ScriptedModel(['OK'])
+        model = HedgedChatModel(None, [('failing', failing), ('backup', backup)], first_chunk_timeout=60)
+
+        self.assertEqual(list(model.send_message('Hi')), ['OK'])
+
+    def test_last_error_is_raised_when_every_backend_fails(self):
+        model = HedgedChatModel(None, [
+            ('first', ScriptedModel([], error=RuntimeError('first'))),
+            ('second', ScriptedModel([], error=RuntimeError('second'))),
+        ], first_chunk_timeout=60)
+
+        with self.assertRaisesRegex(RuntimeError, 'second'):
+            list(model.send_message('Hi'))
+
+class TestHedgedFactory(unittest.TestCase):
+    def test_built_from_config_by_model_factory(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'HEDGE': {'backends': 'claude, openai', 'first_chunk_seconds': '2.5'}})
+        with patch('hermes.chat_models.claude.ClaudeModel') as claude, patch('hermes.chat_models.openai.OpenAIModel') as openai:
+            claude.return_value.context_window = 200000
+            openai.return_value.context_window = 128000
+            model, _, prompt_builder = create_model_and_processors('hedged', config)
+
+        model = find_wrapper(model, HedgedChatModel)
+        self.assertEqual(model.backends, [('claude', claude.return_value), ('openai', openai.return_value)])
+        self.assertEqual(model.first_chunk_timeout, 2.5)
+        self.assertEqual(model.context_window, 128000)
+        self.assertEqual(type(prompt_builder).__name__, 'XMLPromptBuilder')
+
+    def test_requires_backends(self):
+        with self.assertRaises(ValueError):
+            create_hedged_model(configparser.ConfigParser())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import configparser
+import unittest
+
+from hermes.chat_models.base import ChatModel
+from hermes.chat_models.history import HistoryPolicy, create_history_policy, measure
+from hermes.model_registry import create_model
+
+class FixedReplyModel(ChatModel):
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.sent = []
+
+    def initialize(self):
+        pass
+
+    def stream_response(self, messages, usage=None):
+        self.sent.append(messages)
+        yield 'r' * 40
+
+def turn(role, size):
+    return {'role': role, 'content': role[0] * size}
+
+class TestHistoryPolicy(unittest.TestCase):
+    def test_drops_oldest_turns_after_pinned_context(self):
+        messages = [turn('system', 40), turn('user', 400), turn('assistant', 40)]
+        messages += [turn('user', 40), turn('assistant', 40)] * 3 + [turn('user', 40)]
+
+        kept, result = HistoryPolicy(max_tokens=170, keep_initial=True).trim(messages, pinned_count=1)
+
+        self.assertEqual(kept[:3], messages[:3])
+        self.assertEqual(kept[-1], messages[-1])
+        self.assertEqual([m['role'] for m in kept[3:]], ['user', 'assistant', 'user'])
+        self.assertEqual(result.dropped_messages, 4)
+        self.assertEqual(result.bytes_saved, 2 * (44 + 49))
+        self.assertEqual(result.tokens_saved, 47)
+
+    def test_latest_message_is_kept_even_over_budget(self):
+        messages = [turn('user', 40), turn('assistant', 40), turn('user', 4000)]
+        kept, result = HistoryPolicy(max_tokens=10, keep_initial=False).trim(messages, pinned_count=0)
+        self.assertEqual(kept, [messages[-1]])
+        self.assertEqual(result.dropped_messages, 2)
+
+    def test_measure_counts_binary_blocks(self):
+        message = {'role': 'user', 'content': [{'text': 'abcd'}, {'image': {'source': {'bytes': b'12345678'}}}]}
+        self.assertEqual(measure(message), len('user') + 4 + 8)
+
+    def test_budget_accounts_for_context_window(self):
+        model = FixedReplyModel()
+        model.context_window = 10000
+        config = configparser.ConfigParser()
+        self.assertEqual(create_history_policy(config, model).max_tokens, 10000 - 4096)
+
+        config.read_dict({'HISTORY': {'max_tokens': '2000'}})
+        self.assertEqual(create_history_policy(config, model).max_tokens, 2000)
+
+        config['HISTORY']['enabled'] = 'false'
+        self.assertIsNone(create_history_policy(config, model))
+
+    def test_window_follows_configured_model(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'GROQ': {'api_key': 'key'}, 'REFLECTION': {'api_key': 'key'}})
+        self.assertEqual(create_history_policy(config, create_model('groq', config)).max_tokens, 8192 - 4096)
+        self.assertEqual(create_history_policy(config, create_model('reflection', config)).max_tokens, 8192 - 4096)
+
+        # A model whose window isn't known isn't trimmed unless asked to
+        config['GROQ']['model'] = 'llama-3.1-70b-versatile'
+        self.assertIsNone(create_history_policy(config, create_model('groq', config)))
+        config['GROQ']['context_window'] = '131072'
+        self.assertEqual(create_history_policy(config, create_model('groq', config)).max_tokens, 131072 - 4096)
+
+    def test_factory_attaches_policy(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'HISTORY': {'max_tokens': '500'}})
+        self.assertEqual(create_model('claude', config).new_session().history_policy.max_tokens, 500)
+
+class TestSessionHistoryWindow(unittest.TestCase):
+    def test_session_reports_savings(self):
+        model = FixedReplyModel()
+        model.history_policy = HistoryPolicy(max_tokens=60)
+        session = model.new_session()
+        reports = []
+        session.on_trim = lambda session, result: reports.append((session.bytes_saved, result.dropped_messages))
+
+        for text in ['context' * 10, 'one', 'two', 'three']:
+            list(session.send_message(text))
+
+        self.assertEqual(model.sent[-1][0]['content'], 'context' * 10)
+        self.assertLessEqual(len(model.sent[-1]), 5)
+        self.assertTrue(reports)
+        self.assertGreater(session.tokens_saved, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from hermes.utils.html_extract import ContentExtractor, FEED_SIZE, extract_content
+
+PAGE = """<html><head><title>Docs</title><style>body { color: red }</style></head><body>
+<nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<header role="banner">Site header</header>
+<main><h1>Install</h1><p>Run <code>pip install hermes</code> &amp; enjoy.<p>Then <a href="/use">use it</a>.
+<svg><path d="M0 0"/></svg><script>track()</script>
+<ul><li>one<li>two</ul></main>
+<footer>Copyright</footer></body></html>"""
+
+class TestHtmlExtract(unittest.TestCase):
+    def test_main_mode_keeps_only_main_content(self):
+        markdown = extract_content(PAGE, 'main')
+        self.assertTrue(markdown.startswith('# Install'))
+        self.assertIn('[use it](/use)', markdown)
+        self.assertIn('* one\n* two', markdown)
+        for boilerplate in ('Home', 'Site header', 'Copyright', 'track()', 'color: red', 'Docs'):
+            self.assertNotIn(boilerplate, markdown)
+
+    def test_full_mode_converts_everything(self):
+        markdown = extract_content(PAGE, 'full')
+        self.assertIn('# Install', markdown)
+        self.assertIn('Copyright', markdown)
+
+    def test_text_mode(self):
+        text = extract_content(PAGE, 'text')
+        self.assertEqual(text, 'Install\n\nRun pip install hermes & enjoy.\n\nThen use it.\n\n- one\n\n- two\n')
+
+    def test_falls_back_to_body_without_main_element(self):
+        text = extract_content('<body><nav>Menu</nav><div><p>Body text</p></div></body>', 'text')
+        self.assertEqual(text, 'Body text\n')
+
+    def test_cap_stops_parsing_early(self):
+        html = '<main>' + '<p>filler paragraph</p>' * (FEED_SIZE // 10) + '</main>'
+        extractor = ContentExtractor(as_text=True, max_bytes=100)
+        extractor.run(html)
+        self.assertLess(extractor.main_size, 200)
+        self.assertLess(len(extractor.main_parts), 100)
+
+        text = extract_content(html, 'text', max_bytes=100)
+        self.assertTrue(text.endswith('[Truncated]'))
+        self.assertLessEqual(len(text.encode('utf-8')), 100 + len('\n\n[Truncated]'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import configparser
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from hermes.chat_models.fake import FakeModel, FakeModelError
+from hermes.loadtest.harness import main as harness_main
+from hermes.model_registry import create_model
+
+def fake_config(**options):
+    config = configparser.ConfigParser()
+    config.read_dict({'FAKE': {key: str(value) for key, value in options.items()}, 'RETRY': {'enabled': 'false'}})
+    return config
+
+class TestFakeModel(unittest.TestCase):
+    def test_streams_reply_in_configured_chunks(self):
+        model = FakeModel(fake_config(reply='abcdefghij', chunk_size=4))
+        session = model.new_session()
+        self.assertEqual(list(session.send_message('Hi')), ['abcd', 'efgh', 'ij'])
+        self.assertEqual(session.last_usage['output_tokens'], 3)
+
+    def test_scripted_replies_are_used_in_turn(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("First reply\n---\nSecond reply\n")
+        self.addCleanup(os.unlink, f.name)
+        model = FakeModel(fake_config(reply_file=f.name, chunk_size=100))
+        self.assertEqual(list(model.send_message('1')), ['First reply'])
+        self.assertEqual(list(model.send_message('2')), ['Second reply'])
+        self.assertEqual(list(model.send_message('3')), ['First reply'])
+
+    def test_pacing_is_counted_as_simulated_time(self):
+        model = FakeModel(fake_config(reply='abcdef', chunk_size=2, first_chunk_delay=0.02, chunks_per_second=100))
+        list(model.send_message('Hi'))
+        self.assertGreaterEqual(model.simulated_seconds, 0.04)
+
+    def test_injected_errors(self):
+        with self.assertRaises(FakeModelError):
+            list(FakeModel(fake_config(error_rate=1)).send_message('Hi'))
+
+        dropping = FakeModel(fake_config(reply='abcdef', chunk_size=2, fail_after_chunks=2))
+        received = []
+        with self.assertRaises(FakeModelError):
+            for chunk in dropping.send_message('Hi'):
+                received.append(chunk)
+        self.assertEqual(received, ['ab', 'cd'])
+
+    def test_registered_and_retried_like_other_models(self):
+        config = fake_config(reply='abcdef', chunk_size=2, fail_after_chunks=2)
+        config.remove_section('RETRY')
+        config.read_dict({'RETRY': {'max_attempts': '2', 'base_delay': '0'}})
+        with self.assertRaises(FakeModelError):
+            list(create_model('fake', config).send_message('Hi'))
+
+class TestLoadHarness(unittest.TestCase):
+    def run_harness(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            harness_main(list(argv) + ['--json'])
+        return json.loads(output.getvalue())
+
+    def test_chat_scenario(self):
+        report = self.run_harness('--scenario', 'chat', '--runs', '4', '--concurrency', '2', '--turns', '2', '--reply-words', '20')
+        self.assertEqual(report['runs'], 4)
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['requests'], 8)
+        self.assertIn('overhead_p95_ms', report)
+
+    def test_workflow_scenario_against_stub(self):
+        report = self.run_harness('--scenario', 'workflow', '--stub', '--runs', '2', '--concurrency', '2', '--reply-words', '20')
+        self.assertEqual(report['runs'], 2)
+        self.assertEqual(report['errors'], 0)
+
+    def test_workflow_runs_do_not_resend_earlier_runs(self):
+        history_sizes = []
+        stream_response = FakeModel.stream_response
+
+        def record(model, messages, usage=None):
+            history_sizes.append(len(messages))
+            return stream_response(model, messages, usage)
+
+        with patch.object(FakeModel, 'stream_response', record):
+            report = self.run_harness('--scenario', 'workflow', '--runs', '5', '--concurrency', '1', '--reply-words', '20')
+        self.assertEqual(report['requests'], 15)
+        # Every run is the default workflow's three turns on a fresh conversation
+        self.assertEqual(history_sizes, [1, 3, 5] * 5)
+
+if __name__ == '__main__':
+    unittest.main()
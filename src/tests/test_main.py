@@ -1,12 +1,16 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import configparser
+import os
+import subprocess
+import sys
 from hermes.main import create_model_and_processors, run_chat_application
 from hermes.chat_models.claude import ClaudeModel
 from hermes.chat_models.bedrock import BedrockModel
 from hermes.chat_models.gemini import GeminiModel
 from hermes.chat_models.openai import OpenAIModel
 from hermes.chat_models.ollama import OllamaModel
+from hermes.chat_models.retry import RetryingChatModel
 from hermes.file_processors.default import DefaultFileProcessor
 from hermes.file_processors.bedrock import BedrockFileProcessor
 from hermes.prompt_builders.xml_prompt_builder import XMLPromptBuilder
@@ -18,7 +22,8 @@ class TestCreateModelAndProcessors(unittest.TestCase):
 
     def test_claude_model(self):
         model, file_processor, prompt_builder = create_model_and_processors("claude", self.config)
-        self.assertIsInstance(model, ClaudeModel)
+        self.assertIsInstance(model, RetryingChatModel)
+        self.assertIsInstance(model.model, ClaudeModel)
         self.assertIsInstance(file_processor, DefaultFileProcessor)
         self.assertIsInstance(prompt_builder, XMLPromptBuilder)
 
@@ -26,8 +31,8 @@ class TestCreateModelAndProcessors(unittest.TestCase):
         bedrock_models = ["bedrock-claude", "bedrock-claude-3.5", "bedrock-opus", "bedrock-mistral"]
         for model_name in bedrock_models:
             model, file_processor, prompt_builder = create_model_and_processors(model_name, self.config)
-            self.assertIsInstance(model, BedrockModel)
-            self.assertEqual(model.model_tag, model_name.split("-", 1)[1])
+            self.assertIsInstance(model.model, BedrockModel)
+            self.assertEqual(model.model.model_tag, model_name.split("-", 1)[1])
             self.assertIsInstance(file_processor, BedrockFileProcessor)
             self.assertIsInstance(prompt_builder, BedrockPromptBuilder)
 
@@ -39,14 +44,30 @@ class TestCreateModelAndProcessors(unittest.TestCase):
         }
         for model_name, model_class in model_classes.items():
             model, file_processor, prompt_builder = create_model_and_processors(model_name, self.config)
-            self.assertIsInstance(model, model_class)
+            self.assertIsInstance(model.model, model_class)
             self.assertIsInstance(file_processor, DefaultFileProcessor)
             self.assertIsInstance(prompt_builder, XMLPromptBuilder)
 
+    def test_retries_can_be_disabled(self):
+        self.config.read_dict({'RETRY': {'enabled': 'false'}})
+        model, _, _ = create_model_and_processors("claude", self.config)
+        self.assertIsInstance(model, ClaudeModel)
+
     def test_unsupported_model(self):
         with self.assertRaises(ValueError):
             create_model_and_processors("unsupported-model", self.config)
 
+    def test_only_selected_backend_is_imported(self):
+        code = (
+            "import sys, configparser\n"
+            "import hermes.main\n"
+            "hermes.main.create_model_and_processors('ollama', configparser.ConfigParser())\n"
+            "print(','.join(m for m in ('anthropic', 'boto3', 'google.generativeai', 'openai', 'groq', 'ollama', 'PyPDF2', 'docx', 'rich', 'pdfminer') if m in sys.modules))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+        self.assertEqual(result.stdout.strip(), 'ollama')
+
 class TestRunChatApplication(unittest.TestCase):
     def setUp(self):
         self.config = configparser.ConfigParser()
@@ -0,0 +1,89 @@
+import configparser
+import unittest
+from unittest.mock import patch
+
+from hermes.chat_models import client_pool
+from hermes.chat_models.bedrock import BedrockModel
+from hermes.chat_models.claude import ClaudeModel
+from hermes.chat_models.prompt_cache import mark_anthropic_cache, mark_bedrock_cache
+from tests.anthropic_stub import AnthropicStubServer
+
+class TestCacheMarkers(unittest.TestCase):
+    def test_anthropic_marks_only_context_message_without_mutating_history(self):
+        messages = [
+            {'role': 'user', 'content': '<input>files</input>'},
+            {'role': 'assistant', 'content': 'Read them'},
+            {'role': 'user', 'content': 'Question'},
+        ]
+        marked = mark_anthropic_cache(messages)
+        self.assertEqual(marked[0]['content'], [{'type': 'text', 'text': '<input>files</input>', 'cache_control': {'type': 'ephemeral'}}])
+        self.assertEqual(marked[1:], messages[1:])
+        self.assertEqual(messages[0]['content'], '<input>files</input>')
+
+    def test_bedrock_appends_cache_point(self):
+        messages = [{'role': 'user', 'content': [{'text': 'files'}]}]
+        marked = mark_bedrock_cache(messages)
+        self.assertEqual(marked[0]['content'], [{'text': 'files'}, {'cachePoint': {'type': 'default'}}])
+        self.assertEqual(messages[0]['content'], [{'text': 'files'}])
+
+class TestClaudePromptCache(unittest.TestCase):
+    def setUp(self):
+        client_pool.clear()
+        self.addCleanup(client_pool.clear)
+
+    def create_model(self, base_url, prompt_cache):
+        config = configparser.ConfigParser()
+        config.read_dict({'ANTHROPIC': {'api_key': 'test_key', 'base_url': base_url}})
+        if prompt_cache:
+            config.read_dict({'PROMPT_CACHE': {'enabled': 'true'}})
+        model = ClaudeModel(config)
+        model.initialize()
+        return model
+
+    def test_cache_markers_reach_the_endpoint_and_usage_is_reported(self):
+        with AnthropicStubServer(['Hello', ' World']) as server:
+            session = self.create_model(server.base_url, prompt_cache=True).new_session()
+            reports = []
+            session.on_usage = lambda session, usage: reports.append(dict(usage))
+
+            self.assertEqual(list(session.send_message('<input>files</input>')), ['Hello', ' World'])
+            list(session.send_message('Follow-up'))
+
+        first_request, second_request = server.requests
+        self.assertEqual(first_request['messages'][0]['content'][0]['cache_control'], {'type': 'ephemeral'})
+        self.assertEqual(second_request['messages'][0]['content'][0]['cache_control'], {'type': 'ephemeral'})
+        self.assertEqual(second_request['messages'][2]['content'], 'Follow-up')
+        self.assertEqual(session.messages[0]['content'], '<input>files</input>')
+        self.assertEqual(reports[0]['cache_write_tokens'], 2000)
+        self.assertEqual(reports[1]['cache_read_tokens'], 2000)
+
+    def test_no_markers_without_prompt_cache(self):
+        with AnthropicStubServer(['Hi']) as server:
+            list(self.create_model(server.base_url, prompt_cache=False).send_message('<input>files</input>'))
+        self.assertEqual(server.requests[0]['messages'][0]['content'], '<input>files</input>')
+
+class TestBedrockPromptCache(unittest.TestCase):
+    def setUp(self):
+        client_pool.clear()
+        self.addCleanup(client_pool.clear)
+
+    @patch('boto3.client')
+    def test_cache_point_is_sent_and_usage_read_from_metadata(self, mock_boto3_client):
+        config = configparser.ConfigParser()
+        config.read_dict({'PROMPT_CACHE': {'enabled': 'true'}})
+        model = BedrockModel(config, 'claude-3.5')
+        model.initialize()
+        mock_boto3_client.return_value.converse_stream.return_value = {'stream': [
+            {'contentBlockDelta': {'delta': {'text': 'Hello'}}},
+            {'messageStop': {'stopReason': 'end_turn'}},
+            {'metadata': {'usage': {'inputTokens': 5, 'outputTokens': 1, 'cacheReadInputTokens': 1500}}},
+        ]}
+        session = model.new_session()
+
+        self.assertEqual(list(session.send_message('files')), ['Hello'])
+        sent = mock_boto3_client.return_value.converse_stream.call_args.kwargs['messages']
+        self.assertEqual(sent[0]['content'][-1], {'cachePoint': {'type': 'default'}})
+        self.assertEqual(session.last_usage, {'input_tokens': 5, 'output_tokens': 1, 'cache_read_tokens': 1500})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import configparser
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from hermes.chat_models.base import ChatModel
+from hermes.chat_models.response_cache import CachedChatModel
+from hermes.model_registry import create_model
+from hermes.utils.disk_cache import DiskCache
+
+class EchoModel(ChatModel):
+    def __init__(self, config=None, model_id='echo-1'):
+        super().__init__(config)
+        self.model_id = model_id
+        self.requests = 0
+
+    def initialize(self):
+        pass
+
+    def request_params(self):
+        return {'model': self.model_id}
+
+    def stream_response(self, messages, usage=None):
+        self.requests += 1
+        yield 'You said: '
+        yield messages[-1]['content']
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, 'cache.sqlite')
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.path, max_bytes=10)
+        with patch('time.time', side_effect=[1, 2, 3, 3, 4, 4]):
+            cache.set('a', b'aaaa')
+            cache.set('b', b'bbbb')
+            cache.get('a')
+            cache.set('c', b'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'aaaa')
+        self.assertEqual(cache.get('c'), b'cccc')
+        self.assertLessEqual(cache.total_size(), 10)
+
+    def test_expired_entries_are_misses(self):
+        cache = DiskCache(self.path, max_bytes=100, ttl=60)
+        with patch('time.time', return_value=1000):
+            cache.set('a', b'value')
+        with patch('time.time', return_value=1030):
+            self.assertEqual(cache.get('a'), b'value')
+        with patch('time.time', return_value=1061):
+            self.assertIsNone(cache.get('a'))
+
+class TestCachedChatModel(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = DiskCache(os.path.join(self.tmp_dir.name, 'responses.sqlite'), max_bytes=1024 * 1024)
+
+    def test_identical_history_is_replayed_as_stream(self):
+        inner = EchoModel()
+        model = CachedChatModel(inner, self.cache)
+
+        first = list(model.new_session().send_message('Hello'))
+        second = list(model.new_session().send_message('Hello'))
+
+        self.assertEqual(first, ['You said: ', 'Hello'])
+        self.assertEqual(second, first)
+        self.assertEqual(inner.requests, 1)
+        self.assertEqual((model.hits, model.misses), (1, 1))
+
+    def test_cache_is_shared_across_processes_through_the_file(self):
+        list(CachedChatModel(EchoModel(), self.cache).send_message('Hello'))
+        reopened = CachedChatModel(EchoModel(), DiskCache(self.cache.path, max_bytes=1024 * 1024))
+        list(reopened.send_message('Hello'))
+        self.assertEqual(reopened.hits, 1)
+
+    def test_history_and_params_are_part_of_the_key(self):
+        model = CachedChatModel(EchoModel(), self.cache)
+        session = model.new_session()
+        list(session.send_message('Hello'))
+        list(session.send_message('Hello'))
+        list(CachedChatModel(EchoModel(model_id='echo-2'), self.cache).send_message('Hello'))
+        self.assertEqual(model.hits, 0)
+
+    def test_interrupted_stream_is_not_stored(self):
+        inner = EchoModel()
+        model = CachedChatModel(inner, self.cache)
+        stream = model.new_session().send_message('Hello')
+        next(stream)
+        stream.close()
+
+        list(model.new_session().send_message('Hello'))
+        self.assertEqual(inner.requests, 2)
+        self.assertEqual(model.hits, 0)
+
+    def test_factory_wraps_model_when_enabled(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'RESPONSE_CACHE': {'path': os.path.join(self.tmp_dir.name, 'factory.sqlite')}})
+        self.assertIsInstance(create_model('ollama', config), CachedChatModel)
+        self.assertNotIsInstance(create_model('ollama', configparser.ConfigParser()), CachedChatModel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import configparser
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hermes.chat_models import client_pool
+from hermes.chat_models.base import ChatModel
+from hermes.chat_models.retry import (
+    CONTINUATION_PROMPT, CircuitOpenError, RetryingChatModel, RetryPolicy, find_retry_after, is_retryable,
+    reset_circuit_breakers,
+)
+from hermes.model_registry import create_model
+from hermes.loadtest.openai_stub import OpenAIStubServer
+
+FAST_RETRY = {'base_delay': '0.01', 'max_delay': '0.05'}
+
+class FlakyModel(ChatModel):
+    """Raises the scripted errors on successive requests, optionally after streaming some chunks."""
+    def __init__(self, script):
+        super().__init__(None)
+        self.script = list(script)
+        self.requests = []
+
+    def initialize(self):
+        pass
+
+    def stream_response(self, messages, usage=None):
+        self.requests.append(messages)
+        chunks, error = self.script.pop(0)
+        yield from chunks
+        if error is not None:
+            raise error
+
+class TestErrorClassification(unittest.TestCase):
+    def http_error(self, status, headers=None):
+        error = Exception(f"HTTP {status}")
+        error.status_code = status
+        error.response = MagicMock(status_code=status, headers=headers or {})
+        return error
+
+    def test_status_codes(self):
+        self.assertTrue(is_retryable(self.http_error(429)))
+        self.assertTrue(is_retryable(self.http_error(503)))
+        self.assertFalse(is_retryable(self.http_error(400)))
+        self.assertFalse(is_retryable(ValueError('bad input')))
+
+    def test_transport_errors_and_wrapped_causes(self):
+        self.assertTrue(is_retryable(ConnectionResetError()))
+        try:
+            try:
+                raise self.http_error(529)
+            except Exception as e:
+                raise Exception("Error communicating with Groq API") from e
+        except Exception as wrapped:
+            self.assertTrue(is_retryable(wrapped))
+
+    def test_bedrock_error_codes(self):
+        error = Exception('throttled')
+        error.response = {'Error': {'Code': 'ThrottlingException'}, 'ResponseMetadata': {'HTTPStatusCode': 400}}
+        self.assertTrue(is_retryable(error))
+
+    def test_retry_after_header(self):
+        self.assertEqual(find_retry_after(self.http_error(429, {'retry-after': '7'})), 7.0)
+        self.assertEqual(find_retry_after(self.http_error(429, {'retry-after-ms': '250'})), 0.25)
+        self.assertIsNone(find_retry_after(self.http_error(503)))
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay_is_jittered_and_honors_retry_after(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4, max_retry_after=60)
+        for attempt in range(1, 6):
+            self.assertLessEqual(policy.get_delay(attempt, None), 4)
+        self.assertGreaterEqual(policy.get_delay(1, 10), 10)
+        self.assertIsNone(policy.get_delay(1, 600))
+
+class TestRetryingChatModel(unittest.TestCase):
+    def setUp(self):
+        reset_circuit_breakers()
+        self.addCleanup(reset_circuit_breakers)
+        sleep = patch('hermes.chat_models.retry.time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_retries_until_success(self):
+        flaky = FlakyModel([([], ConnectionResetError()), ([], TimeoutError()), (['OK'], None)])
+        model = RetryingChatModel(flaky, RetryPolicy())
+
+        self.assertEqual(list(model.send_message('Hi')), ['OK'])
+        self.assertEqual(len(flaky.requests), 3)
+        self.assertEqual(model.retries, 2)
+
+    def test_gives_up_after_max_attempts_and_on_fatal_errors(self):
+        model = RetryingChatModel(FlakyModel([([], TimeoutError())] * 2), RetryPolicy(max_attempts=2))
+        with self.assertRaises(TimeoutError):
+            list(model.send_message('Hi'))
+
+        fatal = FlakyModel([([], ValueError('bad request'))])
+        with self.assertRaises(ValueError):
+            list(RetryingChatModel(fatal, RetryPolicy()).send_message('Hi'))
+        self.assertEqual(len(fatal.requests), 1)
+
+    def test_dropped_stream_is_continued_without_repeating_chunks(self):
+        flaky = FlakyModel([(['Hello', ' Wor'], ConnectionResetError()), (['ld'], None)])
+        session = RetryingChatModel(flaky, RetryPolicy()).new_session()
+
+        self.assertEqual(list(session.send_message('Hi')), ['Hello', ' Wor', 'ld'])
+        self.assertEqual(flaky.requests[1][1:], [
+            {'role': 'assistant', 'content': 'Hello Wor'},
+            {'role': 'user', 'content': CONTINUATION_PROMPT},
+        ])
+        self.assertEqual(session.messages, [{'role': 'user', 'content': 'Hi'}, {'role': 'assistant', 'content': 'Hello World'}])
+
+    def test_circuit_opens_after_repeated_failures(self):
+        flaky = FlakyModel([([], ConnectionResetError())] * 3)
+        model = RetryingChatModel(flaky, RetryPolicy(max_attempts=3, failure_threshold=3, reset_seconds=60))
+
+        with self.assertRaises(ConnectionResetError):
+            list(model.send_message('Hi'))
+        with self.assertRaises(CircuitOpenError):
+            list(model.send_message('Again'))
+        self.assertEqual(len(flaky.requests), 3)
+
+    def test_half_open_trial_with_fatal_error_closes_the_circuit(self):
+        flaky = FlakyModel([([], ConnectionResetError())] * 2 + [([], ValueError('bad request')), (['OK'], None)])
+        model = RetryingChatModel(flaky, RetryPolicy(max_attempts=2, failure_threshold=2, reset_seconds=60))
+        with self.assertRaises(ConnectionResetError):
+            list(model.send_message('Hi'))
+
+        later = time.monotonic() + 3600
+        with patch('hermes.chat_models.retry.time.monotonic', return_value=later):
+            with self.assertRaises(ValueError):
+                list(model.send_message('Trial'))
+        self.assertEqual(list(model.send_message('After')), ['OK'])
+
+class TestRetryAgainstStubServer(unittest.TestCase):
+    def setUp(self):
+        client_pool.clear()
+        reset_circuit_breakers()
+        self.addCleanup(client_pool.clear)
+        self.addCleanup(reset_circuit_breakers)
+
+    def create_model(self, base_url):
+        config = configparser.ConfigParser()
+        config.read_dict({'OPENAI': {'api_key': 'test_key', 'base_url': base_url}, 'RETRY': FAST_RETRY})
+        model = create_model('openai', config)
+        model.initialize()
+        return model
+
+    def test_rate_limit_with_retry_after_is_retried(self):
+        faults = [('status', 429, {'Retry-After': '0'}), ('status', 503, {})]
+        with OpenAIStubServer(['Hello', ' World'], faults) as server:
+            self.assertEqual(list(self.create_model(server.base_url).send_message('Hi')), ['Hello', ' World'])
+        self.assertEqual(len(server.requests), 3)
+
+    def test_dropped_connection_is_resumed(self):
+        with OpenAIStubServer(['Hello', ' World'], [('disconnect', 1)]) as server:
+            model = self.create_model(server.base_url)
+            self.assertEqual(list(model.send_message('Hi')), ['Hello', 'Hello', ' World'])
+
+        resumed = server.requests[1]['messages']
+        self.assertEqual(resumed[-2], {'role': 'assistant', 'content': 'Hello'})
+        self.assertEqual(resumed[-1]['content'], CONTINUATION_PROMPT)
+        self.assertEqual(model.resumed_streams, 1)
+
+    def test_client_errors_are_not_retried(self):
+        with OpenAIStubServer(['Hello'], [('status', 400, {})]) as server:
+            with self.assertRaises(Exception):
+                list(self.create_model(server.base_url).send_message('Hi'))
+        self.assertEqual(len(server.requests), 1)
+
+if __name__ == '__main__':
+    unittest.main()
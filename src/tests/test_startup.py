@@ -0,0 +1,61 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from hermes.chat_application import ChatApplication
+from hermes.chat_models.base import ChatModel
+from hermes.chat_models.startup import ModelStartup
+
+class SlowStartModel(ChatModel):
+    def __init__(self, initialize_seconds=0.0, error=None):
+        super().__init__(None)
+        self.initialize_seconds = initialize_seconds
+        self.error = error
+        self.initialize_calls = 0
+        self.warmed_up = False
+
+    def initialize(self):
+        self.initialize_calls += 1
+        time.sleep(self.initialize_seconds)
+        if self.error is not None:
+            raise self.error
+
+    def warm_up(self):
+        self.warmed_up = True
+        raise ConnectionError("warm-up failures are ignored")
+
+    def stream_response(self, messages, usage=None):
+        yield 'OK'
+
+class TestModelStartup(unittest.TestCase):
+    def test_initialization_overlaps_with_foreground_work(self):
+        model = SlowStartModel(initialize_seconds=0.1)
+        startup = ModelStartup(model)
+        time.sleep(0.1)
+        startup.wait()
+        startup.thread.join()
+
+        self.assertEqual(model.initialize_calls, 1)
+        self.assertTrue(model.warmed_up)
+        self.assertLess(startup.waited_seconds, 0.08)
+        self.assertIn('overlapped', startup.summary())
+
+    def test_initialize_errors_are_raised_on_wait(self):
+        startup = ModelStartup(SlowStartModel(error=KeyError('OPENAI')))
+        with self.assertRaises(KeyError):
+            startup.wait()
+
+    def test_chat_application_waits_instead_of_initializing_again(self):
+        model = SlowStartModel(initialize_seconds=0.05)
+        model.stats_recorder = MagicMock(print_summary=True)
+        ui = MagicMock()
+        app = ChatApplication(model, ui, MagicMock(), MagicMock(), {}, MagicMock(), ModelStartup(model))
+
+        app.prepare()
+
+        self.assertEqual(model.initialize_calls, 1)
+        self.assertIsNotNone(app.session)
+        self.assertTrue(ui.display_status.call_args[0][0].startswith('Startup:'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import configparser
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from hermes.chat_models.base import ChatModel, add_usage
+from hermes.chat_models.response_cache import CachedChatModel
+from hermes.chat_models.stats import StatsRecorder, create_stats_recorder
+
+class ChunkedReplyModel(ChatModel):
+    def initialize(self):
+        pass
+
+    def stream_response(self, messages, usage=None):
+        yield 'Hello'
+        yield ' World'
+        add_usage(usage, input_tokens=12, output_tokens=3)
+
+    def request_params(self):
+        return {'model': 'chunked-1'}
+
+class TestResponseStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.jsonl_path = os.path.join(self.tmpdir.name, 'stats.jsonl')
+
+    def create_session(self, model, print_summary=False):
+        model.stats_recorder = StatsRecorder(self.jsonl_path, print_summary)
+        return model.new_session()
+
+    def read_lines(self):
+        with open(self.jsonl_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_each_response_is_appended_as_a_json_line(self):
+        session = self.create_session(ChunkedReplyModel(None))
+
+        self.assertEqual(list(session.send_message('Hi')), ['Hello', ' World'])
+        list(session.send_message('Again'))
+
+        first, second = self.read_lines()
+        self.assertEqual(first['provider'], 'tests.test_stats.ChunkedReplyModel')
+        self.assertEqual(first['model'], 'chunked-1')
+        self.assertEqual(first['chunks'], 2)
+        self.assertEqual(first['bytes_out'], len('Hello World'))
+        self.assertEqual(first['output_tokens'], 3)
+        self.assertEqual(first['usage'], {'input_tokens': 12, 'output_tokens': 3})
+        self.assertIsNotNone(first['time_to_first_chunk_seconds'])
+        self.assertGreaterEqual(first['total_seconds'], first['time_to_first_chunk_seconds'])
+        self.assertIn('version', first)
+        self.assertGreater(second['bytes_in'], first['bytes_in'])
+        self.assertEqual(session.last_stats.chunks, 2)
+
+    def test_summary_goes_to_on_stats_when_printing(self):
+        session = self.create_session(ChunkedReplyModel(None), print_summary=True)
+        reports = []
+        session.on_stats = lambda session, stats: reports.append(stats.summary())
+
+        list(session.send_message('Hi'))
+
+        self.assertEqual(len(reports), 1)
+        self.assertIn('chunked-1', reports[0])
+        self.assertIn('output_tokens=3', reports[0])
+
+    def test_wrapped_model_reports_innermost_provider(self):
+        cache = MagicMock()
+        cache.get.return_value = None
+        session = self.create_session(CachedChatModel(ChunkedReplyModel(None), cache))
+
+        list(session.send_message('Hi'))
+
+        self.assertEqual(self.read_lines()[0]['provider'], 'tests.test_stats.ChunkedReplyModel')
+
+    def test_no_recorder_without_stats_section(self):
+        config = configparser.ConfigParser()
+        self.assertIsNone(create_stats_recorder(config))
+        config.read_dict({'STATS': {'print': 'true', 'jsonl': ''}})
+        recorder = create_stats_recorder(config)
+        self.assertTrue(recorder.print_summary)
+        self.assertIsNone(recorder.jsonl_path)
+
+if __name__ == '__main__':
+    unittest.main()
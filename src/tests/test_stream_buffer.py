@@ -0,0 +1,25 @@
+import unittest
+
+from hermes.utils.stream_buffer import StreamBuffer
+
+class TestStreamBuffer(unittest.TestCase):
+    def test_tee_records_chunks_while_streaming(self):
+        buffer = StreamBuffer()
+        seen = []
+        for chunk in buffer.tee(iter(['Hello', ' ', 'world'])):
+            seen.append(chunk)
+            self.assertEqual(buffer.getvalue(), ''.join(seen))
+        self.assertEqual(str(buffer), 'Hello world')
+
+    def test_reading_compacts_chunks(self):
+        buffer = StreamBuffer()
+        self.assertEqual(buffer.getvalue(), '')
+        buffer.append('a')
+        buffer.append('b')
+        self.assertEqual(buffer.getvalue(), 'ab')
+        self.assertEqual(buffer.chunks, ['ab'])
+        buffer.append('c')
+        self.assertEqual(buffer.getvalue(), 'abc')
+
+if __name__ == '__main__':
+    unittest.main()
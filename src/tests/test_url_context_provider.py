@@ -1,24 +1,36 @@
+import time
 import pytest
 from unittest.mock import Mock, patch
-from argparse import ArgumentParser
-from requests.exceptions import RequestException
+from argparse import ArgumentParser, Namespace
+from requests.exceptions import HTTPError, RequestException
 from tenacity import RetryError
 
 from hermes.context_providers.url_context_provider import URLContextProvider
+from hermes.loadtest.site_server import SiteServer, generate_site
 from hermes.prompt_builders.base import PromptBuilder
 
 class TestURLContextProvider:
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('HERMES_CACHE_DIR', str(tmp_path))
+
     @pytest.fixture
     def url_provider(self):
         return URLContextProvider()
 
+    def load(self, urls, **options):
+        provider = URLContextProvider()
+        provider.load_context(Namespace(url=urls, **{'url_workers': None, 'url_timeout': None, **options}))
+        return provider
+
     def test_add_argument(self, url_provider):
         parser = ArgumentParser()
         url_provider.add_argument(parser)
         args = parser.parse_args(['--url', 'http://example.com'])
         assert args.url == ['http://example.com']
+        assert args.url_workers is None
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_url_content_success(self, mock_get, url_provider):
         mock_response = Mock()
         mock_response.text = '<html><body><h1>Test</h1></body></html>'
@@ -27,11 +39,20 @@ class TestURLContextProvider:
 
         content = url_provider.fetch_url_content('http://example.com')
         assert 'Test' in content
-        mock_get.assert_called_once_with('http://example.com')
+        mock_get.assert_called_once_with('http://example.com', headers={}, timeout=(5, 30))
+
+    @patch('requests.Session.get')
+    def test_client_errors_are_not_retried(self, mock_get, url_provider):
+        mock_response = Mock()
+        mock_response.raise_for_status.side_effect = HTTPError(response=Mock(status_code=404))
+        mock_get.return_value = mock_response
+
+        with pytest.raises(HTTPError):
+            url_provider.fetch_url_content('http://example.com/missing')
+        assert mock_get.call_count == 1
 
     def test_load_context(self, url_provider):
-        args = Mock()
-        args.url = ['http://example.com', 'http://test.com']
+        args = Namespace(url=['http://example.com', 'http://test.com'], url_workers=None, url_timeout=None)
         
         with patch.object(url_provider, 'fetch_url_content') as mock_fetch:
             mock_fetch.side_effect = ['Content 1', 'Content 2']
@@ -40,6 +61,76 @@ class TestURLContextProvider:
         assert url_provider.urls == ['http://example.com', 'http://test.com']
         assert url_provider.contents == ['Content 1', 'Content 2']
 
+    def test_load_context_fetches_concurrently_in_order(self, url_provider):
+        with SiteServer(generate_site(6), delay=0.2) as server:
+            urls = [server.url(f'/page{index}.html') for index in range(6)]
+            start = time.perf_counter()
+            url_provider.load_context(Namespace(url=urls, url_workers=None, url_timeout=None))
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2 * 6 / 2
+        assert [f'Page {index} paragraph 0' in content for index, content in enumerate(url_provider.contents)] == [True] * 6
+
+    def test_connections_are_reused(self, url_provider):
+        with SiteServer(generate_site(4)) as server:
+            urls = [server.url(f'/page{index}.html') for index in range(4)]
+            url_provider.load_context(Namespace(url=urls, url_workers=1, url_timeout=None))
+
+        assert server.requests == [f'/page{index}.html' for index in range(4)]
+        assert server.connections == 1
+
+    def test_cached_pages_are_revalidated_without_reconverting(self):
+        with SiteServer(generate_site(1), etags=True) as server:
+            url = server.url('/page0.html')
+            first = self.load([url]).contents
+            with patch.object(URLContextProvider, 'html_to_markdown') as mock_convert:
+                second = self.load([url]).contents
+
+        assert second == first
+        mock_convert.assert_not_called()
+        assert server.requests == ['/page0.html'] * 2
+
+    def test_fresh_pages_skip_the_network(self):
+        with SiteServer(generate_site(1), headers={'Cache-Control': 'max-age=60'}) as server:
+            url = server.url('/page0.html')
+            self.load([url])
+            self.load([url])
+            self.load([url], url_max_age=0)
+
+        assert server.requests == ['/page0.html'] * 2
+
+    def test_no_store_and_no_url_cache(self):
+        with SiteServer(generate_site(1), headers={'Cache-Control': 'no-store'}) as server:
+            url = server.url('/page0.html')
+            self.load([url])
+            self.load([url])
+        with SiteServer(generate_site(1), headers={'Cache-Control': 'max-age=60'}) as server:
+            url = server.url('/page0.html')
+            self.load([url], no_url_cache=True)
+            self.load([url], no_url_cache=True)
+
+        assert len(server.requests) == 2
+
+    def test_offline_mode(self):
+        with SiteServer(generate_site(2), headers={'Cache-Control': 'no-cache'}) as server:
+            cached, missing = server.url('/page0.html'), server.url('/page1.html')
+            first = self.load([cached]).contents
+            assert self.load([cached], url_offline=True).contents == first
+            with pytest.raises(LookupError):
+                self.load([missing], url_offline=True)
+
+        assert server.requests == ['/page0.html']
+
+    def test_changed_url_mode_reconverts_cached_page(self):
+        with SiteServer(generate_site(1), headers={'Cache-Control': 'max-age=60'}) as server:
+            url = server.url('/page0.html')
+            main = self.load([url]).contents[0]
+            text = self.load([url], url_mode='text', url_max_tokens=10).contents[0]
+
+        assert main.startswith('# Page 0')
+        assert text.startswith('Page 0\n') and text.endswith('[Truncated]')
+        assert server.requests == ['/page0.html']
+
     def test_add_to_prompt(self, url_provider):
         url_provider.urls = ['http://example.com', 'http://test.com']
         url_provider.contents = ['Content 1', 'Content 2']
@@ -4,6 +4,7 @@ import os
 import tempfile
 
 from hermes.context_orchestrator import ContextOrchestrator
+from hermes.loadtest.pdf_bench import make_pdf
 from hermes.workflows.context import WorkflowContext
 from hermes.workflows.tasks.base import Task
 from hermes.workflows.tasks.markdown_extraction_task import MarkdownExtractionTask
@@ -37,6 +38,11 @@ class TestBaseTask(unittest.TestCase):
 class TestMarkdownExtractionTask(unittest.TestCase):
     def setUp(self):
         self.task = MarkdownExtractionTask("md_extract", {"file_path_var": "input_file"}, print)
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        patcher = patch.dict(os.environ, {'HERMES_CACHE_DIR': self.cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_execute_pdf(self):
         context = WorkflowContext()
@@ -49,6 +55,15 @@ class TestMarkdownExtractionTask(unittest.TestCase):
         self.assertIn("extracted_text", result)
         self.assertIn("--- Content from test.pdf ---", result["extracted_text"])
 
+    def test_pdf_to_markdown_uses_document_cache(self):
+        pdf_path = os.path.join(self.cache_dir.name, 'spec.pdf')
+        make_pdf(pdf_path, ['SPECIFICATION', 'Body text'])
+        markdown = self.task.pdf_to_markdown(pdf_path)
+        self.assertIn('# Specification', markdown)
+        with patch.object(self.task, 'extract_markdown') as extract_markdown:
+            self.assertEqual(self.task.pdf_to_markdown(pdf_path), markdown)
+        extract_markdown.assert_not_called()
+
     def test_execute_unsupported_file(self):
         context = WorkflowContext()
         context.set_global("input_file", "test.txt")
@@ -93,6 +108,17 @@ class TestLLMTask(unittest.TestCase):
         self.assertEqual(result["response"], "Response")
         self.model.send_message.assert_called_once()
 
+    def test_execute_in_isolated_session(self):
+        context = WorkflowContext()
+        context.set_global("prompt_builder", MagicMock())
+        self.model.new_session.return_value.send_message.return_value = iter(["Response"])
+        task = LLMTask("llm", {"prompt": "Test prompt", "isolated_session": True}, self.model, print)
+
+        result = task.execute(context)
+
+        self.assertEqual(result["response"], "Response")
+        self.model.send_message.assert_not_called()
+
 class TestShellTask(unittest.TestCase):
     def setUp(self):
         self.task = ShellTask("shell", {"command": "echo 'Hello, World!'"}, print)
@@ -1,3 +1,6 @@
+import configparser
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 import yaml
@@ -6,6 +9,7 @@ from hermes.workflows.context import WorkflowContext
 from hermes.workflows.executor import WorkflowExecutor
 from hermes.workflows.parser import WorkflowParser
 from hermes.chat_models.base import ChatModel
+from hermes.model_registry import create_model, create_processors
 from hermes.workflows.tasks.base import Task
 
 class TestWorkflowContext(unittest.TestCase):
@@ -117,5 +121,23 @@ class TestWorkflowExecutor(unittest.TestCase):
         self.assertEqual(result, {'result': 'task_result'})
         self.assertEqual(self.executor.context.get_task_context(self.root_task_mock.task_id, 'result'), 'task_result')
 
+    def test_each_execution_starts_a_new_conversation(self):
+        config = configparser.ConfigParser()
+        config.read_dict({'FAKE': {'reply': 'Done.'}, 'RETRY': {'enabled': 'false'}})
+        model = create_model('fake', config)
+        _, prompt_builder = create_processors('fake')
+        with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False) as f:
+            f.write("run:\n  type: sequential\n  tasks:\n    first:\n      type: llm\n      prompt: One\n    second:\n      type: llm\n      prompt: Two\n")
+        self.addCleanup(os.unlink, f.name)
+        executor = WorkflowExecutor(f.name, model, prompt_builder, [], '', print)
+
+        history_sizes = []
+        stream_response = model.stream_response
+        with patch.object(model, 'stream_response', side_effect=lambda messages, usage=None: (history_sizes.append(len(messages)), stream_response(messages, usage))[1]):
+            executor.execute()
+            executor.execute()
+        # The second run's first request carries only its own prompt, not the first run's turns
+        self.assertEqual(history_sizes, [1, 3, 1, 3])
+
 if __name__ == '__main__':
     unittest.main()